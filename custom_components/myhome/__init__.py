@@ -1,12 +1,15 @@
 """ MyHOME integration. """
 
+import json
+import time
+
 import aiofiles
 import yaml
 
 from .own_wrapper import OWNCommand, OWNGatewayCommand
 
 from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, SupportsResponse
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr, entity_registry as er, config_validation as cv
 from homeassistant.const import CONF_MAC
@@ -14,18 +17,37 @@ from homeassistant.const import CONF_MAC
 from .const import (
     ATTR_GATEWAY,
     ATTR_MESSAGE,
+    ATTR_ENABLED,
+    ATTR_RESET,
+    ATTR_DURATION,
+    ATTR_MODE,
+    ATTR_TRACEMALLOC,
+    ATTR_TOP,
     CONF_PLATFORMS,
     CONF_ENTITY,
     CONF_ENTITIES,
-    CONF_GATEWAY,
     CONF_WORKER_COUNT,
     CONF_FILE_PATH,
     CONF_GENERATE_EVENTS,
+    CONF_COALESCE_COMMANDS,
+    CONF_OPTIMISTIC,
+    CONF_WATCHDOG_IDLE_TIMEOUT,
+    CONF_WATCHDOG_PROBE_GRACE,
+    CONF_SKIP_SETUP_TEST,
+    CONF_CAPTURE_FRAMES,
+    CONF_LOG_RATE_LIMIT,
+    CONF_EVENT_FILTERS,
+    CONF_EVENT_BATCH_INTERVAL,
     DOMAIN,
     LOGGER,
 )
 from .validate import config_schema, format_mac
 from .gateway import MyHOMEGatewayHandler
+from .diagnostics import gateway_diagnostics
+from .metrics import METRICS
+from .profiling import DEFAULT_DURATION, DEFAULT_TOP, MAX_DURATION, MODE_SAMPLING, MODES
+from .watchdog import DEFAULT_IDLE_TIMEOUT, DEFAULT_PROBE_GRACE
+from .log_sampling import DEFAULT_LOG_RATE_LIMIT
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 PLATFORMS = ["light", "switch", "cover", "climate", "binary_sensor", "sensor"]
@@ -57,6 +79,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         if CONF_GENERATE_EVENTS in entry.options
         else False
     )
+    _coalesce_commands = (
+        entry.options[CONF_COALESCE_COMMANDS]
+        if CONF_COALESCE_COMMANDS in entry.options
+        else False
+    )
+    _optimistic = (
+        entry.options[CONF_OPTIMISTIC]
+        if CONF_OPTIMISTIC in entry.options
+        else False
+    )
+    _watchdog_idle_timeout = (
+        int(entry.options[CONF_WATCHDOG_IDLE_TIMEOUT])
+        if CONF_WATCHDOG_IDLE_TIMEOUT in entry.options
+        else DEFAULT_IDLE_TIMEOUT
+    )
+    _watchdog_probe_grace = (
+        int(entry.options[CONF_WATCHDOG_PROBE_GRACE])
+        if CONF_WATCHDOG_PROBE_GRACE in entry.options
+        else DEFAULT_PROBE_GRACE
+    )
+    _skip_setup_test = (
+        entry.options[CONF_SKIP_SETUP_TEST]
+        if CONF_SKIP_SETUP_TEST in entry.options
+        else False
+    )
+    _capture_frames = (
+        entry.options[CONF_CAPTURE_FRAMES]
+        if CONF_CAPTURE_FRAMES in entry.options
+        else False
+    )
+    _log_rate_limit = (
+        int(entry.options[CONF_LOG_RATE_LIMIT])
+        if CONF_LOG_RATE_LIMIT in entry.options
+        else DEFAULT_LOG_RATE_LIMIT
+    )
+    _event_filters = (
+        str(entry.options[CONF_EVENT_FILTERS])
+        if CONF_EVENT_FILTERS in entry.options
+        else ""
+    )
+    _event_batch_interval = (
+        int(entry.options[CONF_EVENT_BATCH_INTERVAL])
+        if CONF_EVENT_BATCH_INTERVAL in entry.options
+        else 0
+    )
+    _command_worker_count = (
+        int(entry.options[CONF_WORKER_COUNT])
+        if CONF_WORKER_COUNT in entry.options
+        else 1
+    )
 
     try:
         async with aiofiles.open(_config_file_path, mode="r") as yaml_file:
@@ -80,25 +152,49 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         LOGGER.warning("Migrating config entry unique_id to %s", entry.unique_id)
 
     hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY] = MyHOMEGatewayHandler(
-        hass=hass, config_entry=entry, generate_events=_generate_events
+        hass=hass,
+        config_entry=entry,
+        generate_events=_generate_events,
+        coalesce_commands=_coalesce_commands,
+        optimistic=_optimistic,
+        watchdog_idle_timeout=_watchdog_idle_timeout,
+        watchdog_probe_grace=_watchdog_probe_grace,
+        capture_frames=_capture_frames,
+        log_rate_limit=_log_rate_limit,
+        event_filters=_event_filters,
+        event_batch_interval=_event_batch_interval,
+        command_worker_count=_command_worker_count,
     )
 
-    try:
-        tests_results = await hass.data[DOMAIN][entry.data[CONF_MAC]][
-            CONF_ENTITY
-        ].test()
-    except OSError as ose:
-        _gateway_handler = hass.data[DOMAIN].pop(CONF_GATEWAY)
-        _host = _gateway_handler.gateway.host
-        raise ConfigEntryNotReady(
-            f"Gateway cannot be reached at {_host}, make sure its address is correct."
-        ) from ose
+    await hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].connectivity.async_load()
+
+    if _skip_setup_test and hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].connectivity.is_recent:
+        # The command and event sessions will report any authentication failure.
+        LOGGER.debug(
+            "%s Gateway was reached %.0fs ago, skipping the setup test.",
+            hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].log_id,
+            hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].connectivity.age,
+        )
+        tests_results = {"Success": True, "Message": None}
+    else:
+        try:
+            tests_results = await hass.data[DOMAIN][entry.data[CONF_MAC]][
+                CONF_ENTITY
+            ].test()
+        except OSError as ose:
+            _gateway_handler = hass.data[DOMAIN][entry.data[CONF_MAC]].pop(CONF_ENTITY)
+            await _gateway_handler.close_capture()
+            _host = _gateway_handler.gateway.host
+            raise ConfigEntryNotReady(
+                f"Gateway cannot be reached at {_host}, make sure its address is correct."
+            ) from ose
 
     if not tests_results["Success"]:
         if (
             tests_results["Message"] == "password_error"
             or tests_results["Message"] == "password_required"
         ):
+            hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].connectivity.invalidate()
             hass.async_create_task(
                 hass.config_entries.flow.async_init(
                     DOMAIN,
@@ -106,15 +202,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                     data=entry.data,
                 )
             )
-        del hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY]
+        await hass.data[DOMAIN][entry.data[CONF_MAC]].pop(CONF_ENTITY).close_capture()
         return False
 
-    _command_worker_count = (
-        int(entry.options[CONF_WORKER_COUNT])
-        if CONF_WORKER_COUNT in entry.options
-        else 1
-    )
-
     entity_registry = er.async_get(hass)
     device_registry = dr.async_get(hass)
 
@@ -130,9 +220,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         sw_version=hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].firmware,
     )
 
-    await hass.config_entries.async_forward_entry_setups(
-        entry, hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_PLATFORMS].keys()
-    )
+    await hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].group_index.async_load()
+
+    # The sensor platform also holds the gateway's diagnostic sensors.
+    _platforms = list(hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_PLATFORMS].keys())
+    if "sensor" not in _platforms:
+        _platforms.append("sensor")
+    await hass.config_entries.async_forward_entry_setups(entry, _platforms)
 
     hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].listening_worker = (
         hass.loop.create_task(
@@ -145,6 +239,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                 hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].sending_loop(i)
             )
         )
+    hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].metrics.start()
 
     # Pruning lose entities and devices from the registry
     entity_entries = er.async_entries_for_config_entry(entity_registry, entry.entry_id)
@@ -156,7 +251,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         if entry.entry_id in device_entry.config_entries
     ]
 
-    configured_entities = []
+    configured_entities = [
+        f"{entry.data[CONF_MAC]}-gateway-{_metric}" for _metric in METRICS
+    ]
 
     for _platform in hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_PLATFORMS].keys():
         for _device in hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_PLATFORMS][
@@ -282,6 +379,91 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     hass.services.async_register(DOMAIN, "send_message", handle_send_message)
 
+    async def handle_dump_frames(call):
+        gateway = call.data.get(ATTR_GATEWAY, None)
+        if gateway is None:
+            gateway = list(hass.data[DOMAIN].keys())[0]
+        else:
+            mac = format_mac(gateway)
+            if mac is None:
+                LOGGER.error("Invalid gateway mac `%s`, could not dump frames.", gateway)
+                return False
+            else:
+                gateway = mac
+        if gateway not in hass.data[DOMAIN]:
+            LOGGER.error("Gateway `%s` not found, could not dump frames.", gateway)
+            return False
+        _gateway_handler = hass.data[DOMAIN][gateway][CONF_ENTITY]
+        _path = hass.config.path(f"myhome_frames_{gateway.replace(':', '')}_{time.strftime('%Y%m%d-%H%M%S')}.json")
+        _dump = {
+            "gateway": gateway_diagnostics(_gateway_handler),
+            "frames": _gateway_handler.frame_ring.as_dicts(),
+        }
+        async with aiofiles.open(_path, mode="w") as dump_file:
+            await dump_file.write(json.dumps(_dump, indent=2, default=str))
+        LOGGER.info("%s Dumped the last %d frames to %s", _gateway_handler.log_id, len(_dump["frames"]), _path)
+
+    hass.services.async_register(DOMAIN, "dump_frames", handle_dump_frames)
+
+    async def handle_set_stage_timings(call):
+        gateway = call.data.get(ATTR_GATEWAY, None)
+        if gateway is None:
+            gateway = list(hass.data[DOMAIN].keys())[0]
+        else:
+            mac = format_mac(gateway)
+            if mac is None:
+                LOGGER.error("Invalid gateway mac `%s`, could not set stage timings.", gateway)
+                return False
+            else:
+                gateway = mac
+        if gateway not in hass.data[DOMAIN]:
+            LOGGER.error("Gateway `%s` not found, could not set stage timings.", gateway)
+            return False
+        _gateway_handler = hass.data[DOMAIN][gateway][CONF_ENTITY]
+        if call.data.get(ATTR_RESET, False):
+            _gateway_handler.stage_timings.reset()
+        _gateway_handler.set_stage_timings(call.data.get(ATTR_ENABLED, True))
+        LOGGER.info(
+            "%s Event pipeline stage timings %s.",
+            _gateway_handler.log_id,
+            "enabled" if _gateway_handler.stage_timings.enabled else "disabled",
+        )
+
+    hass.services.async_register(DOMAIN, "set_stage_timings", handle_set_stage_timings)
+
+    async def handle_profile(call):
+        gateway = call.data.get(ATTR_GATEWAY, None)
+        if gateway is None:
+            gateway = list(hass.data[DOMAIN].keys())[0]
+        else:
+            mac = format_mac(gateway)
+            if mac is None:
+                LOGGER.error("Invalid gateway mac `%s`, could not profile.", gateway)
+                return None
+            else:
+                gateway = mac
+        if gateway not in hass.data[DOMAIN]:
+            LOGGER.error("Gateway `%s` not found, could not profile.", gateway)
+            return None
+        _gateway_handler = hass.data[DOMAIN][gateway][CONF_ENTITY]
+        _mode = call.data.get(ATTR_MODE, MODE_SAMPLING)
+        if _mode not in MODES:
+            LOGGER.error("Invalid profiling mode `%s`, expected one of %s.", _mode, ", ".join(MODES))
+            return None
+        if _gateway_handler.profiler.running:
+            LOGGER.error("%s A profiling is already running.", _gateway_handler.log_id)
+            return None
+        return await _gateway_handler.profiler.async_profile(
+            duration=min(max(int(call.data.get(ATTR_DURATION, DEFAULT_DURATION)), 1), MAX_DURATION),
+            mode=_mode,
+            trace_memory=call.data.get(ATTR_TRACEMALLOC, False),
+            top=max(int(call.data.get(ATTR_TOP, DEFAULT_TOP)), 1),
+        )
+
+    hass.services.async_register(
+        DOMAIN, "profile", handle_profile, supports_response=SupportsResponse.OPTIONAL
+    )
+
     return True
 
 
@@ -290,11 +472,17 @@ async def async_unload_entry(hass, entry):
 
     LOGGER.info("Unloading MyHome entry.")
 
-    for platform in hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_PLATFORMS].keys():
+    _platforms = list(hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_PLATFORMS].keys())
+    if "sensor" not in _platforms:
+        _platforms.append("sensor")
+    for platform in _platforms:
         await hass.config_entries.async_forward_entry_unload(entry, platform)
 
     hass.services.async_remove(DOMAIN, "sync_time")
     hass.services.async_remove(DOMAIN, "send_message")
+    hass.services.async_remove(DOMAIN, "dump_frames")
+    hass.services.async_remove(DOMAIN, "set_stage_timings")
+    hass.services.async_remove(DOMAIN, "profile")
 
     gateway_handler = hass.data[DOMAIN][entry.data[CONF_MAC]].pop(CONF_ENTITY)
     del hass.data[DOMAIN][entry.data[CONF_MAC]]
@@ -34,7 +34,6 @@ from .const import (
     CONF_DEVICE_CLASS,
     CONF_INVERTED,
     DOMAIN,
-    LOGGER,
 )
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
@@ -168,11 +167,7 @@ class MyHOMEDryContact(MyHOMEEntity, BinarySensorEntity):
 
     def handle_event(self, message: OWNDryContactEvent):
         """Handle an event message."""
-        LOGGER.info(
-            "%s %s",
-            self._gateway_handler.log_id,
-            message.human_readable_log,
-        )
+        self._gateway_handler.event_log.log(message)
         self._attr_is_on = message.is_on != self._inverted
         self.async_schedule_update_ha_state()
 
@@ -229,11 +224,7 @@ class MyHOMEAuxiliary(MyHOMEEntity, BinarySensorEntity):
 
     def handle_event(self, message: OWNDryContactEvent):
         """Handle an event message."""
-        LOGGER.info(
-            "%s %s",
-            self._gateway_handler.log_id,
-            message.human_readable_log,
-        )
+        self._gateway_handler.event_log.log(message)
         self._attr_is_on = message.is_on != self._inverted
         self.async_schedule_update_ha_state()
 
@@ -318,11 +309,7 @@ class MyHOMEMotionSensor(MyHOMEEntity, BinarySensorEntity, RestoreEntity):
         ]:
             return True
 
-        LOGGER.info(
-            "%s %s",
-            self._gateway_handler.log_id,
-            message.human_readable_log,
-        )
+        self._gateway_handler.event_log.log(message)
         if message.message_type == MESSAGE_TYPE_MOTION and message.motion:
             self._attr_is_on = message.motion != self._inverted
         elif message.message_type == MESSAGE_TYPE_MOTION_TIMEOUT:
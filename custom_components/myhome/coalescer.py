@@ -0,0 +1,87 @@
+"""Coalescing of simultaneous point-to-point commands into group frames."""
+import re
+from typing import Callable, Dict, Tuple
+
+from .own_wrapper import OWNCommand
+from .groups import MyHOMEGroupIndex
+from .const import LOGGER
+
+# How long identical commands are held back waiting for their siblings.
+COALESCE_WINDOW = 0.05
+
+_POINT_COMMAND = re.compile(r"^\*(?P<who>[12])\*(?P<what>\d+(?:#\d+)*)\*(?P<where>\d{2}|\d{4})##$")
+
+
+class MyHOMECommandCoalescer:
+    """Holds identical lighting/automation commands for a short window.
+
+    When the commands pending at the end of the window cover every member of
+    a group declared in the configuration, they are replaced by a single
+    group frame. Learned members, areas and the whole system are never
+    coalesced, as their frames would also switch the actuators missing from
+    Home Assistant. Anything left over is queued unchanged.
+
+    The group frame is queued as a task listing the tasks it replaces under
+    `coalesced`, for the gateway handler to trace and resolve them.
+    """
+
+    def __init__(self, hass, group_index: MyHOMEGroupIndex, enqueue: Callable[[dict], None], log_id: str):
+        self._hass = hass
+        self._group_index = group_index
+        self._enqueue = enqueue
+        self._log_id = log_id
+        self._pending: Dict[Tuple[str, str], Dict[str, dict]] = {}
+        self.commands_coalesced = 0
+        self.frames_saved = 0
+
+    def offer(self, task: dict) -> bool:
+        """Take a queued task over if it can be coalesced, return whether it was."""
+        _match = _POINT_COMMAND.match(str(task["message"]))
+        if _match is None:
+            return False
+
+        _key = (_match.group("who"), _match.group("what"))
+        if _key not in self._pending:
+            self._pending[_key] = {}
+            self._hass.loop.call_later(COALESCE_WINDOW, self._flush, _key)
+
+        _member = f"{_match.group('who')}-{_match.group('where')}"
+        _previous = self._pending[_key].pop(_member, None)
+        if _previous is not None:
+            self._enqueue(_previous)
+        self._pending[_key][_member] = task
+        return True
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        _who, _what = key
+        _pending = self._pending.pop(key, {})
+        _remaining = set(_pending)
+
+        if len(_remaining) > 1:
+            for _address in sorted(self._group_index.groups(_who)):
+                _members = self._group_index.declared_members(_address)
+                if len(_members) < 2 or not _members <= _remaining:
+                    continue
+                _where = _address.partition("-")[2]
+                _message = OWNCommand.parse(f"*{_who}*{_what}*{_where}##")
+                LOGGER.debug(
+                    "%s Coalescing %d commands into `%s`.",
+                    self._log_id,
+                    len(_members),
+                    _message,
+                )
+                self._enqueue(
+                    {
+                        "message": _message,
+                        "is_status_request": False,
+                        "future": None,
+                        "coalesced": [_pending[_member] for _member in sorted(_members)],
+                    }
+                )
+                self.commands_coalesced += len(_members)
+                self.frames_saved += len(_members) - 1
+                _remaining -= _members
+
+        for _member, _task in _pending.items():
+            if _member in _remaining:
+                self._enqueue(_task)
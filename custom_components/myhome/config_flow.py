@@ -33,10 +33,22 @@ from .const import (
     CONF_WORKER_COUNT,
     CONF_FILE_PATH,
     CONF_GENERATE_EVENTS,
+    CONF_COALESCE_COMMANDS,
+    CONF_OPTIMISTIC,
+    CONF_WATCHDOG_IDLE_TIMEOUT,
+    CONF_WATCHDOG_PROBE_GRACE,
+    CONF_SKIP_SETUP_TEST,
+    CONF_CAPTURE_FRAMES,
+    CONF_LOG_RATE_LIMIT,
+    CONF_EVENT_FILTERS,
+    CONF_EVENT_BATCH_INTERVAL,
     DOMAIN,
     LOGGER,
 )
 from .gateway import MyHOMEGatewayHandler  # anche se ora non lo usiamo, ok
+from .watchdog import DEFAULT_IDLE_TIMEOUT, DEFAULT_PROBE_GRACE
+from .log_sampling import DEFAULT_LOG_RATE_LIMIT
+from .events import parse_event_filters
 
 
 class MACAddress:
@@ -299,6 +311,24 @@ class MyhomeOptionsFlowHandler(OptionsFlow):
             self.options[CONF_FILE_PATH] = "/config/myhome.yaml"
         if CONF_GENERATE_EVENTS not in self.options:
             self.options[CONF_GENERATE_EVENTS] = False
+        if CONF_COALESCE_COMMANDS not in self.options:
+            self.options[CONF_COALESCE_COMMANDS] = False
+        if CONF_OPTIMISTIC not in self.options:
+            self.options[CONF_OPTIMISTIC] = False
+        if CONF_WATCHDOG_IDLE_TIMEOUT not in self.options:
+            self.options[CONF_WATCHDOG_IDLE_TIMEOUT] = DEFAULT_IDLE_TIMEOUT
+        if CONF_WATCHDOG_PROBE_GRACE not in self.options:
+            self.options[CONF_WATCHDOG_PROBE_GRACE] = DEFAULT_PROBE_GRACE
+        if CONF_SKIP_SETUP_TEST not in self.options:
+            self.options[CONF_SKIP_SETUP_TEST] = False
+        if CONF_CAPTURE_FRAMES not in self.options:
+            self.options[CONF_CAPTURE_FRAMES] = False
+        if CONF_LOG_RATE_LIMIT not in self.options:
+            self.options[CONF_LOG_RATE_LIMIT] = DEFAULT_LOG_RATE_LIMIT
+        if CONF_EVENT_FILTERS not in self.options:
+            self.options[CONF_EVENT_FILTERS] = ""
+        if CONF_EVENT_BATCH_INTERVAL not in self.options:
+            self.options[CONF_EVENT_BATCH_INTERVAL] = 0
 
     async def async_step_init(self, user_input=None):
         return await self.async_step_user()
@@ -311,6 +341,15 @@ class MyhomeOptionsFlowHandler(OptionsFlow):
             self.options.update({CONF_WORKER_COUNT: user_input[CONF_WORKER_COUNT]})
             self.options.update({CONF_FILE_PATH: user_input[CONF_FILE_PATH]})
             self.options.update({CONF_GENERATE_EVENTS: user_input[CONF_GENERATE_EVENTS]})
+            self.options.update({CONF_COALESCE_COMMANDS: user_input[CONF_COALESCE_COMMANDS]})
+            self.options.update({CONF_OPTIMISTIC: user_input[CONF_OPTIMISTIC]})
+            self.options.update({CONF_WATCHDOG_IDLE_TIMEOUT: user_input[CONF_WATCHDOG_IDLE_TIMEOUT]})
+            self.options.update({CONF_WATCHDOG_PROBE_GRACE: user_input[CONF_WATCHDOG_PROBE_GRACE]})
+            self.options.update({CONF_SKIP_SETUP_TEST: user_input[CONF_SKIP_SETUP_TEST]})
+            self.options.update({CONF_CAPTURE_FRAMES: user_input[CONF_CAPTURE_FRAMES]})
+            self.options.update({CONF_LOG_RATE_LIMIT: user_input[CONF_LOG_RATE_LIMIT]})
+            self.options.update({CONF_EVENT_FILTERS: user_input[CONF_EVENT_FILTERS]})
+            self.options.update({CONF_EVENT_BATCH_INTERVAL: user_input[CONF_EVENT_BATCH_INTERVAL]})
             self.data.update({CONF_HOST: user_input[CONF_ADDRESS]})
             self.data.update({CONF_OWN_PASSWORD: user_input[CONF_OWN_PASSWORD]})
 
@@ -319,6 +358,11 @@ class MyhomeOptionsFlowHandler(OptionsFlow):
             except ipaddress.AddressValueError:
                 errors[CONF_ADDRESS] = "invalid_ip"
 
+            try:
+                parse_event_filters(self.options[CONF_EVENT_FILTERS])
+            except ValueError:
+                errors[CONF_EVENT_FILTERS] = "invalid_event_filters"
+
             if not errors:
                 self.hass.config_entries.async_update_entry(
                     self.config_entry, data=self.data
@@ -352,6 +396,43 @@ class MyhomeOptionsFlowHandler(OptionsFlow):
                         CONF_GENERATE_EVENTS,
                         description={"suggested_value": self.options[CONF_GENERATE_EVENTS]},
                     ): bool,
+                    Required(
+                        CONF_COALESCE_COMMANDS,
+                        description={"suggested_value": self.options[CONF_COALESCE_COMMANDS]},
+                    ): bool,
+                    Required(
+                        CONF_OPTIMISTIC,
+                        description={"suggested_value": self.options[CONF_OPTIMISTIC]},
+                    ): bool,
+                    Required(
+                        CONF_WATCHDOG_IDLE_TIMEOUT,
+                        description={"suggested_value": self.options[CONF_WATCHDOG_IDLE_TIMEOUT]},
+                    ): All(Coerce(int), Range(min=0, max=3600)),
+                    Required(
+                        CONF_WATCHDOG_PROBE_GRACE,
+                        description={"suggested_value": self.options[CONF_WATCHDOG_PROBE_GRACE]},
+                    ): All(Coerce(int), Range(min=1, max=120)),
+                    Required(
+                        CONF_SKIP_SETUP_TEST,
+                        description={"suggested_value": self.options[CONF_SKIP_SETUP_TEST]},
+                    ): bool,
+                    Required(
+                        CONF_CAPTURE_FRAMES,
+                        description={"suggested_value": self.options[CONF_CAPTURE_FRAMES]},
+                    ): bool,
+                    Required(
+                        CONF_LOG_RATE_LIMIT,
+                        description={"suggested_value": self.options[CONF_LOG_RATE_LIMIT]},
+                    ): All(Coerce(int), Range(min=0, max=1000)),
+                    Required(
+                        CONF_EVENT_FILTERS,
+                        default="",
+                        description={"suggested_value": self.options[CONF_EVENT_FILTERS]},
+                    ): str,
+                    Required(
+                        CONF_EVENT_BATCH_INTERVAL,
+                        description={"suggested_value": self.options[CONF_EVENT_BATCH_INTERVAL]},
+                    ): All(Coerce(int), Range(min=0, max=60)),
                 }
             ),
             errors=errors,
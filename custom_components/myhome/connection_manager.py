@@ -0,0 +1,289 @@
+"""Per-gateway ownership of the OpenWebNet sessions."""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Set, Type
+
+from .own_wrapper import (
+    OWNBackoff,
+    OWNCaptureTee,
+    OWNFrameCapture,
+    OWNFrameRing,
+    OWNSession,
+    OWNCommandSession,
+    OWNGateway,
+    OWNTimeouts,
+    SESSION_COUNTERS,
+)
+from .const import LOGGER
+
+# Gateways only accept a handful of concurrent OpenWebNet sessions.
+DEFAULT_SESSION_BUDGET = 5
+# Minimum delay between two connection attempts to the same gateway.
+RECONNECT_STAGGER = 0.5
+# Consecutive failed connection attempts after which the circuit opens.
+CIRCUIT_FAILURE_THRESHOLD = 3
+RECOVERY_HISTORY = 20
+
+HEALTH_CONNECTED = "connected"
+HEALTH_DEGRADED = "degraded"
+HEALTH_CONNECTING = "connecting"
+HEALTH_DISCONNECTED = "disconnected"
+
+
+class MyHOMEConnectionManager:
+    """Owns the lifecycle of all the sessions opened to a gateway.
+
+    Sessions are acquired from and released to the manager, which keeps the
+    number of concurrently open sessions within a budget and spaces out every
+    connection attempt, including the reconnections the sessions make on
+    their own, so that a rebooting gateway is not hit by all of them at once.
+
+    It also acts as a circuit breaker: after a few consecutive failed
+    connection attempts the circuit opens, and stays open until a session
+    manages to connect again, so that commands can be failed right away
+    instead of waiting on a gateway that cannot be reached. The time it takes
+    to recover from each outage is recorded.
+    """
+
+    def __init__(
+        self,
+        gateway: OWNGateway,
+        log_id: str,
+        session_budget: int = DEFAULT_SESSION_BUDGET,
+        backoff: OWNBackoff | None = None,
+        timeouts: OWNTimeouts | None = None,
+        capture: OWNFrameCapture | OWNFrameRing | OWNCaptureTee | None = None,
+    ):
+        self._gateway = gateway
+        self._log_id = log_id
+        self.session_budget = session_budget
+        self.backoff = backoff or OWNBackoff()
+        self.timeouts = timeouts or OWNTimeouts()
+        self.capture = capture
+        self._released_timeout_counts = {_phase: 0 for _phase in OWNTimeouts.PHASES}
+        self._released_counters = {_counter: 0 for _counter in SESSION_COUNTERS}
+        self._budget = asyncio.Semaphore(session_budget)
+        self._sessions: Set[OWNSession] = set()
+        self._connected_once: Set[OWNSession] = set()
+        self._handed_over: OWNCommandSession | None = None
+        self._test_session: OWNCommandSession | None = None
+        self._connect_lock = asyncio.Lock()
+        self._last_attempt = None
+        self._connecting = 0
+        self.connection_attempts: Dict[str, int] = {}
+        self.reconnections = 0
+
+        self._consecutive_failures = 0
+        self.circuit_open = False
+        self._circuit_listeners: List[Callable[[bool], None]] = []
+        self._auth_failure_listeners: List[Callable[[str], None]] = []
+        self._outage_started = None
+        self.recovery_times = deque(maxlen=RECOVERY_HISTORY)
+
+    @property
+    def sessions(self) -> Set[OWNSession]:
+        return set(self._sessions)
+
+    @property
+    def health(self) -> str:
+        """Single health state for the gateway, derived from all its sessions."""
+        _connected = [_session.is_connected for _session in self._sessions]
+        if _connected and all(_connected):
+            return HEALTH_CONNECTED
+        if any(_connected):
+            return HEALTH_DEGRADED
+        if self._connecting:
+            return HEALTH_CONNECTING
+        return HEALTH_DISCONNECTED
+
+    @property
+    def timeout_counts(self) -> Dict[str, int]:
+        """Timeouts per phase of all the sessions opened so far."""
+        _counts = dict(self._released_timeout_counts)
+        for _session in self._sessions:
+            for _phase, _count in _session.timeout_counts.items():
+                _counts[_phase] += _count
+        return _counts
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """Frames received, parse failures, messages sent and NACKs of all
+        the sessions opened so far."""
+        _counters = dict(self._released_counters)
+        for _session in self._sessions:
+            for _counter, _count in _session.counters.items():
+                _counters[_counter] += _count
+        return _counters
+
+    @property
+    def ack_round_trips(self) -> List[float]:
+        """Last ACK round trips of the command sessions currently open."""
+        _round_trips = []
+        for _session in self._sessions:
+            if isinstance(_session, OWNCommandSession):
+                _round_trips.extend(_session.ack_round_trips)
+        return _round_trips
+
+    @property
+    def last_recovery_time(self) -> float | None:
+        """Seconds it took to reconnect after the last outage."""
+        return self.recovery_times[-1] if self.recovery_times else None
+
+    def add_circuit_listener(self, listener: Callable[[bool], None]) -> None:
+        """Register a callback called with the new state when the circuit opens or closes."""
+        self._circuit_listeners.append(listener)
+
+    def add_auth_failure_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback called with the error when a session fails to authenticate."""
+        self._auth_failure_listeners.append(listener)
+
+    async def _connect(self, session: OWNSession) -> None:
+        try:
+            await session.connect()
+        except BaseException:
+            await self.release(session)
+            raise
+
+    async def acquire(self, session_class: Type[OWNSession]) -> OWNSession:
+        """Open and connect a new session once the budget allows it.
+
+        The first command session acquired after a successful test is the
+        test's own, already negotiated, session.
+        """
+        if self._handed_over is not None and session_class is OWNCommandSession:
+            _session, self._handed_over = self._handed_over, None
+            if _session.is_connected:
+                LOGGER.debug("%s Reusing the test session as command session.", self._log_id)
+                return _session
+            await self._connect(_session)
+            return _session
+
+        if self._budget.locked():
+            LOGGER.debug(
+                "%s Session budget of %d reached, waiting for a session to be released.",
+                self._log_id,
+                self.session_budget,
+            )
+        await self._budget.acquire()
+        _session = self._new_session(session_class)
+        await self._connect(_session)
+        return _session
+
+    async def release(self, session: OWNSession) -> None:
+        """Close a session and give its slot back to the budget."""
+        if session is self._handed_over:
+            self._handed_over = None
+        if session not in self._sessions:
+            return
+        self._sessions.discard(session)
+        self._connected_once.discard(session)
+        for _phase, _count in session.timeout_counts.items():
+            self._released_timeout_counts[_phase] += _count
+        for _counter, _count in session.counters.items():
+            self._released_counters[_counter] += _count
+        try:
+            await session.close()
+        finally:
+            self._budget.release()
+
+    async def test(self) -> dict:
+        """Run a connection test within the session budget.
+
+        The test negotiates a command session and, when it succeeds, keeps it
+        open to be handed over to the first command worker, sparing it a
+        second handshake.
+        """
+        await self._budget.acquire()
+        _session = self._new_session(OWNCommandSession)
+        # The caller of the test handles its authentication failures.
+        self._test_session = _session
+        try:
+            _result = await _session.test_connection(keep_open=True)
+        except BaseException:
+            await self.release(_session)
+            raise
+        finally:
+            self._test_session = None
+        if _result["Success"] and _session.is_connected:
+            self._handed_over = _session
+        else:
+            await self.release(_session)
+        return _result
+
+    async def close(self) -> None:
+        """Close every session still open."""
+        for _session in list(self._sessions):
+            await self.release(_session)
+
+    def _new_session(self, session_class: Type[OWNSession]) -> OWNSession:
+        _session = session_class(gateway=self._gateway, logger=LOGGER)
+        _session.connection_gate = self._staggered
+        _session.backoff = self.backoff
+        _session.timeouts = self.timeouts
+        _session.capture = self.capture
+        self._sessions.add(_session)
+        return _session
+
+    @asynccontextmanager
+    async def _staggered(self, session: OWNSession):
+        _loop = asyncio.get_running_loop()
+        if session in self._connected_once:
+            # A session that had been connected is reconnecting.
+            self.reconnections += 1
+            if self._outage_started is None:
+                self._outage_started = _loop.time()
+
+        async with self._connect_lock:
+            if self._last_attempt is not None:
+                _wait = self._last_attempt + RECONNECT_STAGGER - _loop.time()
+                if _wait > 0:
+                    await asyncio.sleep(_wait)
+            self._last_attempt = _loop.time()
+        self.connection_attempts[session.connection_type] = self.connection_attempts.get(session.connection_type, 0) + 1
+        self._connecting += 1
+        try:
+            yield
+        except Exception:
+            self._record_failure()
+            raise
+        else:
+            # Only a negotiated session proves the gateway accepts connections.
+            _result = session.negotiation_result
+            if session.is_connected and _result is not None and _result["Success"]:
+                self._connected_once.add(session)
+                self._record_success()
+            else:
+                self._record_failure()
+                if session.auth_failed and session is not self._test_session:
+                    for _listener in self._auth_failure_listeners:
+                        _listener(_result["Message"])
+        finally:
+            self._connecting -= 1
+
+    def _record_failure(self) -> None:
+        if self._outage_started is None:
+            self._outage_started = asyncio.get_running_loop().time()
+        self._consecutive_failures += 1
+        if not self.circuit_open and self._consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            LOGGER.warning(
+                "%s Gateway unreachable after %d attempts, failing commands until it is back.",
+                self._log_id,
+                self._consecutive_failures,
+            )
+            self._set_circuit(True)
+
+    def _record_success(self) -> None:
+        self._consecutive_failures = 0
+        if self._outage_started is not None:
+            _recovery_time = asyncio.get_running_loop().time() - self._outage_started
+            self._outage_started = None
+            self.recovery_times.append(_recovery_time)
+            LOGGER.info("%s Gateway connection recovered in %.1fs.", self._log_id, _recovery_time)
+        if self.circuit_open:
+            self._set_circuit(False)
+
+    def _set_circuit(self, circuit_open: bool) -> None:
+        self.circuit_open = circuit_open
+        for _listener in self._circuit_listeners:
+            _listener(circuit_open)
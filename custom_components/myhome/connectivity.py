@@ -0,0 +1,49 @@
+"""Cache of the last successful connection to a gateway."""
+import time
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# How long a successful connection allows skipping the setup test.
+MAX_AGE = 24 * 3600
+
+
+class MyHOMEConnectivityCache:
+    """Remembers when the gateway was last successfully connected to.
+
+    It is persisted in the config entry's storage so that, on a restart, the
+    setup test handshake can be skipped when the gateway was reached recently.
+    """
+
+    def __init__(self, hass, entry_id: str):
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.connectivity")
+        self._last_success = None
+
+    async def async_load(self) -> None:
+        _data = await self._store.async_load()
+        if _data is not None:
+            self._last_success = _data.get("last_success")
+
+    @property
+    def age(self) -> float | None:
+        """Seconds elapsed since the last successful connection, if any."""
+        return None if self._last_success is None else time.time() - self._last_success
+
+    @property
+    def is_recent(self) -> bool:
+        return self.age is not None and 0 <= self.age < MAX_AGE
+
+    def record_success(self) -> None:
+        self._last_success = time.time()
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def invalidate(self) -> None:
+        self._last_success = None
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        return {"last_success": self._last_success}
@@ -6,6 +6,12 @@ DOMAIN = "myhome"
 
 ATTR_GATEWAY = "gateway"
 ATTR_MESSAGE = "message"
+ATTR_ENABLED = "enabled"
+ATTR_RESET = "reset"
+ATTR_DURATION = "duration"
+ATTR_MODE = "mode"
+ATTR_TRACEMALLOC = "tracemalloc"
+ATTR_TOP = "top"
 
 CONF = "config"
 CONF_ENTITY = "entity"
@@ -27,11 +33,21 @@ CONF_UDN = "UDN"
 CONF_WORKER_COUNT = "command_worker_count"
 CONF_FILE_PATH = "config_file_path"
 CONF_GENERATE_EVENTS = "generate_events"
+CONF_COALESCE_COMMANDS = "coalesce_commands"
+CONF_OPTIMISTIC = "optimistic"
+CONF_WATCHDOG_IDLE_TIMEOUT = "watchdog_idle_timeout"
+CONF_WATCHDOG_PROBE_GRACE = "watchdog_probe_grace"
+CONF_SKIP_SETUP_TEST = "skip_setup_test"
+CONF_CAPTURE_FRAMES = "capture_frames"
+CONF_LOG_RATE_LIMIT = "log_rate_limit"
+CONF_EVENT_FILTERS = "event_filters"
+CONF_EVENT_BATCH_INTERVAL = "event_batch_interval"
 CONF_PARENT_ID = "parent_id"
 CONF_WHO = "who"
 CONF_WHERE = "where"
 CONF_BUS_INTERFACE = "interface"
 CONF_ZONE = "zone"
+CONF_GROUPS = "groups"
 CONF_DIMMABLE = "dimmable"
 CONF_GATEWAY = "gateway"
 CONF_DEVICE_CLASS = "class"
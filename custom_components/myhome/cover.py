@@ -28,10 +28,10 @@ from .const import (
     CONF_DEVICE_MODEL,
     CONF_ADVANCED_SHUTTER,
     DOMAIN,
-    LOGGER,
 )
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
+from .groups import is_multipoint_address
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
@@ -42,7 +42,8 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     _configured_covers = hass.data[DOMAIN][config_entry.data[CONF_MAC]][CONF_PLATFORMS][PLATFORM]
 
     for _cover in _configured_covers.keys():
-        _cover = MyHOMECover(
+        _cover_class = MyHOMECoverGroup if is_multipoint_address(_configured_covers[_cover][CONF_WHERE]) else MyHOMECover
+        _cover = _cover_class(
             hass=hass,
             device_id=_cover,
             who=_configured_covers[_cover][CONF_WHO],
@@ -130,11 +131,19 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
 
     async def async_open_cover(self, **kwargs):  # pylint: disable=unused-argument
         """Open the cover."""
-        await self._gateway_handler.send(OWNAutomationCommand.raise_shutter(self._full_where))
+        await self._async_send(
+            OWNAutomationCommand.raise_shutter(self._full_where),
+            _attr_is_opening=True,
+            _attr_is_closing=False,
+        )
 
     async def async_close_cover(self, **kwargs):  # pylint: disable=unused-argument
         """Close cover."""
-        await self._gateway_handler.send(OWNAutomationCommand.lower_shutter(self._full_where))
+        await self._async_send(
+            OWNAutomationCommand.lower_shutter(self._full_where),
+            _attr_is_opening=False,
+            _attr_is_closing=True,
+        )
 
     async def async_set_cover_position(self, **kwargs):
         """Move the cover to a specific position."""
@@ -144,15 +153,16 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
 
     async def async_stop_cover(self, **kwargs):  # pylint: disable=unused-argument
         """Stop the cover."""
-        await self._gateway_handler.send(OWNAutomationCommand.stop_shutter(self._full_where))
+        await self._async_send(
+            OWNAutomationCommand.stop_shutter(self._full_where),
+            _attr_is_opening=False,
+            _attr_is_closing=False,
+        )
 
     def handle_event(self, message: OWNAutomationEvent):
         """Handle an event message."""
-        LOGGER.info(
-            "%s %s",
-            self._gateway_handler.log_id,
-            message.human_readable_log,
-        )
+        self._gateway_handler.event_log.log(message)
+        self._confirm_optimistic_state()
         self._attr_is_opening = message.is_opening
         self._attr_is_closing = message.is_closing
         if message.is_closed is not None:
@@ -161,3 +171,53 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
             self._attr_current_cover_position = message.current_position
 
         self.async_schedule_update_ha_state()
+
+
+class MyHOMECoverGroup(MyHOMECover):
+    """A general, area or group cover.
+
+    Commands are sent as a single frame to the general, area or group WHERE
+    and, once the gateway ACKed them, the known member covers are updated
+    locally right away, instead of waiting for each of them to report back on
+    the bus.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Whether the gateway ACKed the last command sent to the group.
+        self._acked = False
+
+        if self._where.startswith("#"):
+            self._attr_extra_state_attributes = {"Group": self._where[1:]}
+        elif self._where != "0":
+            self._attr_extra_state_attributes = {"A": self._where}
+        else:
+            self._attr_extra_state_attributes = {}
+
+    async def async_open_cover(self, **kwargs):
+        """Open all the covers of the group."""
+        await super().async_open_cover(**kwargs)
+        if self._acked:
+            self._apply_locally(OWNAutomationEvent(f"*2*1*{self._full_where}##"))
+
+    async def async_close_cover(self, **kwargs):
+        """Close all the covers of the group."""
+        await super().async_close_cover(**kwargs)
+        if self._acked:
+            self._apply_locally(OWNAutomationEvent(f"*2*2*{self._full_where}##"))
+
+    async def async_stop_cover(self, **kwargs):
+        """Stop all the covers of the group."""
+        await super().async_stop_cover(**kwargs)
+        if self._acked:
+            self._apply_locally(OWNAutomationEvent(f"*2*0*{self._full_where}##"))
+
+    async def _async_send(self, message, **optimistic_state):
+        """Send a command to the group and wait for the gateway's reply, the
+        members are only updated once it was ACKed."""
+        self._acked = await self._gateway_handler.send(message, wait_for_ack=True)
+        return self._acked
+
+    def _apply_locally(self, event: OWNAutomationEvent):
+        self.handle_event(event)
+        self._gateway_handler.update_members(self._device_id, event)
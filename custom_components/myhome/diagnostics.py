@@ -0,0 +1,46 @@
+"""Diagnostics support for MyHOME."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_MAC, CONF_PASSWORD
+
+from .const import CONF_ENTITY, DOMAIN
+
+TO_REDACT = {CONF_PASSWORD}
+
+
+def gateway_diagnostics(gateway_handler) -> dict:
+    """Connection state and statistics of a gateway."""
+    _manager = gateway_handler.connection_manager
+    _watchdog = gateway_handler.watchdog
+    return {
+        "health": gateway_handler.health,
+        "circuit_open": _manager.circuit_open,
+        "connection_attempts": _manager.connection_attempts,
+        "timeout_counts": _manager.timeout_counts,
+        "session_counters": _manager.counters,
+        "recovery_times": list(_manager.recovery_times),
+        "queued_commands": gateway_handler.send_buffer.qsize(),
+        "watchdog": {
+            "probes_sent": _watchdog.probes_sent,
+            "probes_answered": _watchdog.probes_answered,
+            "reconnects": _watchdog.reconnects,
+            "detection_latencies": list(_watchdog.detection_latencies),
+        },
+        "stage_timings": gateway_handler.stage_timings.as_dict(),
+        "command_latencies": gateway_handler.command_tracer.as_dict(),
+        "metrics": dict(gateway_handler.metrics.values),
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    _gateway_handler = hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY]
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "gateway": gateway_diagnostics(_gateway_handler),
+        "frames": _gateway_handler.frame_ring.as_dicts(),
+    }
@@ -0,0 +1,150 @@
+"""Filtering, rate limiting and batching of the `myhome_message_event` events."""
+import time
+from typing import Callable, List, NamedTuple
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .own_wrapper import OWNMessage, OWNTranslation
+
+MESSAGE_EVENT = "myhome_message_event"
+BATCH_EVENT = "myhome_message_batch"
+
+FAMILIES = ("event", "command", "request", "command_translation")
+# Events fired at once when a batch grows that large before its interval ends.
+MAX_BATCH_SIZE = 500
+
+
+class MyHOMEEventRule(NamedTuple):
+    who: int | None
+    where_prefix: str | None
+    family: str | None
+    rate: int | None
+
+
+def parse_event_filters(text: str) -> List[MyHOMEEventRule]:
+    """Parse filter rules such as `who=1 where=2 family=event rate=5; who=4`.
+
+    Rules are separated by `;` or new lines and made of `key=value` pairs,
+    all optional: `who`, `where` (prefix of the WHERE), `family` (one of
+    FAMILIES) and `rate`, the maximum events per second for the rule.
+    Raise ValueError when a rule is invalid.
+    """
+    _rules = []
+    for _rule in text.replace("\n", ";").split(";"):
+        if not _rule.strip():
+            continue
+        _fields = {}
+        for _pair in _rule.split():
+            _key, _separator, _value = _pair.partition("=")
+            if not _separator or not _value or _key in _fields:
+                raise ValueError(f"Invalid event filter `{_rule.strip()}`")
+            _fields[_key] = _value
+        if not set(_fields) <= {"who", "where", "family", "rate"}:
+            raise ValueError(f"Invalid event filter `{_rule.strip()}`")
+        if "family" in _fields and _fields["family"] not in FAMILIES:
+            raise ValueError(f"Invalid message family `{_fields['family']}`")
+        _rules.append(
+            MyHOMEEventRule(
+                int(_fields["who"]) if "who" in _fields else None,
+                _fields.get("where"),
+                _fields.get("family"),
+                int(_fields["rate"]) if "rate" in _fields else None,
+            )
+        )
+    return _rules
+
+
+class MyHOMEEventFilter:
+    """Decides which messages are fired as `myhome_message_event` events.
+
+    Without rules every frame received is fired, as before. With rules, only
+    the messages matching one of them are, up to the rule's rate, and frames
+    that could not be parsed into a message are not. With a batch interval,
+    the events are collected and fired together as a single
+    `myhome_message_batch` event holding their list, once per interval.
+    """
+
+    def __init__(self, hass, gateway_host: str, rules: List[MyHOMEEventRule] | None = None, batch_interval: float = 0):
+        self._hass = hass
+        self._gateway_host = gateway_host
+        self.rules = rules or []
+        self.batch_interval = batch_interval
+        # Start of the current one second window and events fired in it, per rule.
+        self._windows = [[0.0, 0] for _ in self.rules]
+        self._batch: List[dict] = []
+        self._flush: Callable[[], None] | None = None
+        self.fired = 0
+        self.filtered = 0
+        self.rate_limited = 0
+
+    def handle(self, message) -> None:
+        if self.rules:
+            if not isinstance(message, (OWNMessage, OWNTranslation)):
+                self.filtered += 1
+                return
+            _index = self._match(message)
+            if _index is None:
+                self.filtered += 1
+                return
+            if self.rules[_index].rate is not None and not self._allow(_index):
+                self.rate_limited += 1
+                return
+
+        if isinstance(message, OWNTranslation):
+            # Only parsed once it is fired, for its event to carry the same
+            # content as before the translations were skipped.
+            message = OWNMessage.parse(str(message)) or message
+        if isinstance(message, OWNMessage):
+            _event_content = {"gateway": self._gateway_host}
+            _event_content.update(message.event_content)
+        else:
+            _event_content = {"gateway": self._gateway_host, "message": str(message)}
+        self.fired += 1
+
+        if self.batch_interval <= 0:
+            self._hass.bus.async_fire(MESSAGE_EVENT, _event_content)
+            return
+        del _event_content["gateway"]
+        self._batch.append(_event_content)
+        if len(self._batch) >= MAX_BATCH_SIZE:
+            self.flush()
+        elif self._flush is None:
+            self._flush = async_call_later(self._hass, self.batch_interval, self._flush_later)
+
+    def _match(self, message: OWNMessage | OWNTranslation) -> int | None:
+        for _index, _rule in enumerate(self.rules):
+            if _rule.who is not None and _rule.who != message.who:
+                continue
+            if _rule.where_prefix is not None and not (message.where or "").startswith(_rule.where_prefix):
+                continue
+            if _rule.family is not None and _rule.family != (message.family or "").lower():
+                continue
+            return _index
+        return None
+
+    def _allow(self, index: int) -> bool:
+        _now = time.monotonic()
+        _window = self._windows[index]
+        if _now - _window[0] >= 1:
+            _window[0] = _now
+            _window[1] = 0
+        if _window[1] < self.rules[index].rate:
+            _window[1] += 1
+            return True
+        return False
+
+    @callback
+    def _flush_later(self, _now) -> None:
+        self._flush = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Fire the events collected so far as a single batch."""
+        if self._flush is not None:
+            self._flush()
+            self._flush = None
+        if not self._batch:
+            return
+        _messages, self._batch = self._batch, []
+        self._hass.bus.async_fire(BATCH_EVENT, {"gateway": self._gateway_host, "messages": _messages})
@@ -1,5 +1,6 @@
 """Code to handle a MyHome Gateway."""
 import asyncio
+import time
 from typing import Dict, List
 
 from homeassistant.const import (
@@ -11,6 +12,7 @@ from homeassistant.const import (
     CONF_MAC,
     CONF_FRIENDLY_NAME,
 )
+from homeassistant.config_entries import SOURCE_REAUTH
 from homeassistant.components.light import DOMAIN as LIGHT
 from homeassistant.components.switch import (
     SwitchDeviceClass,
@@ -28,7 +30,16 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.components.climate import DOMAIN as CLIMATE
 
-from .own_wrapper import OWNSession, OWNEventSession, OWNCommandSession, OWNGateway
+from .own_wrapper import (
+    OWNEventSession,
+    OWNCommandSession,
+    OWNCaptureTee,
+    OWNFrameCapture,
+    OWNFrameRing,
+    OWNGateway,
+    SEND_ACK,
+    SEND_ERROR,
+)
 from .own_wrapper import (
     OWNMessage,
     OWNLightingEvent,
@@ -44,6 +55,7 @@ from .own_wrapper import (
     OWNGatewayEvent,
     OWNGatewayCommand,
     OWNCommand,
+    OWNTranslation,
 )
 
 from .const import (
@@ -59,10 +71,25 @@ from .const import (
     CONF_SHORT_RELEASE,
     CONF_LONG_PRESS,
     CONF_LONG_RELEASE,
+    CONF_GROUPS,
+    CONF_WHO,
+    CONF_WHERE,
+    CONF_BUS_INTERFACE,
     DOMAIN,
     LOGGER,
 )
 from .myhome_device import MyHOMEEntity
+from .groups import MyHOMEGroupIndex
+from .coalescer import MyHOMECommandCoalescer
+from .connection_manager import MyHOMEConnectionManager, DEFAULT_SESSION_BUDGET
+from .connectivity import MyHOMEConnectivityCache
+from .retry import MyHOMERetryPolicy
+from .instrumentation import MyHOMECommandTracer, MyHOMEStageTimings
+from .metrics import MyHOMEGatewayMetrics, MyHOMESendQueue
+from .profiling import MyHOMEProfiler
+from .log_sampling import DEFAULT_LOG_RATE_LIMIT, MyHOMEEventLogger
+from .events import MyHOMEEventFilter, parse_event_filters
+from .watchdog import MyHOMEEventWatchdog, DEFAULT_IDLE_TIMEOUT, DEFAULT_PROBE_GRACE
 from .button import (
     DisableCommandButtonEntity,
     EnableCommandButtonEntity,
@@ -72,7 +99,21 @@ from .button import (
 class MyHOMEGatewayHandler:
     """Manages a single MyHOME Gateway."""
 
-    def __init__(self, hass, config_entry, generate_events: bool = False):
+    def __init__(
+        self,
+        hass,
+        config_entry,
+        generate_events: bool = False,
+        coalesce_commands: bool = False,
+        optimistic: bool = False,
+        watchdog_idle_timeout: int = DEFAULT_IDLE_TIMEOUT,
+        watchdog_probe_grace: int = DEFAULT_PROBE_GRACE,
+        capture_frames: bool = False,
+        log_rate_limit: int = DEFAULT_LOG_RATE_LIMIT,
+        event_filters: str = "",
+        event_batch_interval: int = 0,
+        command_worker_count: int = 1,
+    ):
         build_info = {
             "address": config_entry.data[CONF_HOST],
             "port": config_entry.data[CONF_PORT],
@@ -92,17 +133,77 @@ class MyHOMEGatewayHandler:
         self.hass = hass
         self.config_entry = config_entry
         self.generate_events = generate_events
+        self.optimistic = optimistic
 
-        # Gateway OWNd (pip) tramite own_wrapper
+        # Gateway OWNd (vendored) tramite own_wrapper
         self.gateway = OWNGateway(build_info)
+        self.event_log = MyHOMEEventLogger(self.gateway.log_id, log_rate_limit)
+        if generate_events:
+            try:
+                _event_rules = parse_event_filters(event_filters)
+            except ValueError as error:
+                LOGGER.error("%s %s, firing every message event.", self.log_id, error)
+                _event_rules = []
+            self.event_filter = MyHOMEEventFilter(hass, str(self.gateway.host), _event_rules, event_batch_interval)
+        else:
+            self.event_filter = None
+        self.capture = (
+            OWNFrameCapture(hass.config.path(f"myhome_{self.mac.replace(':', '')}.owncap"))
+            if capture_frames
+            else None
+        )
+        if self.capture is not None:
+            LOGGER.info("%s Capturing frames to %s", self.log_id, self.capture.path)
+            self.capture.start()
+        # Last frames exchanged with the gateway, for the diagnostics.
+        self.frame_ring = OWNFrameRing()
+        self.connection_manager = MyHOMEConnectionManager(
+            self.gateway,
+            self.gateway.log_id,
+            # The event session and every command worker hold a session.
+            session_budget=max(DEFAULT_SESSION_BUDGET, command_worker_count + 1),
+            capture=OWNCaptureTee(self.frame_ring, self.capture) if self.capture is not None else self.frame_ring,
+        )
+        self.connection_manager.add_circuit_listener(self._circuit_changed)
+        self.connection_manager.add_auth_failure_listener(self._auth_failed)
+        self.connectivity = MyHOMEConnectivityCache(hass, config_entry.entry_id)
+        self._reauth_requested = False
 
         self._terminate_listener = False
         self._terminate_sender = False
         self.is_connected = False
 
         self.listening_worker: asyncio.tasks.Task | None = None
+        self._event_session: OWNEventSession | None = None
+        self.watchdog = MyHOMEEventWatchdog(hass, self, watchdog_idle_timeout, watchdog_probe_grace)
+        self.stage_timings = MyHOMEStageTimings()
+        self.command_tracer = MyHOMECommandTracer()
         self.sending_workers: List[asyncio.tasks.Task] = []
-        self.send_buffer: asyncio.Queue = asyncio.Queue()
+        self.send_buffer: MyHOMESendQueue = MyHOMESendQueue()
+        self._pending_status_requests: dict = {}
+        self._running_senders = 0
+        self._senders_stopped = False
+        self.retry_policy = MyHOMERetryPolicy()
+        self._latest_tasks: dict = {}
+        self.unsupported_messages = 0
+        self.metrics = MyHOMEGatewayMetrics(hass, self)
+        self.profiler = MyHOMEProfiler(hass, self)
+
+        self.group_index = MyHOMEGroupIndex(hass, config_entry.entry_id, self.gateway.log_id)
+        for _platform in (LIGHT, SWITCH, COVER):
+            if _platform not in hass.data[DOMAIN][self.mac][CONF_PLATFORMS]:
+                continue
+            for _device_id, _device in hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform].items():
+                for _group in _device.get(CONF_GROUPS, []):
+                    self.group_index.declare(f"{_device[CONF_WHO]}-{_group}", _device_id)
+                if _device.get(CONF_BUS_INTERFACE) is None:
+                    self.group_index.register_point(_device_id, _device[CONF_WHO], _device[CONF_WHERE])
+
+        self.coalescer = (
+            MyHOMECommandCoalescer(hass, self.group_index, self._enqueue, self.gateway.log_id)
+            if coalesce_commands
+            else None
+        )
 
     @property
     def mac(self) -> str:
@@ -132,13 +233,19 @@ class MyHOMEGatewayHandler:
     def firmware(self) -> str:
         return self.gateway.firmware
 
+    @property
+    def health(self) -> str:
+        return self.connection_manager.health
+
+    def set_stage_timings(self, enabled: bool) -> None:
+        """Start or stop timing the stages of the event pipeline."""
+        self.stage_timings.enabled = enabled
+        if self._event_session is not None:
+            self._event_session.stage_timer = self.stage_timings.record if enabled else None
+
     async def test(self) -> Dict:
         """Esegue il test di connessione (usato dal config_flow)."""
-        session = OWNSession(
-            gateway=self.gateway,
-            logger=LOGGER,
-        )
-        return await session.test_connection()
+        return await self.connection_manager.test()
 
     async def listening_loop(self):
         """Loop che mantiene aperta la sessione EVENT e gestisce i messaggi in ingresso."""
@@ -146,259 +253,529 @@ class MyHOMEGatewayHandler:
 
         LOGGER.debug("%s Creating listening worker.", self.log_id)
 
-        _event_session = OWNEventSession(
-            gateway=self.gateway,
-            logger=LOGGER,
-        )
-        await _event_session.connect()
+        _event_session = await self.connection_manager.acquire(OWNEventSession)
+        self._event_session = _event_session
+        self.set_stage_timings(self.stage_timings.enabled)
 
         self.is_connected = True
+        if _event_session.is_connected:
+            self.connectivity.record_success()
+        self.watchdog.start()
+
+        # A session refused the password is not reconnected, the entry waits for
+        # its reauthentication instead.
+        while not self._terminate_listener and not _event_session.auth_failed:
+            _messages = await _event_session.get_next_batch()
+            if _messages:
+                self.watchdog.feed()
+            for message in _messages:
+                try:
+                    if self.stage_timings.enabled:
+                        _start = time.perf_counter()
+                        await self._handle_message(message)
+                        self.stage_timings.record("dispatch", type(message).__name__, time.perf_counter() - _start)
+                    else:
+                        await self._handle_message(message)
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception("%s Could not handle message `%s`:", self.log_id, message)
+
+        self.watchdog.stop()
+        self._event_session = None
+        await self.connection_manager.release(_event_session)
+        self.is_connected = False
+        LOGGER.debug("%s Destroying listening worker.", self.log_id)
+        self.listening_worker.cancel()
 
-        while not self._terminate_listener:
-            message = await _event_session.get_next()
-            LOGGER.debug("%s Message received: `%s`", self.log_id, message)
-
-            if self.generate_events:
-                if isinstance(message, OWNMessage):
-                    _event_content = {"gateway": str(self.gateway.host)}
-                    _event_content.update(message.event_content)
-                    self.hass.bus.async_fire("myhome_message_event", _event_content)
-                else:
-                    self.hass.bus.async_fire(
-                        "myhome_message_event",
-                        {"gateway": str(self.gateway.host), "message": str(message)},
-                    )
+    async def _handle_message(self, message) -> None:
+        """Handle a single message received on the event session."""
+        LOGGER.debug("%s Message received: `%s`", self.log_id, message)
 
-            if not isinstance(message, OWNMessage):
-                LOGGER.warning("%s Data received is not a message: `%s`", self.log_id, message)
-            elif isinstance(message, OWNEnergyEvent):
-                if (
-                    SENSOR in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS]
-                    and message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR]
-                ):
-                    for _entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES]:
-                        if isinstance(
-                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES][_entity],
-                            MyHOMEEntity,
-                        ):
-                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES][_entity].handle_event(
-                                message
-                            )
-                else:
-                    continue
-            elif (
-                isinstance(message, OWNLightingEvent)
-                or isinstance(message, OWNAutomationEvent)
-                or isinstance(message, OWNDryContactEvent)
-                or isinstance(message, OWNAuxEvent)
-                or isinstance(message, OWNHeatingEvent)
+        if self.event_filter is not None:
+            self.event_filter.handle(message)
+
+        if isinstance(message, OWNTranslation):
+            # Command translations are skipped by the event session, unparsed.
+            return
+
+        if not isinstance(message, OWNMessage):
+            LOGGER.warning("%s Data received is not a message: `%s`", self.log_id, message)
+        elif isinstance(message, OWNEnergyEvent):
+            if (
+                SENSOR in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS]
+                and message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR]
             ):
-                if not message.is_translation:
-                    is_event = False
-                    if isinstance(message, OWNLightingEvent):
-                        if message.is_general:
-                            is_event = True
-                            event = "on" if message.is_on else "off"
-                            self.hass.bus.async_fire(
-                                "myhome_general_light_event",
-                                {"message": str(message), "event": event},
-                            )
-                            await asyncio.sleep(0.1)
-                            await self.send_status_request(OWNLightingCommand.status("0"))
-                        elif message.is_area:
-                            is_event = True
-                            event = "on" if message.is_on else "off"
-                            self.hass.bus.async_fire(
-                                "myhome_area_light_event",
-                                {"message": str(message), "area": message.area, "event": event},
-                            )
-                            await asyncio.sleep(0.1)
-                            await self.send_status_request(OWNLightingCommand.status(message.area))
-                        elif message.is_group:
-                            is_event = True
-                            event = "on" if message.is_on else "off"
-                            self.hass.bus.async_fire(
-                                "myhome_group_light_event",
-                                {"message": str(message), "group": message.group, "event": event},
-                            )
-                    elif isinstance(message, OWNAutomationEvent):
-                        if message.is_general:
-                            is_event = True
-                            if message.is_opening and not message.is_closing:
-                                event = "open"
-                            elif message.is_closing and not message.is_opening:
-                                event = "close"
-                            else:
-                                event = "stop"
-                            self.hass.bus.async_fire(
-                                "myhome_general_automation_event",
-                                {"message": str(message), "event": event},
-                            )
-                        elif message.is_area:
-                            is_event = True
-                            if message.is_opening and not message.is_closing:
-                                event = "open"
-                            elif message.is_closing and not message.is_opening:
-                                event = "close"
-                            else:
-                                event = "stop"
-                            self.hass.bus.async_fire(
-                                "myhome_area_automation_event",
-                                {"message": str(message), "area": message.area, "event": event},
-                            )
-                        elif message.is_group:
-                            is_event = True
-                            if message.is_opening and not message.is_closing:
-                                event = "open"
-                            elif message.is_closing and not message.is_opening:
-                                event = "close"
-                            else:
-                                event = "stop"
-                            self.hass.bus.async_fire(
-                                "myhome_group_automation_event",
-                                {"message": str(message), "group": message.group, "event": event},
-                            )
-                    if not is_event:
-                        if isinstance(message, OWNLightingEvent) and message.brightness_preset:
-                            if isinstance(
-                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT][message.entity][CONF_ENTITIES][LIGHT],
-                                MyHOMEEntity,
-                            ):
-                                await self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT][message.entity][CONF_ENTITIES][
-                                    LIGHT
-                                ].async_update()
+                for _entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES]:
+                    if isinstance(
+                        self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES][_entity],
+                        MyHOMEEntity,
+                    ):
+                        self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES][_entity].handle_event(
+                            message
+                        )
+        elif (
+            isinstance(message, OWNLightingEvent)
+            or isinstance(message, OWNAutomationEvent)
+            or isinstance(message, OWNDryContactEvent)
+            or isinstance(message, OWNAuxEvent)
+            or isinstance(message, OWNHeatingEvent)
+        ):
+            if not message.is_translation:
+                is_event = False
+                if isinstance(message, (OWNLightingEvent, OWNAutomationEvent)):
+                    self.group_index.observe(message)
+                if isinstance(message, OWNLightingEvent):
+                    if message.is_general:
+                        is_event = True
+                        event = "on" if message.is_on else "off"
+                        self.hass.bus.async_fire(
+                            "myhome_general_light_event",
+                            {"message": str(message), "event": event},
+                        )
+                        self._update_members(message)
+                        await asyncio.sleep(0.1)
+                        await self.send_status_request(OWNLightingCommand.status("0"))
+                    elif message.is_area:
+                        is_event = True
+                        event = "on" if message.is_on else "off"
+                        self.hass.bus.async_fire(
+                            "myhome_area_light_event",
+                            {"message": str(message), "area": message.area, "event": event},
+                        )
+                        self._update_members(message)
+                        await asyncio.sleep(0.1)
+                        await self.send_status_request(OWNLightingCommand.status(message.area))
+                    elif message.is_group:
+                        is_event = True
+                        event = "on" if message.is_on else "off"
+                        self.hass.bus.async_fire(
+                            "myhome_group_light_event",
+                            {"message": str(message), "group": message.group, "event": event},
+                        )
+                        self._update_members(message)
+                elif isinstance(message, OWNAutomationEvent):
+                    if message.is_general:
+                        is_event = True
+                        if message.is_opening and not message.is_closing:
+                            event = "open"
+                        elif message.is_closing and not message.is_opening:
+                            event = "close"
                         else:
-                            for _platform in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS]:
-                                if _platform != BUTTON and message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform]:
-                                    for _entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES]:
-                                        if (
-                                            isinstance(
-                                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity],
-                                                MyHOMEEntity,
-                                            )
-                                            and not isinstance(
-                                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity],
-                                                DisableCommandButtonEntity,
-                                            )
-                                            and not isinstance(
-                                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity],
-                                                EnableCommandButtonEntity,
-                                            )
-                                        ):
-                                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity].handle_event(
-                                                message
-                                            )
-
-                else:
-                    LOGGER.debug("%s Ignoring translation message `%s`", self.log_id, message)
-            elif isinstance(message, OWNHeatingCommand) and message.dimension is not None and message.dimension == 14:
-                where = message.where[1:] if message.where.startswith("#") else message.where
-                LOGGER.debug("%s Received heating command, sending query to zone %s", self.log_id, where)
-                await self.send_status_request(OWNHeatingCommand.status(where))
-            elif isinstance(message, OWNCENPlusEvent):
-                if message.is_short_pressed:
-                    event = CONF_SHORT_PRESS
-                elif message.is_held or message.is_still_held:
-                    event = CONF_LONG_PRESS
-                elif message.is_released:
-                    event = CONF_LONG_RELEASE
-                else:
-                    event = None
-                self.hass.bus.async_fire(
-                    "myhome_cenplus_event",
-                    {"object": int(message.object), "pushbutton": int(message.push_button), "event": event},
-                )
-                LOGGER.info("%s %s", self.log_id, message.human_readable_log)
-            elif isinstance(message, OWNCENEvent):
-                if message.is_pressed:
-                    event = CONF_SHORT_PRESS
-                elif message.is_released_after_short_press:
-                    event = CONF_SHORT_RELEASE
-                elif message.is_held:
-                    event = CONF_LONG_PRESS
-                elif message.is_released_after_long_press:
-                    event = CONF_LONG_RELEASE
-                else:
-                    event = None
-                self.hass.bus.async_fire(
-                    "myhome_cen_event",
-                    {"object": int(message.object), "pushbutton": int(message.push_button), "event": event},
-                )
-                LOGGER.info("%s %s", self.log_id, message.human_readable_log)
-            elif isinstance(message, OWNGatewayEvent) or isinstance(message, OWNGatewayCommand):
-                LOGGER.info("%s %s", self.log_id, message.human_readable_log)
-            else:
-                LOGGER.info("%s Unsupported message type: `%s`", self.log_id, message)
+                            event = "stop"
+                        self.hass.bus.async_fire(
+                            "myhome_general_automation_event",
+                            {"message": str(message), "event": event},
+                        )
+                        self._update_members(message)
+                    elif message.is_area:
+                        is_event = True
+                        if message.is_opening and not message.is_closing:
+                            event = "open"
+                        elif message.is_closing and not message.is_opening:
+                            event = "close"
+                        else:
+                            event = "stop"
+                        self.hass.bus.async_fire(
+                            "myhome_area_automation_event",
+                            {"message": str(message), "area": message.area, "event": event},
+                        )
+                        self._update_members(message)
+                    elif message.is_group:
+                        is_event = True
+                        if message.is_opening and not message.is_closing:
+                            event = "open"
+                        elif message.is_closing and not message.is_opening:
+                            event = "close"
+                        else:
+                            event = "stop"
+                        self.hass.bus.async_fire(
+                            "myhome_group_automation_event",
+                            {"message": str(message), "group": message.group, "event": event},
+                        )
+                        self._update_members(message)
+                if not is_event:
+                    self._dispatch_event(message.entity, message)
+                    if (
+                        isinstance(message, OWNLightingEvent)
+                        and message.brightness_preset
+                        and LIGHT in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS]
+                        and message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT]
+                        and isinstance(
+                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT][message.entity][CONF_ENTITIES].get(LIGHT),
+                            MyHOMEEntity,
+                        )
+                    ):
+                        # The preset already gave the light an approximate brightness, the exact
+                        # level is requested in the background to refine it.
+                        self.hass.async_create_task(
+                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT][message.entity][CONF_ENTITIES][LIGHT].async_update()
+                        )
 
-        await _event_session.close()
-        self.is_connected = False
-        LOGGER.debug("%s Destroying listening worker.", self.log_id)
-        self.listening_worker.cancel()
+            else:
+                LOGGER.debug("%s Ignoring translation message `%s`", self.log_id, message)
+        elif isinstance(message, OWNHeatingCommand) and message.dimension is not None and message.dimension == 14:
+            where = message.where[1:] if message.where.startswith("#") else message.where
+            LOGGER.debug("%s Received heating command, sending query to zone %s", self.log_id, where)
+            await self.send_status_request(OWNHeatingCommand.status(where))
+        elif isinstance(message, OWNCENPlusEvent):
+            if message.is_short_pressed:
+                event = CONF_SHORT_PRESS
+            elif message.is_held or message.is_still_held:
+                event = CONF_LONG_PRESS
+            elif message.is_released:
+                event = CONF_LONG_RELEASE
+            else:
+                event = None
+            self.hass.bus.async_fire(
+                "myhome_cenplus_event",
+                {"object": int(message.object), "pushbutton": int(message.push_button), "event": event},
+            )
+            self.event_log.log(message)
+        elif isinstance(message, OWNCENEvent):
+            if message.is_pressed:
+                event = CONF_SHORT_PRESS
+            elif message.is_released_after_short_press:
+                event = CONF_SHORT_RELEASE
+            elif message.is_held:
+                event = CONF_LONG_PRESS
+            elif message.is_released_after_long_press:
+                event = CONF_LONG_RELEASE
+            else:
+                event = None
+            self.hass.bus.async_fire(
+                "myhome_cen_event",
+                {"object": int(message.object), "pushbutton": int(message.push_button), "event": event},
+            )
+            self.event_log.log(message)
+        elif isinstance(message, OWNGatewayEvent) or isinstance(message, OWNGatewayCommand):
+            self.event_log.log(message)
+        else:
+            self.unsupported_messages += 1
+            LOGGER.info("%s Unsupported message type: `%s`", self.log_id, message)
+
+    def drop_event_session(self) -> None:
+        """Drop the event session's connection so that the listening loop reconnects it."""
+        if self._event_session is not None:
+            self._event_session.abort()
+
+    def _dispatch_event(self, entity: str, message: OWNMessage) -> None:
+        """Hand a message over to all the entities configured for a device."""
+        if self.command_tracer.pending:
+            self.command_tracer.confirm(message)
+        _timed = self.stage_timings.enabled
+        if _timed:
+            _start = time.perf_counter()
+            _handling = 0.0
+        for _platform in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS]:
+            if _platform != BUTTON and entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform]:
+                for _entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][entity][CONF_ENTITIES]:
+                    if (
+                        isinstance(
+                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][entity][CONF_ENTITIES][_entity],
+                            MyHOMEEntity,
+                        )
+                        and not isinstance(
+                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][entity][CONF_ENTITIES][_entity],
+                            DisableCommandButtonEntity,
+                        )
+                        and not isinstance(
+                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][entity][CONF_ENTITIES][_entity],
+                            EnableCommandButtonEntity,
+                        )
+                    ):
+                        if _timed:
+                            _handle_start = time.perf_counter()
+                        self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][entity][CONF_ENTITIES][_entity].handle_event(message)
+                        if _timed:
+                            _handling += time.perf_counter() - _handle_start
+        if _timed:
+            _class = type(message).__name__
+            self.stage_timings.record("routing", _class, time.perf_counter() - _start - _handling)
+            self.stage_timings.record("handle_event", _class, _handling)
+
+    def _update_members(self, message: OWNMessage) -> None:
+        """Apply a general, area or group event to its entity and all its known members at once."""
+        self._dispatch_event(message.entity, message)
+        self.update_members(message.entity, message)
+
+    def update_members(self, address: str, message: OWNMessage) -> None:
+        """Hand a message over to all the known members of a general, area or group address."""
+        _members = self.group_index.members(address)
+        if _members:
+            LOGGER.debug(
+                "%s Applying `%s` to %s.",
+                self.log_id,
+                message,
+                ", ".join(sorted(_members)),
+            )
+        for _member in _members:
+            self._dispatch_event(_member, message)
 
     async def sending_loop(self, worker_id: int):
         """Loop che prende i messaggi dalla coda e li invia sulla sessione COMMAND."""
         self._terminate_sender = False
         LOGGER.debug("%s Creating sending worker %s", self.log_id, worker_id)
 
-        _command_session = OWNCommandSession(
-            gateway=self.gateway,
-            logger=LOGGER,
-        )
-
+        self._running_senders += 1
+        self._senders_stopped = False
         try:
-            await _command_session.connect()
-        except Exception as exc:  # noqa: BLE001
-            LOGGER.exception(
-                "%s Sending worker %s failed to connect command session: %r",
-                self.log_id,
-                worker_id,
-                exc,
-            )
-            return
-
-        while not self._terminate_sender:
-            task = await self.send_buffer.get()
-            LOGGER.debug(
-                "%s Message `%s` was successfully unqueued by worker %s.",
-                self.log_id,
-                task["message"],
-                worker_id,
-            )
             try:
-                await _command_session.send(
-                    message=task["message"],
-                    is_status_request=task["is_status_request"],
-                )
+                _command_session = await self.connection_manager.acquire(OWNCommandSession)
             except Exception as exc:  # noqa: BLE001
                 LOGGER.exception(
-                    "%s Worker %s failed to send message `%s`: %r",
+                    "%s Sending worker %s failed to connect command session: %r",
                     self.log_id,
                     worker_id,
-                    task["message"],
                     exc,
                 )
-            finally:
-                self.send_buffer.task_done()
+                return
+
+            while not self._terminate_sender and not _command_session.auth_failed:
+                task = await self.send_buffer.get()
+                LOGGER.debug(
+                    "%s Message `%s` was successfully unqueued by worker %s.",
+                    self.log_id,
+                    task["message"],
+                    worker_id,
+                )
+                _traces = self._traces(task)
+                for _trace in _traces:
+                    _trace.dequeued = time.perf_counter()
+                    _trace.attempts += 1
+                _outcome = SEND_ERROR
+                try:
+                    if self.connection_manager.circuit_open:
+                        LOGGER.debug(
+                            "%s Gateway unreachable, dropping message `%s`.",
+                            self.log_id,
+                            task["message"],
+                        )
+                    else:
+                        _outcome = await _command_session.send_once(
+                            message=task["message"],
+                            is_status_request=task["is_status_request"],
+                        )
+                except Exception as exc:  # noqa: BLE001
+                    LOGGER.exception(
+                        "%s Worker %s failed to send message `%s`: %r",
+                        self.log_id,
+                        worker_id,
+                        task["message"],
+                        exc,
+                    )
+                finally:
+                    if _outcome != SEND_ACK and self.retry_policy.should_retry(task, _outcome):
+                        self._schedule_retry(task, _outcome)
+                    else:
+                        for _trace in _traces:
+                            if _outcome == SEND_ACK:
+                                _trace.written = _command_session.last_written_at
+                                self.command_tracer.ack(_trace)
+                            else:
+                                self.command_tracer.fail(_trace)
+                        if _outcome != SEND_ACK and _outcome != SEND_ERROR:
+                            LOGGER.error(
+                                "%s Could not send message `%s`. No more retries.",
+                                self.log_id,
+                                task["message"],
+                            )
+                        self._resolve_task(task, _outcome == SEND_ACK)
+                    self.send_buffer.task_done()
+
+            await self.connection_manager.release(_command_session)
+            LOGGER.debug("%s Destroying sending worker %s", self.log_id, worker_id)
+            self.sending_workers[worker_id].cancel()
+        finally:
+            self._running_senders -= 1
+            if not self._running_senders:
+                self._senders_stopped = True
+                self._drop_queued("No sending worker left")
+
+    def _track_task(self, task: dict) -> None:
+        _key = self.retry_policy.supersede_key(task)
+        if _key is not None:
+            self._latest_tasks[_key] = task
+
+    @staticmethod
+    def _traces(task: dict) -> list:
+        """Return the traces of a task, or of the tasks it was coalesced from."""
+        return [_task["trace"] for _task in task.get("coalesced", (task,)) if _task.get("trace") is not None]
+
+    def _resolve_task(self, task: dict, acked: bool) -> None:
+        for _task in task.get("coalesced", ()):
+            self._resolve_task(_task, acked)
+        if task.get("future") is not None and not task["future"].done():
+            task["future"].set_result(acked)
+        if task["is_status_request"]:
+            self._pending_status_requests.pop(str(task["message"]), None)
+        _key = self.retry_policy.supersede_key(task)
+        if _key is not None and self._latest_tasks.get(_key) is task:
+            del self._latest_tasks[_key]
+
+    def _schedule_retry(self, task: dict, outcome: str) -> None:
+        """Put a task back in the queue after the policy's backoff, without holding the worker."""
+        _delay = self.retry_policy.delay(task)
+        LOGGER.warning(
+            "%s Could not send message `%s` (%s). Retrying (%d) in %.1fs...",
+            self.log_id,
+            task["message"],
+            outcome,
+            task.get("attempt", 1),
+            _delay,
+        )
+        task["attempt"] = task.get("attempt", 1) + 1
+        self.hass.loop.call_later(_delay, self._requeue, task)
+
+    def _requeue(self, task: dict) -> None:
+        if "coalesced" in task:
+            # Retried point to point, as some of the commands may have been
+            # superseded in the meantime.
+            for _task in task["coalesced"]:
+                _task["attempt"] = task["attempt"]
+                self._requeue(_task)
+            return
+        _key = self.retry_policy.supersede_key(task)
+        if _key is not None and self._latest_tasks.get(_key) is not task:
+            LOGGER.debug(
+                "%s Message `%s` was superseded, not retrying it.",
+                self.log_id,
+                task["message"],
+            )
+            self._resolve_task(task, False)
+        elif self.connection_manager.circuit_open:
+            LOGGER.debug(
+                "%s Gateway unreachable, dropping message `%s`.",
+                self.log_id,
+                task["message"],
+            )
+            self._resolve_task(task, False)
+        elif self._senders_stopped:
+            LOGGER.debug(
+                "%s No sending worker left, dropping message `%s`.",
+                self.log_id,
+                task["message"],
+            )
+            self._resolve_task(task, False)
+        else:
+            self.send_buffer.put_nowait(task)
+
+    def _circuit_changed(self, circuit_open: bool) -> None:
+        """Fail all the queued commands at once when the gateway becomes unreachable."""
+        if circuit_open:
+            self._drop_queued("Gateway unreachable")
+
+    def _drop_queued(self, reason: str) -> None:
+        """Fail all the queued commands, resolving their futures."""
+        while not self.send_buffer.empty():
+            task = self.send_buffer.get_nowait()
+            LOGGER.debug(
+                "%s %s, dropping message `%s`.",
+                self.log_id,
+                reason,
+                task["message"],
+            )
+            self._resolve_task(task, False)
+            self.send_buffer.task_done()
 
-        await _command_session.close()
-        LOGGER.debug("%s Destroying sending worker %s", self.log_id, worker_id)
-        self.sending_workers[worker_id].cancel()
+    def _auth_failed(self, error: str) -> None:
+        """Start a reauthentication flow when a session is refused the password."""
+        self.connectivity.invalidate()
+        if self._reauth_requested:
+            return
+        self._reauth_requested = True
+        LOGGER.error("%s Gateway refused the password (%s), reauthentication required.", self.log_id, error)
+        self.hass.async_create_task(
+            self.hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_REAUTH},
+                data=self.config_entry.data,
+            )
+        )
 
     async def close_listener(self) -> bool:
         LOGGER.info("%s Closing event listener", self.log_id)
         self._terminate_sender = True
         self._terminate_listener = True
+        self.metrics.stop()
+        if self.event_filter is not None:
+            self.event_filter.flush()
+        await self.close_capture()
         return True
 
+    async def close_capture(self) -> None:
+        """Stop the frame capture, if any, writing the frames still queued."""
+        if self.capture is not None:
+            await self.hass.async_add_executor_job(self.capture.close)
+
     async def close_listener_only(self) -> bool:
         LOGGER.info("%s Closing event listener only", self.log_id)
         self._terminate_listener = True
         return True
 
-    async def send(self, message: OWNCommand):
-        await self.send_buffer.put({"message": message, "is_status_request": False})
-        LOGGER.debug("%s Message `%s` was successfully queued.", self.log_id, message)
-
-    async def send_status_request(self, message: OWNCommand):
-        await self.send_buffer.put({"message": message, "is_status_request": True})
+    async def send(self, message: OWNCommand, wait_for_ack: bool = False):
+        """Queue a command.
+
+        With `wait_for_ack`, wait until a sending worker got a reply from the
+        gateway and return whether the command was ACKed.
+        Commands are not queued while the gateway is unreachable or once all
+        the sending workers stopped.
+        """
+        if self.connection_manager.circuit_open:
+            LOGGER.warning("%s Gateway unreachable, not sending `%s`.", self.log_id, message)
+            return False if wait_for_ack else None
+        if self._senders_stopped:
+            LOGGER.warning("%s No sending worker left, not sending `%s`.", self.log_id, message)
+            return False if wait_for_ack else None
+        _task = {
+            "message": message,
+            "is_status_request": False,
+            "future": self.hass.loop.create_future() if wait_for_ack else None,
+            "trace": self.command_tracer.start(message),
+        }
+        self._track_task(_task)
+        if self.coalescer is not None and self.coalescer.offer(_task):
+            LOGGER.debug("%s Message `%s` is held for coalescing.", self.log_id, message)
+        else:
+            self._enqueue(_task)
+            LOGGER.debug("%s Message `%s` was successfully queued.", self.log_id, message)
+        if _task["future"] is not None:
+            return await _task["future"]
+
+    def _enqueue(self, task: dict) -> None:
+        """Put a command on the send buffer, stamping its trace the first time."""
+        for _trace in self._traces(task):
+            if _trace.queued is None:
+                _trace.queued = time.perf_counter()
+        self.send_buffer.put_nowait(task)
+
+    async def send_status_request(self, message: OWNCommand, wait_for_ack: bool = False):
+        """Queue a status request.
+
+        With `wait_for_ack`, wait until a sending worker got the gateway's
+        replies and return whether the request was ACKed. A request already
+        pending is not queued again, its outcome is awaited instead.
+        """
+        if self.connection_manager.circuit_open:
+            LOGGER.debug("%s Gateway unreachable, not sending `%s`.", self.log_id, message)
+            return False if wait_for_ack else None
+        if self._senders_stopped:
+            LOGGER.debug("%s No sending worker left, not sending `%s`.", self.log_id, message)
+            return False if wait_for_ack else None
+        _task = self._pending_status_requests.get(str(message))
+        if _task is not None:
+            LOGGER.debug("%s Message `%s` is already pending, not queueing it again.", self.log_id, message)
+            if not wait_for_ack:
+                return None
+            if _task["future"] is None:
+                _task["future"] = self.hass.loop.create_future()
+            return await _task["future"]
+        _task = {
+            "message": message,
+            "is_status_request": True,
+            "future": self.hass.loop.create_future() if wait_for_ack else None,
+        }
+        self._pending_status_requests[str(message)] = _task
+        self._track_task(_task)
+        await self.send_buffer.put(_task)
         LOGGER.debug("%s Message `%s` was successfully queued.", self.log_id, message)
+        if _task["future"] is not None:
+            return await _task["future"]
@@ -0,0 +1,169 @@
+"""Group and area membership index for MyHOME lighting and automation."""
+import time
+from typing import Dict, Set
+
+from homeassistant.helpers.storage import Store
+
+from .own_wrapper import (
+    OWNLightingEvent,
+    OWNAutomationEvent,
+)
+from .const import (
+    DOMAIN,
+    LOGGER,
+)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# Point updates following a group command within this many seconds are
+# attributed to that group, and a point has to be seen that many times
+# before it is considered a member.
+LEARNING_WINDOW = 1.5
+LEARNING_THRESHOLD = 2
+
+
+def is_multipoint_address(where: str) -> bool:
+    """Tell whether a WHERE addresses a group, an area or the whole system."""
+    return where.startswith("#") or where in ("0", "00", "100") or (len(where) == 1 and where.isdigit())
+
+
+class MyHOMEGroupIndex:
+    """Keeps track of which configured addresses belong to each `#N` group.
+
+    Members are either declared in the configuration file (`groups` key of a
+    light, switch or cover) or learned by correlating group commands seen on
+    the bus with the point-to-point updates the actuators send right after.
+    Learned members are persisted in the config entry's storage.
+
+    Area and general members are derived from the configured point-to-point
+    addresses, which carry their area in their `A` digits.
+    """
+
+    def __init__(self, hass, entry_id: str, log_id: str):
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.groups")
+        self._log_id = log_id
+        self._declared: Dict[str, Set[str]] = {}
+        self._learned: Dict[str, Dict[str, int]] = {}
+        self._points: Dict[str, Dict[str, int]] = {}
+
+        self._window_group = None
+        self._window_state = None
+        self._window_deadline = 0.0
+        self._window_hits: Set[str] = set()
+
+    async def async_load(self) -> None:
+        """Restore the learned memberships from storage."""
+        _data = await self._store.async_load()
+        if _data is None:
+            return
+        for _group, _members in _data.get("learned", {}).items():
+            self._learned[_group] = dict(_members)
+        LOGGER.debug("%s Restored %d learned group(s).", self._log_id, len(self._learned))
+
+    def declare(self, group: str, member: str) -> None:
+        """Declare `member` (e.g. `1-12`) as belonging to `group` (e.g. `1-#3`)."""
+        self._declared.setdefault(group, set()).add(member)
+
+    def register_point(self, member: str, who: str, where: str) -> None:
+        """Register a configured point-to-point address for area lookups."""
+        if not where.isdigit() or len(where) not in (2, 4):
+            return
+        self._points.setdefault(str(who), {})[member] = int(where[: len(where) // 2])
+
+    def area_of(self, member: str):
+        """Return the area of a registered point-to-point address, if known."""
+        _who, _, _ = member.partition("-")
+        return self._points.get(_who, {}).get(member)
+
+    def groups(self, who: str) -> Set[str]:
+        """Return all the group addresses (e.g. `1-#3`) known for a WHO."""
+        return {_group for _group in set(self._declared) | set(self._learned) if _group.startswith(f"{who}-#")}
+
+    def declared_members(self, group: str) -> Set[str]:
+        """Return the addresses declared in the configuration as belonging to `group`."""
+        return set(self._declared.get(group, ()))
+
+    def members(self, group: str) -> Set[str]:
+        """Return the addresses currently known to belong to `group`.
+
+        `group` is a device ID such as `1-#3` (group), `1-5` (area) or `1-0`
+        (general).
+        """
+        _who, _, _where = group.partition("-")
+        if _where == "0":
+            return set(self._points.get(_who, {}))
+        if not _where.startswith("#") and is_multipoint_address(_where):
+            _area = 10 if _where == "100" else int(_where)
+            return {_member for _member, _member_area in self._points.get(_who, {}).items() if _member_area == _area}
+
+        _members = set(self._declared.get(group, ()))
+        for _member, _hits in self._learned.get(group, {}).items():
+            if _hits >= LEARNING_THRESHOLD:
+                _members.add(_member)
+        return _members
+
+    def observe(self, message) -> None:
+        """Feed a lighting or automation event to the learning logic."""
+        _state = self._learnable_state(message)
+        if _state is None:
+            return
+
+        _now = time.monotonic()
+        if self._window_group is not None and _now > self._window_deadline:
+            self._close_window()
+
+        if message.is_group:
+            self._close_window()
+            self._window_group = message.entity
+            self._window_state = _state
+            self._window_deadline = _now + LEARNING_WINDOW
+        elif (
+            self._window_group is not None
+            and not message.is_general
+            and not message.is_area
+            and message.who == int(self._window_group.split("-")[0])
+            and _state == self._window_state
+        ):
+            self._window_hits.add(message.entity)
+
+    @staticmethod
+    def _learnable_state(message):
+        if isinstance(message, OWNLightingEvent):
+            if message.dimension not in (None, 1, 4) or message.message_type is not None:
+                return None
+            return message.is_on
+        if isinstance(message, OWNAutomationEvent):
+            if message.dimension not in (None, 10) or message.state is None:
+                return None
+            return (message.is_opening, message.is_closing)
+        return None
+
+    def _close_window(self) -> None:
+        if self._window_group is None:
+            return
+
+        _changed = False
+        _learned = self._learned.setdefault(self._window_group, {})
+        for _member in self._window_hits:
+            if _member in self._declared.get(self._window_group, ()):
+                continue
+            _learned[_member] = _learned.get(_member, 0) + 1
+            _changed = True
+            if _learned[_member] == LEARNING_THRESHOLD:
+                LOGGER.info(
+                    "%s Learned that %s belongs to group %s.",
+                    self._log_id,
+                    _member,
+                    self._window_group,
+                )
+
+        self._window_group = None
+        self._window_state = None
+        self._window_hits = set()
+
+        if _changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        return {"learned": self._learned}
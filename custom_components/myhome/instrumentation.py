@@ -0,0 +1,277 @@
+"""Timing instrumentation of the event pipeline and of the commands."""
+from bisect import bisect_left
+from collections import deque
+import itertools
+import re
+import time
+from typing import Deque, Dict, Tuple
+
+from .own_wrapper import OWNLightingEvent
+
+# Upper bounds, in seconds, of the histogram buckets. Longer durations fall
+# in a last, unbounded, bucket.
+BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+
+# Time between the frames being received and handed over to the listening
+# loop, decoding and parsing of the frames, lookup of the entities and their
+# handling of the event (state written to Home Assistant included), and the
+# whole handling of a message by the gateway handler.
+STAGES = ("read", "decode", "parse", "routing", "handle_event", "dispatch")
+
+# Segments of a command trace: waiting in the queue, until the frame is
+# written, until it is ACKed, until the bus event confirming it is
+# dispatched, and from the call to the confirmation.
+SEGMENTS = ("queue", "write", "ack", "confirm", "total")
+# Seconds after its ACK an unconfirmed command stops being traced.
+TRACE_TIMEOUT = 30
+MAX_PENDING_TRACES = 256
+
+_COMMAND = re.compile(r"^\*(?P<who>\d+)\*(?P<what>\d+)(?:#\d+)*\*(?P<where>#?\d+)(?:#\d+)*##$")
+_DIMENSION_WRITING = re.compile(r"^\*#(?P<who>\d+)\*(?P<where>#?\d+)(?:#\d+)*\*#(?P<dimension>\d+)(?:\*(?P<value>\d+))?")
+
+
+class MyHOMEHistogram:
+    """Counts of durations in fixed buckets."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        self.counts[bisect_left(BUCKETS, duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, quantile: float) -> float | None:
+        """Upper bound of the bucket holding the given quantile, capped to
+        the maximum recorded."""
+        if not self.count:
+            return None
+        _rank = quantile * self.count
+        _cumulated = 0
+        for _index, _count in enumerate(self.counts):
+            _cumulated += _count
+            if _cumulated >= _rank:
+                return min(BUCKETS[_index], self.max) if _index < len(BUCKETS) else self.max
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else None,
+            "p50_ms": self.percentile(0.50) * 1000 if self.count else None,
+            "p95_ms": self.percentile(0.95) * 1000 if self.count else None,
+            "p99_ms": self.percentile(0.99) * 1000 if self.count else None,
+            "max_ms": self.max * 1000,
+            "buckets": {
+                (f"<={_bound * 1000:g}ms" if _index < len(BUCKETS) else f">{BUCKETS[-1] * 1000:g}ms"): _count
+                for _index, (_bound, _count) in enumerate(zip((*BUCKETS, None), self.counts))
+                if _count
+            },
+        }
+
+
+class MyHOMEStageTimings:
+    """Histograms of the time spent in each stage of the event pipeline, per
+    message class.
+
+    Disabled by default; the pipeline only reads the clock while enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._histograms: Dict[Tuple[str, str], MyHOMEHistogram] = {}
+
+    def record(self, stage: str, message_class: str, duration: float) -> None:
+        _histogram = self._histograms.get((stage, message_class))
+        if _histogram is None:
+            _histogram = self._histograms[(stage, message_class)] = MyHOMEHistogram()
+        _histogram.add(duration)
+
+    def reset(self) -> None:
+        self._histograms = {}
+
+    def as_dict(self) -> dict:
+        _stages = {}
+        for (_stage, _class), _histogram in sorted(
+            self._histograms.items(), key=lambda _item: (STAGES.index(_item[0][0]), _item[0][1])
+        ):
+            _stages.setdefault(_stage, {})[_class] = _histogram.as_dict()
+        return {"enabled": self.enabled, "stages": _stages}
+
+
+class MyHOMECommandTrace:
+    __slots__ = ("id", "command_type", "key", "state", "called", "queued", "dequeued", "written", "acked", "attempts", "done")
+
+    def __init__(self, trace_id: int, command_type: str, key: Tuple[int, str], state: Tuple[str, object]):
+        self.id = trace_id
+        self.command_type = command_type
+        self.key = key
+        self.state = state
+        self.called = time.perf_counter()
+        self.queued = None
+        self.dequeued = None
+        self.written = None
+        self.acked = None
+        self.attempts = 0
+        self.done = False
+
+
+class MyHOMECommandTracer:
+    """Traces commands from the call to `send` to the bus event confirming them.
+
+    A trace is started for each command, stamped as it is queued, taken by a
+    sending worker, written and ACKed, then waits for the first event
+    dispatched for the same WHO and WHERE reporting the state the command
+    asked for: on or off for the lights, the same WHAT or dimension for the
+    other WHOs. The durations of each segment are
+    kept in histograms per command type (`WHO*WHAT`, or `WHO*#DIMENSION` for
+    dimension writings). Commands never confirmed, e.g. to devices that do
+    not report their state, are dropped after TRACE_TIMEOUT seconds.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._ids = itertools.count(1)
+        self._awaiting: Dict[Tuple[int, str], Deque[MyHOMECommandTrace]] = {}
+        self._order: Deque[MyHOMECommandTrace] = deque()
+        self._histograms: Dict[Tuple[str, str], MyHOMEHistogram] = {}
+        self.confirmed = 0
+        self.unconfirmed = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._awaiting)
+
+    def start(self, message) -> MyHOMECommandTrace | None:
+        if not self.enabled:
+            return None
+        _raw = str(message)
+        _match = _COMMAND.match(_raw)
+        if _match is not None:
+            _type = f"{_match.group('who')}*{_match.group('what')}"
+            if _match.group("who") == "1":
+                _state = ("on", _match.group("what") != "0")
+            else:
+                _state = ("what", int(_match.group("what")))
+        else:
+            _match = _DIMENSION_WRITING.match(_raw)
+            if _match is None:
+                return None
+            _type = f"{_match.group('who')}*#{_match.group('dimension')}"
+            if _match.group("who") == "1":
+                # Brightness level 100 is off, 101 to 200 are on.
+                _state = ("on", _match.group("dimension") != "1" or int(_match.group("value") or 0) > 100)
+            else:
+                _state = ("dimension", int(_match.group("dimension")))
+        return MyHOMECommandTrace(next(self._ids), _type, (int(_match.group("who")), _match.group("where")), _state)
+
+    def ack(self, trace: MyHOMECommandTrace) -> None:
+        trace.acked = time.perf_counter()
+        self._expire(trace.acked)
+        self._awaiting.setdefault(trace.key, deque()).append(trace)
+        self._order.append(trace)
+
+    def fail(self, trace: MyHOMECommandTrace) -> None:
+        trace.done = True
+        self.failed += 1
+
+    def confirm(self, message) -> None:
+        """Complete the oldest trace waiting for the state `message` reports."""
+        _traces = self._awaiting.get((message.who, message.where))
+        if not _traces:
+            return
+        for _trace in _traces:
+            if _reports(message, _trace.state):
+                break
+        else:
+            return
+        _traces.remove(_trace)
+        if not _traces:
+            del self._awaiting[_trace.key]
+        _trace.done = True
+        self.confirmed += 1
+        _confirmed = time.perf_counter()
+        for _segment, _end, _start in (
+            ("queue", _trace.dequeued, _trace.queued),
+            ("write", _trace.written, _trace.dequeued),
+            ("ack", _trace.acked, _trace.written),
+            ("confirm", _confirmed, _trace.acked),
+            ("total", _confirmed, _trace.called),
+        ):
+            if _end is None or _start is None:
+                continue
+            _duration = _end - _start
+            _histogram = self._histograms.get((_trace.command_type, _segment))
+            if _histogram is None:
+                _histogram = self._histograms[(_trace.command_type, _segment)] = MyHOMEHistogram()
+            _histogram.add(_duration)
+
+    def _expire(self, now: float) -> None:
+        while self._order and (
+            self._order[0].done or now - self._order[0].acked > TRACE_TIMEOUT or len(self._order) >= MAX_PENDING_TRACES
+        ):
+            _trace = self._order.popleft()
+            if _trace.done:
+                continue
+            _trace.done = True
+            self.unconfirmed += 1
+            _traces = self._awaiting.get(_trace.key)
+            if _traces is not None:
+                _traces.remove(_trace)
+                if not _traces:
+                    del self._awaiting[_trace.key]
+
+    def as_dict(self) -> dict:
+        _commands = {}
+        for (_type, _segment), _histogram in sorted(
+            self._histograms.items(), key=lambda _item: (_item[0][0], SEGMENTS.index(_item[0][1]))
+        ):
+            _summary = _histogram.as_dict()
+            del _summary["buckets"]
+            _commands.setdefault(_type, {})[_segment] = _summary
+        return {
+            "enabled": self.enabled,
+            "confirmed": self.confirmed,
+            "unconfirmed": self.unconfirmed,
+            "failed": self.failed,
+            "commands": _commands,
+        }
+
+
+def _reports(message, state: Tuple[str, object]) -> bool:
+    """Tell whether an event reports the state a command asked for."""
+    _kind, _value = state
+    if _kind == "on":
+        return (
+            isinstance(message, OWNLightingEvent)
+            and message.dimension in (None, 1)
+            and message.message_type is None
+            and message.is_on == _value
+        )
+    if _kind == "dimension":
+        return message.dimension == _value
+    return message.what == _value
@@ -34,10 +34,10 @@ from .const import (
     CONF_DEVICE_MODEL,
     CONF_DIMMABLE,
     DOMAIN,
-    LOGGER,
 )
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
+from .groups import is_multipoint_address
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
@@ -48,7 +48,8 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     _configured_lights = hass.data[DOMAIN][config_entry.data[CONF_MAC]][CONF_PLATFORMS][PLATFORM]
 
     for _light in _configured_lights.keys():
-        _light = MyHOMELight(
+        _light_class = MyHOMELightGroup if is_multipoint_address(_configured_lights[_light][CONF_WHERE]) else MyHOMELight
+        _light = _light_class(
             hass=hass,
             device_id=_light,
             who=_configured_lights[_light][CONF_WHO],
@@ -86,6 +87,11 @@ def percent_to_eight_bits(value: int) -> int:
     return int(round(255 / 100 * value, 0))
 
 
+def preset_to_percent(preset: int) -> int:
+    """Brightness of the WHAT 2 (20%) to 10 (100%) dimmer presets."""
+    return preset * 10
+
+
 class MyHOMELight(MyHOMEEntity, LightEntity):
     def __init__(
         self,
@@ -178,21 +184,33 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
                 if _percent_brightness == 0:
                     return await self.async_turn_off(**kwargs)
                 else:
-                    return (
-                        await self._gateway_handler.send(
+                    return await self._async_send(
+                        (
                             OWNLightingCommand.set_brightness(
                                 self._full_where,
                                 _percent_brightness,
                                 int(kwargs[ATTR_TRANSITION]),
                             )
-                        )
-                        if ATTR_TRANSITION in kwargs
-                        else await self._gateway_handler.send(OWNLightingCommand.set_brightness(self._full_where, _percent_brightness))
+                            if ATTR_TRANSITION in kwargs
+                            else OWNLightingCommand.set_brightness(self._full_where, _percent_brightness)
+                        ),
+                        _attr_is_on=True,
+                        _attr_brightness_pct=_percent_brightness,
+                        _attr_brightness=percent_to_eight_bits(_percent_brightness),
+                        _attr_icon=self._state_icon(True),
                     )
             else:
-                return await self._gateway_handler.send(OWNLightingCommand.switch_on(self._full_where, int(kwargs[ATTR_TRANSITION])))
+                return await self._async_send(
+                    OWNLightingCommand.switch_on(self._full_where, int(kwargs[ATTR_TRANSITION])),
+                    _attr_is_on=True,
+                    _attr_icon=self._state_icon(True),
+                )
         else:
-            await self._gateway_handler.send(OWNLightingCommand.switch_on(self._full_where))
+            await self._async_send(
+                OWNLightingCommand.switch_on(self._full_where),
+                _attr_is_on=True,
+                _attr_icon=self._state_icon(True),
+            )
             if ColorMode.BRIGHTNESS in self._attr_supported_color_modes:
                 await self.async_update()
 
@@ -200,7 +218,11 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
         """Turn the device off."""
 
         if ATTR_TRANSITION in kwargs and self._attr_supported_features & LightEntityFeature.TRANSITION:
-            return await self._gateway_handler.send(OWNLightingCommand.switch_off(self._full_where, int(kwargs[ATTR_TRANSITION])))
+            return await self._async_send(
+                OWNLightingCommand.switch_off(self._full_where, int(kwargs[ATTR_TRANSITION])),
+                _attr_is_on=False,
+                _attr_icon=self._state_icon(False),
+            )
 
         if ATTR_FLASH in kwargs and self._attr_supported_features & LightEntityFeature.FLASH:
             if kwargs[ATTR_FLASH] == FLASH_SHORT:
@@ -208,21 +230,87 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
             elif kwargs[ATTR_FLASH] == FLASH_LONG:
                 return await self._gateway_handler.send(OWNLightingCommand.flash(self._full_where, 1.5))
 
-        return await self._gateway_handler.send(OWNLightingCommand.switch_off(self._full_where))
+        return await self._async_send(
+            OWNLightingCommand.switch_off(self._full_where),
+            _attr_is_on=False,
+            _attr_icon=self._state_icon(False),
+        )
 
     def handle_event(self, message: OWNLightingEvent):
         """Handle an event message."""
-        LOGGER.info(
-            "%s %s",
-            self._gateway_handler.log_id,
-            message.human_readable_log,
-        )
+        self._gateway_handler.event_log.log(message)
+        self._confirm_optimistic_state()
         self._attr_is_on = message.is_on
         if ColorMode.BRIGHTNESS in self._attr_supported_color_modes and message.brightness is not None:
             self._attr_brightness_pct = message.brightness
             self._attr_brightness = percent_to_eight_bits(message.brightness)
+        elif ColorMode.BRIGHTNESS in self._attr_supported_color_modes and message.brightness_preset is not None:
+            self._attr_brightness_pct = preset_to_percent(message.brightness_preset)
+            self._attr_brightness = percent_to_eight_bits(self._attr_brightness_pct)
 
         if self._off_icon is not None and self._on_icon is not None:
             self._attr_icon = self._on_icon if self._attr_is_on else self._off_icon
 
         self.async_schedule_update_ha_state()
+
+
+class MyHOMELightGroup(MyHOMELight):
+    """A general, area or group light.
+
+    Commands are sent as a single frame to the general, area or group WHERE
+    and, once the gateway ACKed them, the known member lights are updated
+    locally right away, instead of waiting for each of them to report back on
+    the bus.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Whether the gateway ACKed the last command sent to the group.
+        self._acked = False
+
+        if self._where.startswith("#"):
+            self._attr_extra_state_attributes = {"Group": self._where[1:]}
+        elif self._where != "0":
+            self._attr_extra_state_attributes = {"A": self._where}
+        else:
+            self._attr_extra_state_attributes = {}
+
+    async def async_turn_on(self, **kwargs):
+        """Turn all the lights of the group on."""
+        self._acked = False
+        await super().async_turn_on(**kwargs)
+
+        if not self._acked or (ATTR_FLASH in kwargs and self._attr_supported_features & LightEntityFeature.FLASH):
+            return
+
+        _percent_brightness = None
+        if ColorMode.BRIGHTNESS in self._attr_supported_color_modes:
+            _percent_brightness = eight_bits_to_percent(kwargs[ATTR_BRIGHTNESS]) if ATTR_BRIGHTNESS in kwargs else None
+            _percent_brightness = kwargs[ATTR_BRIGHTNESS_PCT] if ATTR_BRIGHTNESS_PCT in kwargs else _percent_brightness
+
+        if _percent_brightness == 0:
+            return  # Handled by async_turn_off
+        elif _percent_brightness is not None:
+            self._apply_locally(OWNLightingEvent(f"*#1*{self._full_where}*1*{_percent_brightness + 100}*0##"))
+        else:
+            self._apply_locally(OWNLightingEvent(f"*1*1*{self._full_where}##"))
+
+    async def async_turn_off(self, **kwargs):
+        """Turn all the lights of the group off."""
+        self._acked = False
+        await super().async_turn_off(**kwargs)
+
+        if not self._acked or (ATTR_FLASH in kwargs and self._attr_supported_features & LightEntityFeature.FLASH):
+            return
+
+        self._apply_locally(OWNLightingEvent(f"*1*0*{self._full_where}##"))
+
+    async def _async_send(self, message, **optimistic_state):
+        """Send a command to the group and wait for the gateway's reply, the
+        members are only updated once it was ACKed."""
+        self._acked = await self._gateway_handler.send(message, wait_for_ack=True)
+        return self._acked
+
+    def _apply_locally(self, event: OWNLightingEvent):
+        self.handle_event(event)
+        self._gateway_handler.update_members(self._device_id, event)
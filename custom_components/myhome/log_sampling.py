@@ -0,0 +1,66 @@
+"""Rate limited INFO logging of the messages received from a gateway."""
+import logging
+import time
+from typing import Dict, List
+
+from .const import LOGGER
+
+# Lines logged per second and per WHO. 0, the default, logs every message
+# as before the rate limit was introduced.
+DEFAULT_LOG_RATE_LIMIT = 0
+# Minimum seconds between two summaries of the lines not logged for a WHO.
+SUMMARY_INTERVAL = 60
+
+
+class MyHOMEEventLogger:
+    """Logs the human readable description of the messages at INFO level, at
+    most `rate_limit` lines per second for each WHO.
+
+    Nothing is formatted, not even the description of the message, when INFO
+    is disabled for the logger. Lines over the limit are counted instead of
+    logged, and how many were left out is logged for each WHO at most every
+    SUMMARY_INTERVAL seconds, with the next message of that WHO.
+    """
+
+    def __init__(self, log_id: str, rate_limit: int = DEFAULT_LOG_RATE_LIMIT):
+        self.log_id = log_id
+        self.rate_limit = rate_limit
+        # Start of the current one second window, lines logged in it, lines
+        # not logged since the last summary and time of the last summary, per WHO.
+        self._categories: Dict[object, List] = {}
+
+    def log(self, message, device_type: str | None = None) -> None:
+        """Log a message, with `device_type` in place of `Light` in its
+        description if given."""
+        if not LOGGER.isEnabledFor(logging.INFO):
+            return
+        if self.rate_limit > 0 and not self._allow(message.who):
+            return
+        _description = message.human_readable_log
+        if device_type is not None:
+            _description = _description.replace("Light", device_type)
+        LOGGER.info("%s %s", self.log_id, _description)
+
+    def _allow(self, category) -> bool:
+        _now = time.monotonic()
+        _state = self._categories.get(category)
+        if _state is None:
+            _state = self._categories[category] = [_now, 0, 0, _now]
+        elif _now - _state[0] >= 1:
+            _state[0] = _now
+            _state[1] = 0
+            if _state[2] and _now - _state[3] >= SUMMARY_INTERVAL:
+                LOGGER.info(
+                    "%s %d WHO %s messages were not logged in the last %.0fs.",
+                    self.log_id,
+                    _state[2],
+                    category,
+                    _now - _state[3],
+                )
+                _state[2] = 0
+                _state[3] = _now
+        if _state[1] < self.rate_limit:
+            _state[1] += 1
+            return True
+        _state[2] += 1
+        return False
@@ -0,0 +1,119 @@
+"""Performance metrics of a gateway, exposed as diagnostic sensors."""
+import asyncio
+from collections import deque
+from datetime import timedelta
+import time
+from typing import Callable, Dict, List
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+DEFAULT_INTERVAL = 30
+
+METRICS = (
+    "frames_received_rate",
+    "commands_sent_rate",
+    "queue_depth",
+    "oldest_queued_age",
+    "ack_round_trip_p95",
+    "nack_rate",
+    "reconnections",
+    "parse_failures",
+    "unsupported_messages",
+    "translations_skipped",
+)
+
+
+class MyHOMESendQueue(asyncio.Queue):
+    """Send buffer also keeping the time each item was queued at, to report
+    how long the oldest one has been waiting."""
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self._queued_at = deque()
+
+    def _put(self, item):
+        super()._put(item)
+        self._queued_at.append(time.monotonic())
+
+    def _get(self):
+        self._queued_at.popleft()
+        return super()._get()
+
+    @property
+    def oldest_age(self) -> float | None:
+        """Seconds the oldest item has been waiting in the queue."""
+        return time.monotonic() - self._queued_at[0] if self._queued_at else None
+
+
+class MyHOMEGatewayMetrics:
+    """Samples the counters of a gateway handler and of its sessions every
+    `interval` seconds.
+
+    Nothing is computed per frame: the sessions and the handler only
+    increment counters, rates are derived here from their difference between
+    two samples. Listeners, i.e. the diagnostic sensors, are called after each
+    sample.
+    """
+
+    def __init__(self, hass, handler, interval: int = DEFAULT_INTERVAL):
+        self._hass = hass
+        self._handler = handler
+        self.interval = interval
+        self.values: Dict[str, float | int | None] = dict.fromkeys(METRICS)
+        self._listeners: List[Callable[[], None]] = []
+        self._unsubscribe = None
+        self._last_sample = None
+        self._last_counters = None
+
+    def start(self) -> None:
+        if self._unsubscribe is not None:
+            return
+        self._sample()
+        self._unsubscribe = async_track_time_interval(self._hass, self._update, timedelta(seconds=self.interval))
+
+    def stop(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback called after each sample, return its remover."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def _update(self, _now) -> None:
+        self._sample()
+        for _listener in list(self._listeners):
+            _listener()
+
+    def _sample(self) -> None:
+        _manager = self._handler.connection_manager
+        _now = time.monotonic()
+        _counters = _manager.counters
+
+        if self._last_sample is not None:
+            _elapsed = _now - self._last_sample
+            _frames = _counters["frames_received"] - self._last_counters["frames_received"]
+            _sent = _counters["messages_sent"] - self._last_counters["messages_sent"]
+            _nacks = _counters["nacks"] - self._last_counters["nacks"]
+            self.values["frames_received_rate"] = round(_frames / _elapsed, 2)
+            self.values["commands_sent_rate"] = round(_sent / _elapsed, 2)
+            self.values["nack_rate"] = round(_nacks / _sent * 100, 1) if _sent else 0.0
+        self._last_sample = _now
+        self._last_counters = _counters
+
+        _round_trips = sorted(_manager.ack_round_trips)
+        self.values["ack_round_trip_p95"] = (
+            round(_round_trips[min(len(_round_trips) - 1, int(len(_round_trips) * 0.95))] * 1000, 1)
+            if _round_trips
+            else None
+        )
+        _oldest_age = self._handler.send_buffer.oldest_age
+        self.values["queue_depth"] = self._handler.send_buffer.qsize()
+        self.values["oldest_queued_age"] = round(_oldest_age, 1) if _oldest_age is not None else 0.0
+        self.values["reconnections"] = _manager.reconnections
+        self.values["parse_failures"] = _counters["parse_failures"]
+        self.values["unsupported_messages"] = self._handler.unsupported_messages
+        self.values["translations_skipped"] = _counters["translations_skipped"]
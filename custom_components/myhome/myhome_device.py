@@ -6,11 +6,16 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .gateway import MyHOMEGatewayHandler
 
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
 from homeassistant.const import CONF_ENTITIES
 
 
-from .const import DOMAIN, CONF_PLATFORMS, CONF_ENTITIES
+from .const import DOMAIN, CONF_PLATFORMS, CONF_ENTITIES, LOGGER
+
+# Time given to the bus to confirm an optimistic state before it is rolled back.
+OPTIMISTIC_TIMEOUT = 10
 
 
 class MyHOMEEntity(Entity):
@@ -39,6 +44,11 @@ class MyHOMEEntity(Entity):
         self._attr_name = None
         self._attr_entity_registry_enabled_default = True
         self._attr_should_poll = False
+        self._on_icon = None
+        self._off_icon = None
+
+        self._optimistic_snapshot = None
+        self._optimistic_rollback = None
 
         self._attr_device_info = {
             "identifiers": {(DOMAIN, f"{gateway.mac}-{self._device_id}")},
@@ -55,5 +65,57 @@ class MyHOMEEntity(Entity):
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._confirm_optimistic_state()
         if self._platform in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES]:
             del self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._platform]
+
+    def _state_icon(self, is_on: bool):
+        """Return the icon of the entity in the given state, for entities with an on and an off icon."""
+        if self._off_icon is not None and self._on_icon is not None:
+            return self._on_icon if is_on else self._off_icon
+        # Not set at all for the entities configured without icons.
+        return getattr(self, "_attr_icon", None)
+
+    async def _async_send(self, message, **optimistic_state):
+        """Send a command to the gateway.
+
+        In optimistic mode, the given attributes are applied as soon as the
+        gateway ACKs the command, and rolled back if no bus event confirms
+        them within OPTIMISTIC_TIMEOUT seconds.
+        """
+        if not self._gateway_handler.optimistic or not optimistic_state:
+            return await self._gateway_handler.send(message)
+        if await self._gateway_handler.send(message, wait_for_ack=True):
+            self._set_optimistic_state(**optimistic_state)
+
+    def _set_optimistic_state(self, **attributes):
+        if self._optimistic_snapshot is None:
+            self._optimistic_snapshot = {}
+        for _attribute, _value in attributes.items():
+            self._optimistic_snapshot.setdefault(_attribute, getattr(self, _attribute))
+            setattr(self, _attribute, _value)
+
+        if self._optimistic_rollback is not None:
+            self._optimistic_rollback()
+        self._optimistic_rollback = async_call_later(self._hass, OPTIMISTIC_TIMEOUT, self._rollback_optimistic_state)
+        self.async_write_ha_state()
+
+    @callback
+    def _rollback_optimistic_state(self, _now):
+        LOGGER.warning(
+            "%s State of %s was not confirmed by the bus, reverting it.",
+            self._gateway_handler.log_id,
+            self._device_id,
+        )
+        for _attribute, _value in self._optimistic_snapshot.items():
+            setattr(self, _attribute, _value)
+        self._optimistic_snapshot = None
+        self._optimistic_rollback = None
+        self.async_write_ha_state()
+
+    def _confirm_optimistic_state(self):
+        """Called when the bus reports on the entity, making any assumed state final."""
+        if self._optimistic_rollback is not None:
+            self._optimistic_rollback()
+            self._optimistic_rollback = None
+        self._optimistic_snapshot = None
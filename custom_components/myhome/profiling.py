@@ -0,0 +1,213 @@
+"""On demand profiling of the listening and sending loops of a gateway."""
+import asyncio
+from collections import Counter
+import cProfile
+import os
+import pstats
+import signal
+import threading
+import time
+import tracemalloc
+from typing import Dict
+
+from .const import LOGGER
+
+MODE_SAMPLING = "sampling"
+MODE_DETERMINISTIC = "deterministic"
+MODES = (MODE_SAMPLING, MODE_DETERMINISTIC)
+
+DEFAULT_DURATION = 30
+MAX_DURATION = 600
+DEFAULT_TOP = 20
+# Seconds of CPU time between two samples of the event loop thread's stack.
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+_PACKAGE_DIRECTORY = os.path.dirname(__file__)
+
+
+def _function_name(code) -> str:
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class MyHOMEProfiler:
+    """Profiles a gateway handler's listening and sending loops for a while.
+
+    In sampling mode a profiling timer interrupts the event loop thread every
+    `sample_interval` seconds of CPU time and only the stacks of the samples
+    taken while `listening_loop` or a `sending_loop` was running are kept, so
+    the rest of Home Assistant is neither slowed down nor reported. A timer
+    signal is used rather than a sampling thread, which would only ever see
+    the loop where it releases the GIL, i.e. waiting in `select`. The samples
+    are written in the folded stacks format read by flame graph tools.
+
+    In deterministic mode cProfile traces every call made on the event loop
+    thread, the rest of Home Assistant included, which is much slower; the
+    stats are written in the pstats format and the summary only keeps the
+    integration's own functions.
+
+    Optionally, tracemalloc snapshots taken at the start and the end are
+    compared and the last one is written too.
+    """
+
+    def __init__(self, hass, handler, sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self._hass = hass
+        self._handler = handler
+        self.sample_interval = sample_interval
+        self.running = False
+
+    async def async_profile(
+        self,
+        duration: int = DEFAULT_DURATION,
+        mode: str = MODE_SAMPLING,
+        trace_memory: bool = False,
+        top: int = DEFAULT_TOP,
+    ) -> dict:
+        """Profile for `duration` seconds, write the results next to the
+        configuration and return a summary of the `top` entries."""
+        if self.running:
+            raise RuntimeError("A profiling is already running for this gateway.")
+        self.running = True
+        try:
+            _prefix = self._hass.config.path(
+                f"myhome_profile_{self._handler.mac.replace(':', '')}_{time.strftime('%Y%m%d-%H%M%S')}"
+            )
+            _started_tracemalloc = False
+            if trace_memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _started_tracemalloc = True
+                _memory_before = tracemalloc.take_snapshot()
+
+            LOGGER.info("%s Profiling for %ds (%s).", self._handler.log_id, duration, mode)
+            if mode == MODE_DETERMINISTIC:
+                _summary = await self._profile_calls(duration, top, f"{_prefix}.prof")
+            else:
+                _summary = await self._sample_stacks(duration, top, f"{_prefix}.folded")
+
+            if trace_memory:
+                _memory_after = tracemalloc.take_snapshot()
+                if _started_tracemalloc:
+                    tracemalloc.stop()
+                _summary["memory"] = self._compare_memory(_memory_before, _memory_after, top)
+                await self._hass.async_add_executor_job(_memory_after.dump, f"{_prefix}.tracemalloc")
+                _summary["files"].append(f"{_prefix}.tracemalloc")
+        finally:
+            self.running = False
+
+        LOGGER.info("%s Profiling results written to %s", self._handler.log_id, ", ".join(_summary["files"]))
+        return _summary
+
+    async def _profile_calls(self, duration: int, top: int, path: str) -> dict:
+        _profile = cProfile.Profile()
+        _profile.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            _profile.disable()
+        await self._hass.async_add_executor_job(_profile.dump_stats, path)
+
+        _stats = pstats.Stats(_profile).stats
+        _functions = sorted(
+            (
+                (_key, _value)
+                for _key, _value in _stats.items()
+                if _key[0].startswith(_PACKAGE_DIRECTORY)
+            ),
+            key=lambda _item: _item[1][3],
+            reverse=True,
+        )
+        return {
+            "mode": MODE_DETERMINISTIC,
+            "duration": duration,
+            "files": [path],
+            "top": [
+                {
+                    "function": f"{_name} ({os.path.basename(_file)}:{_line})",
+                    "calls": _calls,
+                    "self_ms": round(_self * 1000, 3),
+                    "cumulative_ms": round(_cumulative * 1000, 3),
+                }
+                for (_file, _line, _name), (_, _calls, _self, _cumulative, _) in _functions[:top]
+            ],
+        }
+
+    async def _sample_stacks(self, duration: int, top: int, path: str) -> dict:
+        _handler_class = type(self._handler)
+        _roots = {
+            _handler_class.listening_loop.__code__: "listening",
+            _handler_class.sending_loop.__code__: "sending",
+        }
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("Sampling requires the event loop to run in the main thread.")
+        _stacks: Counter = Counter()
+        _samples = {"total": 0, "listening": 0, "sending": 0}
+
+        def _sample(_signal, frame):
+            _samples["total"] += 1
+            _stack = []
+            while frame is not None:
+                _stack.append(frame.f_code)
+                if frame.f_code in _roots:
+                    _samples[_roots[frame.f_code]] += 1
+                    _stacks[tuple(reversed(_stack))] += 1
+                    return
+                frame = frame.f_back
+
+        _previous_handler = signal.signal(signal.SIGPROF, _sample)
+        signal.setitimer(signal.ITIMER_PROF, self.sample_interval, self.sample_interval)
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, _previous_handler)
+
+        _self: Dict[str, int] = Counter()
+        _cumulative: Dict[str, int] = Counter()
+        _folded = []
+        for _stack, _count in _stacks.items():
+            _names = [_function_name(_code) for _code in _stack]
+            _self[_names[-1]] += _count
+            for _name in set(_names):
+                _cumulative[_name] += _count
+            _folded.append(f"{';'.join(_names)} {_count}\n")
+        await self._hass.async_add_executor_job(self._write_lines, path, _folded)
+
+        _in_loops = _samples["listening"] + _samples["sending"]
+        return {
+            "mode": MODE_SAMPLING,
+            "duration": duration,
+            "files": [path],
+            "samples": _samples,
+            "top": [
+                {
+                    "function": _name,
+                    "self_pct": round(_self[_name] / _in_loops * 100, 1),
+                    "cumulative_pct": round(_count / _in_loops * 100, 1),
+                    "estimated_ms": round(_count * self.sample_interval * 1000, 1),
+                }
+                for _name, _count in _cumulative.most_common(top)
+            ],
+        }
+
+    @staticmethod
+    def _write_lines(path: str, lines) -> None:
+        with open(path, "w", encoding="utf-8") as _file:
+            _file.writelines(lines)
+
+    @staticmethod
+    def _compare_memory(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int) -> list:
+        _filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        )
+        _differences = after.filter_traces(_filters).compare_to(before.filter_traces(_filters), "lineno")
+        return [
+            {
+                "location": f"{_difference.traceback[0].filename}:{_difference.traceback[0].lineno}",
+                "size_kb": round(_difference.size / 1024, 1),
+                "size_diff_kb": round(_difference.size_diff / 1024, 1),
+                "count_diff": _difference.count_diff,
+            }
+            for _difference in _differences[:top]
+        ]
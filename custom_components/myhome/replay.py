@@ -0,0 +1,360 @@
+"""Replay of captured gateway traffic through the integration.
+
+The frames received on the event sessions of a capture are parsed and
+dispatched by the gateway handler, as the listening loop does, to the
+entities of a myhome.yaml configuration, against a stubbed Home Assistant.
+Every entity state written is recorded, so that the final states of two
+runs, e.g. before and after a change to the dispatch, can be compared:
+
+    python -m custom_components.myhome.replay run capture.owncap -c myhome.yaml -o before.json
+    python -m custom_components.myhome.replay run capture.owncap -c myhome.yaml -o after.json
+    python -m custom_components.myhome.replay diff before.json after.json
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, Iterable, List
+
+import yaml
+
+from homeassistant.const import (
+    CONF_FRIENDLY_NAME,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_PORT,
+)
+from homeassistant.helpers import entity_platform
+
+from . import PLATFORMS
+from .own_wrapper import OWNMessage, OWNTranslation
+from .vendor_own.capture import RX, OWNCapturedFrame, capture_files, read_capture
+from .const import (
+    CONF_DEVICE_TYPE,
+    CONF_ENTITY,
+    CONF_FIRMWARE,
+    CONF_MANUFACTURER,
+    CONF_MANUFACTURER_URL,
+    CONF_PLATFORMS,
+    CONF_SSDP_LOCATION,
+    CONF_SSDP_ST,
+    CONF_UDN,
+    DOMAIN,
+    LOGGER,
+)
+from .validate import config_schema
+from .gateway import MyHOMEGatewayHandler
+
+SPEED_MAX = 0.0
+SPEED_REALTIME = 1.0
+
+# Frames only exchanged while a session is negotiated.
+_HANDSHAKE = re.compile(rb"^\*(?:#\*[01]|98\*\d|#\d+)##$")
+
+
+async def _noop(*args, **kwargs):
+    return None
+
+
+class ReplayBus:
+    def __init__(self):
+        self.events = Counter()
+
+    def async_fire(self, event_type: str, event_data=None, *args, **kwargs) -> None:
+        self.events[event_type] += 1
+
+
+class ReplayHass:
+    """The parts of Home Assistant used by the gateway handler and the entities."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, config_dir: str):
+        self.loop = loop
+        self.data = {DOMAIN: {}}
+        self.bus = ReplayBus()
+        self.config = SimpleNamespace(
+            config_dir=config_dir,
+            time_zone="UTC",
+            path=lambda *path: os.path.join(config_dir, *path),
+        )
+        self.config_entries = SimpleNamespace(
+            flow=SimpleNamespace(async_init=_noop),
+            async_update_entry=lambda *args, **kwargs: None,
+        )
+        self.tasks = set()
+
+    def async_create_task(self, target, *args, **kwargs) -> asyncio.Task:
+        _task = self.loop.create_task(target)
+        self.tasks.add(_task)
+        _task.add_done_callback(self.tasks.discard)
+        return _task
+
+    async def async_add_executor_job(self, target, *args):
+        return await self.loop.run_in_executor(None, target, *args)
+
+
+class ReplayPlatform:
+    """Entity platform accepting the entity services the platforms register."""
+
+    def async_register_entity_service(self, *args, **kwargs) -> None:
+        pass
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float] | None:
+    """p50, p95, p99 and maximum of durations in seconds, in microseconds."""
+    if not samples:
+        return None
+    _sorted = sorted(samples)
+    _last = len(_sorted) - 1
+    return {
+        "p50": _sorted[int(0.50 * _last)] * 1e6,
+        "p95": _sorted[int(0.95 * _last)] * 1e6,
+        "p99": _sorted[int(0.99 * _last)] * 1e6,
+        "max": _sorted[_last] * 1e6,
+    }
+
+
+def _snapshot(entity) -> dict:
+    try:
+        _attributes = dict(entity.state_attributes or {})
+        _attributes.update(entity.extra_state_attributes or {})
+        _state = {"state": entity.state, "attributes": _attributes}
+    except Exception as error:  # pylint: disable=broad-except
+        _state = {"state": None, "error": repr(error)}
+    return json.loads(json.dumps(_state, default=str))
+
+
+class MyHOMEReplay:
+    """Feeds captured frames to a gateway handler and its entities.
+
+    `speed` is the replay speed relative to the capture: 1 replays the
+    frames at the pace they were received, 10 ten times faster, and 0 as
+    fast as they can be dispatched.
+    """
+
+    def __init__(self, config_path: str, mac: str | None = None, speed: float = SPEED_MAX):
+        self.config_path = config_path
+        self.mac = mac
+        self.speed = speed
+        self.hass: ReplayHass | None = None
+        self.handler: MyHOMEGatewayHandler | None = None
+        self.entities = []
+        self.transitions = []
+        self._frame_index = 0
+
+    async def async_setup(self) -> None:
+        with open(self.config_path, encoding="utf-8") as _file:
+            _config = config_schema(yaml.safe_load(_file.read()))
+        if self.mac is None:
+            self.mac = next(iter(_config))
+
+        self.hass = ReplayHass(asyncio.get_running_loop(), os.path.dirname(os.path.abspath(self.config_path)))
+        self.hass.data[DOMAIN][self.mac] = _config[self.mac]
+        _entry = SimpleNamespace(
+            entry_id="replay",
+            data={
+                CONF_HOST: "127.0.0.1",
+                CONF_PORT: 20000,
+                CONF_PASSWORD: None,
+                CONF_SSDP_LOCATION: None,
+                CONF_SSDP_ST: None,
+                CONF_DEVICE_TYPE: None,
+                CONF_FRIENDLY_NAME: "Replay",
+                CONF_MANUFACTURER: "BTicino S.p.A.",
+                CONF_MANUFACTURER_URL: None,
+                CONF_NAME: "Replay",
+                CONF_FIRMWARE: None,
+                CONF_MAC: self.mac,
+                CONF_UDN: None,
+            },
+            options={},
+            unique_id=self.mac,
+        )
+        self.handler = MyHOMEGatewayHandler(hass=self.hass, config_entry=_entry, watchdog_idle_timeout=0)
+        self.hass.data[DOMAIN][self.mac][CONF_ENTITY] = self.handler
+
+        _token = entity_platform.current_platform.set(ReplayPlatform())
+        try:
+            for _platform in PLATFORMS:
+                if _platform not in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS]:
+                    continue
+                _module = importlib.import_module(f".{_platform}", __package__)
+                _entities = []
+                await _module.async_setup_entry(self.hass, _entry, _entities.extend)
+                for _entity in _entities:
+                    await self._add_entity(_entity)
+        finally:
+            entity_platform.current_platform.reset(_token)
+
+    async def _add_entity(self, entity) -> None:
+        """Register an entity the way it is added to Home Assistant, recording
+        its state writes instead of sending them to the state machine, and
+        without the status request of its first update."""
+        entity.hass = self.hass
+        entity.async_update = _noop
+        if hasattr(entity, "async_get_last_state"):
+            entity.async_get_last_state = _noop
+        entity.async_write_ha_state = lambda: self._record(entity)
+        entity.async_schedule_update_ha_state = lambda force_refresh=False: self._record(entity)
+        await entity.async_added_to_hass()
+        self.entities.append(entity)
+
+    def _record(self, entity) -> None:
+        self.transitions.append({"frame": self._frame_index, "entity": entity.unique_id, **_snapshot(entity)})
+
+    async def async_run(self, frames: Iterable[OWNCapturedFrame]) -> dict:
+        """Replay the frames received on the event sessions and return the report."""
+        _loop = asyncio.get_running_loop()
+        _parse_times = []
+        _dispatch_times = []
+        _lags = []
+        _parse_failures = 0
+        _first = None
+        _queued = self.handler.send_buffer.qsize()
+        _start = _loop.time()
+        _wall = time.perf_counter()
+
+        for _captured in frames:
+            if _captured.direction != RX or _captured.session_type != "event" or _HANDSHAKE.match(_captured.frame):
+                continue
+            if self.speed:
+                if _first is None:
+                    _first = _captured.timestamp
+                _due = _start + (_captured.timestamp - _first) / self.speed
+                _delay = _due - _loop.time()
+                if _delay > 0:
+                    await asyncio.sleep(_delay)
+                _lags.append(max(0.0, _loop.time() - _due))
+
+            self._frame_index += 1
+            _parse_start = time.perf_counter()
+            if OWNTranslation.FRAME.match(_captured.frame):
+                # Skipped before decoding, as by the event session.
+                _message = OWNTranslation(_captured.frame)
+            else:
+                _decoded = _captured.frame.decode()
+                try:
+                    _message = OWNMessage.parse(_decoded) or _decoded
+                except AttributeError:
+                    _parse_failures += 1
+                    continue
+            _dispatch_start = time.perf_counter()
+            await self.handler._handle_message(_message)
+            _dispatch_end = time.perf_counter()
+            _parse_times.append(_dispatch_start - _parse_start)
+            _dispatch_times.append(_dispatch_end - _dispatch_start)
+
+        if self.hass.tasks:
+            await asyncio.wait(list(self.hass.tasks), timeout=5)
+        _elapsed = time.perf_counter() - _wall
+
+        return {
+            "frames": self._frame_index,
+            "parse_failures": _parse_failures,
+            "elapsed": _elapsed,
+            "throughput": self._frame_index / _elapsed if _elapsed else None,
+            "stages": {
+                "parse": _percentiles(_parse_times),
+                "dispatch": _percentiles(_dispatch_times),
+                "lag": _percentiles(_lags),
+            },
+            "events": dict(self.hass.bus.events),
+            "status_requests": self.handler.send_buffer.qsize() - _queued,
+            "transitions": self.transitions,
+            "final_states": {_entity.unique_id: _snapshot(_entity) for _entity in self.entities},
+        }
+
+
+def diff_states(before: dict, after: dict) -> Dict[str, dict]:
+    """Compare the final entity states of two replay reports."""
+    _before = before["final_states"]
+    _after = after["final_states"]
+    return {
+        _entity: {"before": _before.get(_entity), "after": _after.get(_entity)}
+        for _entity in sorted(set(_before) | set(_after))
+        if _before.get(_entity) != _after.get(_entity)
+    }
+
+
+def _print_report(report: dict) -> None:
+    print(f"{report['frames']} frames in {report['elapsed']:.3f}s, {report['throughput'] or 0:.0f} frames/s")
+    print(f"{report['parse_failures']} parse failures, {report['status_requests']} status requests queued")
+    for _stage, _durations in report["stages"].items():
+        if _durations is not None:
+            print(
+                f"{_stage:>10}: p50 {_durations['p50']:9.1f}us  p95 {_durations['p95']:9.1f}us  "
+                f"p99 {_durations['p99']:9.1f}us  max {_durations['max']:9.1f}us"
+            )
+    print(f"{len(report['transitions'])} state transitions, {len(report['final_states'])} entities")
+    for _event, _count in sorted(report["events"].items()):
+        print(f"{_event:>40}: {_count}")
+
+
+async def main(arguments: argparse.Namespace) -> dict:
+    replay = MyHOMEReplay(arguments.config, arguments.mac, arguments.speed)
+    await replay.async_setup()
+    return await replay.async_run(
+        _captured for _path in capture_files(arguments.capture) for _captured in read_capture(_path)
+    )
+
+
+def _speed(value: str) -> float:
+    if value == "max":
+        return SPEED_MAX
+    if value == "realtime":
+        return SPEED_REALTIME
+    return float(value)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Replay captured gateway traffic through the integration")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Replay a capture")
+    run_parser.add_argument("capture", type=str, help="Capture file, rotated files included")
+    run_parser.add_argument("-c", "--config", type=str, default="/config/myhome.yaml", help="myhome.yaml configuration")
+    run_parser.add_argument("-m", "--mac", type=str, help="Gateway of the configuration, the first one by default")
+    run_parser.add_argument(
+        "-s",
+        "--speed",
+        type=_speed,
+        default=SPEED_MAX,
+        help="`max` (default), `realtime` or a factor relative to the capture",
+    )
+    run_parser.add_argument("-o", "--output", type=str, help="Write the full report, states included, to a JSON file")
+    run_parser.add_argument("-v", "--verbose", action="store_true", help="Keep the integration's logging")
+
+    diff_parser = subparsers.add_parser("diff", help="Compare the final entity states of two reports")
+    diff_parser.add_argument("before", type=str)
+    diff_parser.add_argument("after", type=str)
+
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        with open(args.before, encoding="utf-8") as _file:
+            _before = json.load(_file)
+        with open(args.after, encoding="utf-8") as _file:
+            _after = json.load(_file)
+        _differences = diff_states(_before, _after)
+        for _entity, _states in _differences.items():
+            print(f"{_entity}:\n  before: {_states['before']}\n  after:  {_states['after']}")
+        print(f"{len(_differences)} entities differ")
+        raise SystemExit(1 if _differences else 0)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    if not args.verbose:
+        LOGGER.setLevel(logging.WARNING)
+
+    _report = asyncio.run(main(args))
+    _print_report(_report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as _file:
+            json.dump(_report, _file, indent=2, default=str)
@@ -0,0 +1,54 @@
+"""Retry policy for the commands queued to a gateway."""
+import re
+from typing import Optional, Tuple
+
+from .own_wrapper import (
+    OWNBackoff,
+    SEND_NACK,
+    RETRYABLE_OUTCOMES,
+)
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+_LIGHT_COMMAND = re.compile(r"^\*1\*\d+(?:#\d+)*\*(?P<where>[^*]+)##$")
+_LIGHT_BRIGHTNESS = re.compile(r"^\*#1\*(?P<where>[^*]+)\*#1\*\d+\*\d+##$")
+
+
+class MyHOMERetryPolicy:
+    """Decides whether and when a command that was not ACKed is sent again.
+
+    Each queued task carries its own attempt count. A task is retried with a
+    backoff, by putting it back in the queue rather than by holding the
+    sending worker, until its attempts are exhausted. Idempotency hints then
+    decide whether the retry is still worth it:
+
+    - a NACKed status request is dropped, and one that failed otherwise is
+      requeued in place of any identical request;
+    - a lighting command (on, off or brightness) is superseded by any more
+      recent command queued for the same light.
+    """
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, backoff: OWNBackoff | None = None):
+        self.max_attempts = max_attempts
+        self.backoff = backoff or OWNBackoff(base=0.2, ceiling=5.0)
+
+    def should_retry(self, task: dict, outcome: str) -> bool:
+        if outcome not in RETRYABLE_OUTCOMES:
+            return False
+        if task["is_status_request"] and outcome == SEND_NACK:
+            return False
+        return task.get("attempt", 1) < self.max_attempts
+
+    def delay(self, task: dict) -> float:
+        return self.backoff.delay(task.get("attempt", 1) - 1)
+
+    @staticmethod
+    def supersede_key(task: dict) -> Optional[Tuple[str, str]]:
+        """Return a key shared by the tasks that make each other obsolete."""
+        _message = str(task["message"])
+        if task["is_status_request"]:
+            return ("status", _message)
+        _match = _LIGHT_COMMAND.match(_message) or _LIGHT_BRIGHTNESS.match(_message)
+        if _match is not None:
+            return ("light", _match.group("where"))
+        return None
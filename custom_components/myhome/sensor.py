@@ -20,10 +20,14 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_MAC,
     LIGHT_LUX,
+    PERCENTAGE,
+    EntityCategory,
     UnitOfPower,
     UnitOfEnergy,
     UnitOfTemperature,
+    UnitOfTime,
 )
+from homeassistant.core import callback
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers import entity_registry as er
 from .own_wrapper import (
@@ -55,6 +59,7 @@ from .const import (
 )
 from .gateway import MyHOMEGatewayHandler
 from .myhome_device import MyHOMEEntity
+from .metrics import METRICS
 
 SCAN_INTERVAL = timedelta(seconds=60)
 
@@ -65,8 +70,56 @@ ATTR_DATE = "date"
 ATTR_MONTH = "month"
 ATTR_DAY = "day"
 
+# Name, unit, device class, state class and icon of the gateway's metrics.
+METRIC_SENSORS = {
+    "frames_received_rate": ("Frames received", "frames/s", None, SensorStateClass.MEASUREMENT, "mdi:download-network"),
+    "commands_sent_rate": ("Commands sent", "commands/s", None, SensorStateClass.MEASUREMENT, "mdi:upload-network"),
+    "queue_depth": ("Queued commands", None, None, SensorStateClass.MEASUREMENT, "mdi:tray-full"),
+    "oldest_queued_age": (
+        "Oldest queued command",
+        UnitOfTime.SECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        None,
+    ),
+    "ack_round_trip_p95": (
+        "ACK round trip (p95)",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        None,
+    ),
+    "nack_rate": ("NACK rate", PERCENTAGE, None, SensorStateClass.MEASUREMENT, "mdi:close-network"),
+    "reconnections": ("Reconnections", None, None, SensorStateClass.TOTAL_INCREASING, "mdi:lan-connect"),
+    "parse_failures": ("Parse failures", None, None, SensorStateClass.TOTAL_INCREASING, "mdi:alert-circle-outline"),
+    "unsupported_messages": (
+        "Unsupported messages",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:help-network",
+    ),
+    "translations_skipped": (
+        "Skipped command translations",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:swap-horizontal",
+    ),
+}
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
+    async_add_entities(
+        [
+            MyHOMEGatewayMetricSensor(
+                gateway=hass.data[DOMAIN][config_entry.data[CONF_MAC]][CONF_ENTITY],
+                metric=_metric,
+            )
+            for _metric in METRICS
+        ]
+    )
+
     if PLATFORM not in hass.data[DOMAIN][config_entry.data[CONF_MAC]][CONF_PLATFORMS]:
         return True
 
@@ -277,11 +330,7 @@ class MyHOMEPowerSensor(MyHOMEEntity, SensorEntity):
         if message.message_type not in [MESSAGE_TYPE_ACTIVE_POWER]:
             return True
 
-        LOGGER.info(
-            "%s %s",
-            self._gateway_handler.log_id,
-            message.human_readable_log,
-        )
+        self._gateway_handler.event_log.log(message)
         self._attr_native_value = message.active_power
         self.async_schedule_update_ha_state()
 
@@ -392,31 +441,19 @@ class MyHOMEEnergySensor(MyHOMEEntity, SensorEntity):
             self._entity_specific_id == "total-energy"
             and message.message_type == MESSAGE_TYPE_ENERGY_TOTALIZER
         ):
-            LOGGER.info(
-                "%s %s",
-                self._gateway_handler.log_id,
-                message.human_readable_log,
-            )
+            self._gateway_handler.event_log.log(message)
             self._attr_native_value = message.total_consumption
         elif (
             self._entity_specific_id == "monthly-energy"
             and message.message_type == MESSAGE_TYPE_CURRENT_MONTH_CONSUMPTION
         ):
-            LOGGER.info(
-                "%s %s",
-                self._gateway_handler.log_id,
-                message.human_readable_log,
-            )
+            self._gateway_handler.event_log.log(message)
             self._attr_native_value = message.current_month_partial_consumption
         elif (
             self._entity_specific_id == "daily-energy"
             and message.message_type == MESSAGE_TYPE_CURRENT_DAY_CONSUMPTION
         ):
-            LOGGER.info(
-                "%s %s",
-                self._gateway_handler.log_id,
-                message.human_readable_log,
-            )
+            self._gateway_handler.event_log.log(message)
             self._attr_native_value = message.current_day_partial_consumption
         self.async_schedule_update_ha_state()
 
@@ -498,19 +535,11 @@ class MyHOMETemperatureSensor(MyHOMEEntity, SensorEntity):
             return True
 
         if message.message_type == MESSAGE_TYPE_MAIN_TEMPERATURE:
-            LOGGER.info(
-                "%s %s",
-                self._gateway_handler.log_id,
-                message.human_readable_log,
-            )
+            self._gateway_handler.event_log.log(message)
             self._attr_native_value = message.main_temperature
             self.async_schedule_update_ha_state()
         elif message.message_type == MESSAGE_TYPE_SECONDARY_TEMPERATURE:
-            LOGGER.info(
-                "%s %s",
-                self._gateway_handler.log_id,
-                message.human_readable_log,
-            )
+            self._gateway_handler.event_log.log(message)
             self._attr_native_value = message.secondary_temperature[1]
             self.async_schedule_update_ha_state()
 
@@ -588,10 +617,41 @@ class MyHOMEIlluminanceSensor(MyHOMEEntity, SensorEntity):
         if message.message_type not in [MESSAGE_TYPE_ILLUMINANCE]:
             return True
 
-        LOGGER.info(
-            "%s %s",
-            self._gateway_handler.log_id,
-            message.human_readable_log,
-        )
+        self._gateway_handler.event_log.log(message)
         self._attr_native_value = message.illuminance
         self.async_schedule_update_ha_state()
+
+
+class MyHOMEGatewayMetricSensor(SensorEntity):
+    """Diagnostic sensor reporting one of the gateway's performance metrics.
+
+    Its state is written each time the metrics are sampled, never per frame.
+    """
+
+    def __init__(self, gateway: MyHOMEGatewayHandler, metric: str) -> None:
+        self._gateway_handler = gateway
+        self._metric = metric
+        _name, _unit, _device_class, _state_class, _icon = METRIC_SENSORS[metric]
+
+        self._attr_name = _name
+        self._attr_has_entity_name = True
+        self._attr_unique_id = f"{gateway.mac}-gateway-{metric}"
+        self._attr_native_unit_of_measurement = _unit
+        self._attr_device_class = _device_class
+        self._attr_state_class = _state_class
+        self._attr_icon = _icon
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_should_poll = False
+        self._attr_device_info = {"identifiers": {(DOMAIN, gateway.unique_id)}}
+
+    @property
+    def native_value(self):
+        return self._gateway_handler.metrics.values[self._metric]
+
+    async def async_added_to_hass(self):
+        """When entity is added to hass."""
+        self.async_on_remove(self._gateway_handler.metrics.add_listener(self._metrics_updated))
+
+    @callback
+    def _metrics_updated(self) -> None:
+        self.async_write_ha_state()
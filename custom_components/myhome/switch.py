@@ -27,7 +27,6 @@ from .const import (
     CONF_DEVICE_MODEL,
     CONF_DEVICE_CLASS,
     DOMAIN,
-    LOGGER,
 )
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
@@ -131,32 +130,29 @@ class MyHOMESwitch(MyHOMEEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):  # pylint: disable=unused-argument
         """Turn the device on."""
-        await self._gateway_handler.send(OWNLightingCommand.switch_on(self._full_where))
+        await self._async_send(
+            OWNLightingCommand.switch_on(self._full_where),
+            _attr_is_on=True,
+            _attr_icon=self._state_icon(True),
+        )
 
     async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
         """Turn the device off."""
-        await self._gateway_handler.send(OWNLightingCommand.switch_off(self._full_where))
+        await self._async_send(
+            OWNLightingCommand.switch_off(self._full_where),
+            _attr_is_on=False,
+            _attr_icon=self._state_icon(False),
+        )
 
     def handle_event(self, message: OWNLightingEvent):
         """Handle an event message."""
         if self._attr_device_class == SwitchDeviceClass.SWITCH:
-            LOGGER.info(
-                "%s %s",
-                self._gateway_handler.log_id,
-                message.human_readable_log.replace("Light", "Switch"),
-            )
+            self._gateway_handler.event_log.log(message, "Switch")
         elif self._attr_device_class == SwitchDeviceClass.OUTLET:
-            LOGGER.info(
-                "%s %s",
-                self._gateway_handler.log_id,
-                message.human_readable_log.replace("Light", "Outlet"),
-            )
+            self._gateway_handler.event_log.log(message, "Outlet")
         else:
-            LOGGER.info(
-                "%s %s",
-                self._gateway_handler.log_id,
-                message.human_readable_log,
-            )
+            self._gateway_handler.event_log.log(message)
+        self._confirm_optimistic_state()
         self._attr_is_on = message.is_on
         if self._off_icon is not None and self._on_icon is not None:
             self._attr_icon = self._on_icon if self._attr_is_on else self._off_icon
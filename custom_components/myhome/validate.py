@@ -41,6 +41,7 @@ from .const import (
     CONF_ICON,
     CONF_ICON_ON,
     CONF_ZONE,
+    CONF_GROUPS,
     CONF_FAN_SUPPORT,
     CONF_MANUFACTURER,
     CONF_DEVICE_MODEL,
@@ -290,6 +291,7 @@ light_schema = MyHomeDeviceSchema(
                 Coerce(str), Any(General(), Area(), Group(), PointToPoint(), msg="Invalid <WHERE>, expecting a valid General, Area, Group or Point-to-Point <WHERE>")
             ),
             Optional(CONF_BUS_INTERFACE): All(Coerce(str), BusInterface()),
+            Optional(CONF_GROUPS): [All(Coerce(str), Group())],
             Required(CONF_NAME): str,
             Optional(CONF_ENTITY_NAME): str,
             Optional(CONF_ICON): str,
@@ -309,6 +311,7 @@ switch_schema = MyHomeDeviceSchema(
                 Coerce(str), Any(General(), Area(), Group(), PointToPoint(), msg="Invalid <WHERE>, expecting a valid General, Area, Group or Point-to-Point <WHERE>")
             ),
             Optional(CONF_BUS_INTERFACE): All(Coerce(str), BusInterface()),
+            Optional(CONF_GROUPS): [All(Coerce(str), Group())],
             Required(CONF_NAME): str,
             Optional(CONF_ENTITY_NAME): str,
             Optional(CONF_ICON): str,
@@ -333,6 +336,7 @@ cover_schema = MyHomeDeviceSchema(
                 Coerce(str), Any(General(), Area(), Group(), PointToPoint(), msg="Invalid <WHERE>, expecting a valid General, Area, Group or Point-to-Point <WHERE>")
             ),
             Optional(CONF_BUS_INTERFACE): All(Coerce(str), BusInterface()),
+            Optional(CONF_GROUPS): [All(Coerce(str), Group())],
             Required(CONF_NAME): str,
             Optional(CONF_ENTITY_NAME): str,
             Optional(CONF_ADVANCED_SHUTTER, default=False): Boolean(),
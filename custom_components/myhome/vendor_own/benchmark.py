@@ -0,0 +1,170 @@
+""" Benchmarks of the connection layer:
+- framing of the frames received from a gateway, comparing the `readuntil`
+  stream path with the OWNProtocol framing layer;
+- CPU time of a session negotiation with SHA-256 HMAC authentication,
+  against the gateway simulator.
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from .connection import OWNGateway, OWNProtocol, OWNSession
+from .simulator import AUTH_SHA256, OWNSimulator
+
+FRAMES = [
+    b"*1*1*12##",
+    b"*1*0*12##",
+    b"*#1*12*1*155*1##",
+    b"*2*1*41##",
+    b"*#4*1*0*0215##",
+    b"*#18*51*113*1250##",
+    b"*1*1000#1*12##",
+]
+
+
+async def _serve(frame_count: int, chunk_size: int):
+    """Start a local server streaming `frame_count` frames to each client."""
+    _payload = b"".join(FRAMES[i % len(FRAMES)] for i in range(frame_count))
+
+    async def _handle(_reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        for _start in range(0, len(_payload), chunk_size):
+            writer.write(_payload[_start : _start + chunk_size])
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(_handle, "127.0.0.1", 0)
+
+
+async def _readuntil(port: int) -> int:
+    _reader, _writer = await asyncio.open_connection("127.0.0.1", port)
+    _count = 0
+    try:
+        while True:
+            await _reader.readuntil(OWNSession.SEPARATOR)
+            _count += 1
+    except asyncio.IncompleteReadError:
+        pass
+    _writer.close()
+    return _count
+
+
+async def _protocol(port: int) -> int:
+    _, _protocol = await asyncio.get_running_loop().create_connection(
+        OWNProtocol, "127.0.0.1", port
+    )
+    _count = 0
+    try:
+        while True:
+            _count += len(await _protocol.read_frames())
+    except asyncio.IncompleteReadError:
+        pass
+    _protocol.close()
+    return _count
+
+
+async def _simulate(password: str) -> OWNSimulator:
+    """Start a gateway simulator requiring SHA-256 HMAC authentication."""
+    _simulator = OWNSimulator(password=password, auth=AUTH_SHA256)
+    await _simulator.start()
+    return _simulator
+
+
+def _run_in_thread(coroutine_function, *args):
+    """Run a server in its own thread and event loop, so that its CPU time
+    is not accounted to the client."""
+    _started = threading.Event()
+    _state = {}
+
+    def _run():
+        _loop = asyncio.new_event_loop()
+        _state["loop"] = _loop
+        _state["server"] = _loop.run_until_complete(coroutine_function(*args))
+        _started.set()
+        _loop.run_forever()
+
+    threading.Thread(target=_run, daemon=True).start()
+    _started.wait()
+    return _state
+
+
+async def negotiate(count: int, password: str) -> None:
+    """Negotiate `count` command sessions and print the handshake CPU time."""
+    _server = _run_in_thread(_simulate, password)
+    _port = _server["server"].port
+    _gateway = OWNGateway({"address": "127.0.0.1", "port": _port, "password": password})
+
+    _cpu = 0.0
+    _wall = 0.0
+    for _ in range(count):
+        _session = OWNSession(gateway=_gateway, connection_type="command")
+        await _session._open_connection()
+        _start_cpu = time.thread_time()
+        _start_wall = time.perf_counter()
+        _result = await _session._negotiate()
+        _cpu += time.thread_time() - _start_cpu
+        _wall += time.perf_counter() - _start_wall
+        await _session.close()
+        if not _result["Success"]:
+            raise RuntimeError(f"Negotiation failed: {_result['Message']}")
+
+    print(f"negotiate: {_cpu / count * 1e6:10.1f} us CPU, {_wall / count * 1e6:10.1f} us wall per handshake ({count} handshakes)")
+    _server["loop"].call_soon_threadsafe(_server["loop"].stop)
+
+
+async def main(frame_count: int, chunk_size: int, rounds: int) -> None:
+    """Run both readers against the same stream and print their frames/s."""
+    server = await _serve(frame_count, chunk_size)
+    port = server.sockets[0].getsockname()[1]
+
+    for name, reader in (("readuntil", _readuntil), ("protocol", _protocol)):
+        _best = None
+        for _ in range(rounds):
+            _start = time.perf_counter()
+            _count = await reader(port)
+            _elapsed = time.perf_counter() - _start
+            if _count != frame_count:
+                raise RuntimeError(f"{name} read {_count} frames out of {frame_count}")
+            _best = _elapsed if _best is None else min(_best, _elapsed)
+        print(f"{name:>10}: {frame_count / _best:12.0f} frames/s (best of {rounds})")
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "mode",
+        nargs="?",
+        choices=["framing", "negotiate"],
+        default="framing",
+        help="What to benchmark, default is framing",
+    )
+    parser.add_argument(
+        "-n", "--frames", type=int, default=200000, help="Number of frames to stream"
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk",
+        type=int,
+        default=4096,
+        help="Size in bytes of the chunks written by the simulated gateway",
+    )
+    parser.add_argument(
+        "-r", "--rounds", type=int, default=5, help="Number of runs for each reader"
+    )
+    parser.add_argument(
+        "-H",
+        "--handshakes",
+        type=int,
+        default=500,
+        help="Number of sessions to negotiate in negotiate mode",
+    )
+    args = parser.parse_args()
+
+    if args.mode == "negotiate":
+        asyncio.run(negotiate(args.handshakes, "12345"))
+    else:
+        asyncio.run(main(args.frames, args.chunk, args.rounds))
@@ -0,0 +1,297 @@
+""" Raw capture of the frames exchanged with an OpenWebNet gateway """
+from array import array
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Iterator, List, NamedTuple
+
+LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"OWNCAP1\n"
+
+RX = 0
+TX = 1
+
+SESSION_TYPES = ("test", "command", "event")
+
+# Monotonic time, direction, session type, session id and length of the
+# frame that follows.
+_RECORD = struct.Struct("<dBBHH")
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+DEFAULT_FLUSH_INTERVAL = 1.0
+# Frames waiting for the writer thread beyond which new frames are dropped.
+DEFAULT_MAX_QUEUED = 10000
+
+DEFAULT_RING_SIZE = 4096
+# Longer frames are truncated in the ring, to keep its memory bounded.
+MAX_RING_FRAME_LENGTH = 256
+# Recorded in place of the negotiation frames carrying a nonce, a password or
+# an HMAC, from which the gateway password could be recovered.
+REDACTED_FRAME = b"*#<redacted>##"
+
+
+class OWNCapturedFrame(NamedTuple):
+    timestamp: float
+    direction: int
+    session_type: str
+    session_id: int
+    frame: bytes
+
+
+class OWNFrameCapture:
+    """Appends every frame received or sent by the sessions to a file.
+
+    Each frame is stored as a fixed size header (monotonic timestamp,
+    direction, session type and id, frame length) followed by the raw frame.
+    Recording a frame only queues it; a writer thread writes the frames in
+    batches, every `flush_interval` seconds, and rotates the file once it
+    grows past `max_bytes`, keeping `backup_count` older files, so that the
+    event loop never waits on the disk. When the disk cannot keep up and
+    `max_queued` frames are already waiting, new frames are dropped and
+    counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(max_queued)
+        self._closing = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.frames = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self.rotations = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._closing.clear()
+        self._thread = threading.Thread(target=self._run, name="OWNFrameCapture", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Write the frames still queued and stop the writer thread. Blocking."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            # The writer stops on its own once it emptied the queue.
+            pass
+        self._closing.set()
+        self._thread.join()
+        self._thread = None
+        if self.dropped:
+            LOGGER.warning("Frame capture to %s dropped %d frame(s).", self.path, self.dropped)
+
+    def record(self, session_type: str, session_id: int, direction: int, frame: bytes) -> None:
+        """Queue a frame, to be called from the event loop."""
+        if self._closing.is_set():
+            return
+        try:
+            self._queue.put_nowait(
+                _RECORD.pack(
+                    time.monotonic(),
+                    direction,
+                    SESSION_TYPES.index(session_type) if session_type in SESSION_TYPES else 0,
+                    session_id & 0xFFFF,
+                    len(frame),
+                )
+                + frame
+            )
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.frames += 1
+
+    def _open(self):
+        _file = open(self.path, "ab")
+        if _file.tell() == 0:
+            _file.write(MAGIC)
+        return _file
+
+    def _rotate(self, file):
+        file.close()
+        if self.backup_count > 0:
+            for _index in range(self.backup_count - 1, 0, -1):
+                _source = f"{self.path}.{_index}"
+                if os.path.exists(_source):
+                    os.replace(_source, f"{self.path}.{_index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+        return self._open()
+
+    def _run(self) -> None:
+        try:
+            _file = self._open()
+        except OSError as error:
+            LOGGER.error("Could not open frame capture file %s: %s", self.path, error)
+            self._closing.set()
+            return
+        try:
+            _stop = False
+            while not _stop:
+                _batch: List[bytes] = [self._queue.get()]
+                if not self._closing.is_set():
+                    self._closing.wait(self.flush_interval)
+                while True:
+                    try:
+                        _batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in _batch:
+                    _stop = True
+                    _batch = [_record for _record in _batch if _record is not None]
+                if _batch:
+                    _data = b"".join(_batch)
+                    _file.write(_data)
+                    _file.flush()
+                    self.bytes_written += len(_data)
+                    if self.max_bytes and _file.tell() >= self.max_bytes:
+                        _file = self._rotate(_file)
+                if self._closing.is_set() and self._queue.empty():
+                    _stop = True
+        except OSError as error:
+            LOGGER.error("Frame capture to %s stopped: %s", self.path, error)
+            self._closing.set()
+        finally:
+            _file.close()
+
+
+class OWNFrameRing:
+    """Keeps the last `size` frames received or sent by the sessions in memory.
+
+    The slots are preallocated and recording a frame only stores references
+    and numbers in them, nothing is formatted until the ring is read.
+    """
+
+    def __init__(self, size: int = DEFAULT_RING_SIZE):
+        self.size = size
+        self._frames: List[bytes | None] = [None] * size
+        self._session_types: List[str | None] = [None] * size
+        self._timestamps = array("d", bytes(8 * size))
+        self._directions = array("B", bytes(size))
+        self._session_ids = array("H", bytes(2 * size))
+        self._index = 0
+        self.frames = 0
+
+    def record(self, session_type: str, session_id: int, direction: int, frame: bytes) -> None:
+        _index = self._index
+        if len(frame) > MAX_RING_FRAME_LENGTH:
+            frame = frame[:MAX_RING_FRAME_LENGTH]
+        self._frames[_index] = frame
+        self._session_types[_index] = session_type
+        self._timestamps[_index] = time.monotonic()
+        self._directions[_index] = direction
+        self._session_ids[_index] = session_id & 0xFFFF
+        self._index = (_index + 1) % self.size
+        self.frames += 1
+
+    def snapshot(self) -> List[OWNCapturedFrame]:
+        """Return the frames in the ring, oldest first."""
+        if self.frames < self.size:
+            _indexes = range(self._index)
+        else:
+            _indexes = [*range(self._index, self.size), *range(self._index)]
+        return [
+            OWNCapturedFrame(
+                self._timestamps[_index],
+                self._directions[_index],
+                self._session_types[_index],
+                self._session_ids[_index],
+                self._frames[_index],
+            )
+            for _index in _indexes
+        ]
+
+    def as_dicts(self) -> List[dict]:
+        """Return the frames in the ring, oldest first, with wall clock times."""
+        _offset = time.time() - time.monotonic()
+        return [
+            {
+                "time": _captured.timestamp + _offset,
+                "direction": "RX" if _captured.direction == RX else "TX",
+                "session": f"{_captured.session_type}#{_captured.session_id}",
+                "frame": _captured.frame.decode(errors="replace"),
+            }
+            for _captured in self.snapshot()
+        ]
+
+
+class OWNCaptureTee:
+    """Records the frames with several recorders, e.g. a ring and a file capture."""
+
+    def __init__(self, *recorders):
+        self.recorders = recorders
+
+    def record(self, session_type: str, session_id: int, direction: int, frame: bytes) -> None:
+        for _recorder in self.recorders:
+            _recorder.record(session_type, session_id, direction, frame)
+
+
+def redact_negotiation(frame: bytes) -> bytes:
+    """Return the placeholder for a negotiation frame holding a secret, i.e.
+    `*#` followed by digits, and any other frame unchanged."""
+    return REDACTED_FRAME if frame[:2] == b"*#" and frame[2:3].isdigit() else frame
+
+
+def capture_files(path: str) -> List[str]:
+    """Return the files of a rotated capture, oldest first."""
+    _files = [path]
+    _index = 1
+    while os.path.exists(f"{path}.{_index}"):
+        _files.insert(0, f"{path}.{_index}")
+        _index += 1
+    return [_file for _file in _files if os.path.exists(_file)]
+
+
+def read_capture(path: str) -> Iterator[OWNCapturedFrame]:
+    """Iterate over the frames of a capture file."""
+    with open(path, "rb") as _file:
+        if _file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a frame capture file")
+        while True:
+            _header = _file.read(_RECORD.size)
+            if len(_header) < _RECORD.size:
+                return
+            _timestamp, _direction, _session_type, _session_id, _length = _RECORD.unpack(_header)
+            _frame = _file.read(_length)
+            if len(_frame) < _length:
+                return
+            yield OWNCapturedFrame(_timestamp, _direction, SESSION_TYPES[_session_type], _session_id, _frame)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the frames of a capture file")
+    parser.add_argument("path", type=str, help="Capture file, rotated files included")
+    args = parser.parse_args()
+
+    for _path in capture_files(args.path):
+        for _captured in read_capture(_path):
+            print(
+                f"{_captured.timestamp:.6f} {_captured.session_type}#{_captured.session_id} "
+                f"{'RX' if _captured.direction == RX else 'TX'} {_captured.frame.decode(errors='replace')}"
+            )
@@ -1,17 +1,66 @@
 """ This module handles TCP connections to the OpenWebNet gateway """
 
 import asyncio
-import hmac
+from collections import deque
+import contextlib
+import functools
 import hashlib
-import string
+import itertools
 import random
+import secrets
 import logging
-from typing import Union
+import time
+from typing import List, Union
 from urllib.parse import urlparse
 
-from ..const import LOGGER
+from .capture import RX, TX, OWNCaptureTee, OWNFrameCapture, OWNFrameRing, redact_negotiation
 from .discovery import find_gateways, get_gateway, get_port
-from .message import OWNMessage, OWNSignaling
+from .message import OWNMessage, OWNSignaling, OWNTranslation
+
+# Child of the integration's logger, without importing the integration, so
+# that the package can also be run on its own.
+LOGGER = logging.getLogger(__name__)
+
+# Outcomes of a single attempt at sending a command.
+SEND_ACK = "ack"
+SEND_NACK = "nack"
+SEND_RESET = "reset"
+SEND_TIMEOUT = "timeout"
+SEND_ERROR = "error"
+RETRYABLE_OUTCOMES = (SEND_NACK, SEND_RESET, SEND_TIMEOUT)
+
+# Counters kept by every session.
+SESSION_COUNTERS = (
+    "frames_received",
+    "parse_failures",
+    "messages_sent",
+    "nacks",
+    "translations_skipped",
+    "translation_bytes",
+)
+# Negotiation errors meaning the gateway refused the password: connecting
+# again with the same password is pointless.
+AUTH_FAILURES = ("password_error", "password_required")
+# Exponent past which the backoff delay no longer grows.
+MAX_BACKOFF_EXPONENT = 32
+# Number of ACK round trips kept by a command session.
+ACK_HISTORY = 200
+
+# Command translation frames (WHAT 1000), recognised before being decoded.
+_IS_TRANSLATION = OWNTranslation.FRAME.match
+
+# Identifies the sessions in the frame captures.
+_SESSION_IDS = itertools.count(1)
+
+# Hash functions of the HMAC authentication, and lookup tables for the
+# conversions between hexadecimal digits and the pairs of decimal digits
+# the gateway exchanges them as.
+_HMAC_HASHES = {"sha1": hashlib.sha1, "sha256": hashlib.sha256}
+_DIGIT_PAIR_TO_HEX = {f"{i:02d}": f"{i:x}" for i in range(100)}
+_DIGIT_PAIR_TO_HEX.update({str(i): f"{i:x}" for i in range(10)})
+_HEX_TO_DIGIT_PAIR = str.maketrans(
+    {_hex: f"{int(_hex, 16):02d}" for _hex in "0123456789abcdefABCDEF"}
+)
 
 
 class OWNGateway:
@@ -23,6 +72,7 @@ class OWNGateway:
         self._password = (
             discovery_info["password"] if "password" in discovery_info else None
         )
+        self._password_digests = {}
         # Attributes retrieved from SSDP discovery
         self.ssdp_location = (
             discovery_info["ssdp_location"]
@@ -105,6 +155,16 @@ class OWNGateway:
     @password.setter
     def password(self, password: str) -> None:
         self._password = password
+        self._password_digests = {}
+
+    def password_digest(self, method: str) -> str:
+        """Hexadecimal digest of the password used by the HMAC
+        authentication, computed once per hash method."""
+        if method not in self._password_digests:
+            self._password_digests[method] = (
+                _HMAC_HASHES[method](self._password.encode()).hexdigest()
+            )
+        return self._password_digests[method]
 
     @property
     def log_id(self) -> str:
@@ -156,6 +216,183 @@ class OWNGateway:
         return cls(discovery_info)
 
 
+class OWNBackoff:
+    """Exponential backoff with a ceiling and random jitter.
+
+    The jitter takes up to `jitter` (as a fraction) off each delay so that
+    sessions failing together do not retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        base: float = 0.5,
+        factor: float = 2.0,
+        ceiling: float = 30.0,
+        jitter: float = 0.5,
+    ):
+        self.base = base
+        self.factor = factor
+        self.ceiling = ceiling
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay to wait before retry number `attempt` (from 0)."""
+        # The exponent is capped: past a few dozen attempts the delay is at
+        # the ceiling anyway, and factor**attempt would overflow.
+        _delay = min(self.ceiling, self.base * self.factor ** min(attempt, MAX_BACKOFF_EXPONENT))
+        return _delay * (1 - self.jitter * random.random())
+
+
+class OWNTimeouts:
+    """Timeouts (in seconds) applied to each phase of a session."""
+
+    PHASES = ("connect", "handshake", "ack", "status")
+
+    def __init__(
+        self,
+        connect: float = 10.0,
+        handshake: float = 15.0,
+        ack: float = 5.0,
+        status: float = 15.0,
+    ):
+        self.connect = connect
+        self.handshake = handshake
+        self.ack = ack
+        self.status = status
+
+
+class OWNProtocol(asyncio.Protocol):
+    """Framing layer splitting the gateway's byte stream into OWN frames.
+
+    Incoming data is accumulated in a single reusable buffer and every
+    complete `##` terminated frame is split off in place, so that a burst of
+    frames received in one read is handed over as a batch.
+    """
+
+    def __init__(self, capture=None):
+        self._loop = asyncio.get_running_loop()
+        # Optional callback, called with the direction and each frame.
+        self._capture = capture
+        # The frames holding secrets are redacted from the capture until the
+        # negotiation is over.
+        self.negotiating = True
+        self._transport: asyncio.Transport | None = None
+        self._buffer = bytearray()
+        self._frames: deque = deque()
+        self._waiter: asyncio.Future | None = None
+        self._drain_waiter: asyncio.Future | None = None
+        self._closed = self._loop.create_future()
+        self._eof = False
+        self._exception: Exception | None = None
+        self._paused = False
+        # Time at which the oldest frame not read yet was received.
+        self.received_at: float | None = None
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self._transport = transport
+
+    @property
+    def is_connected(self) -> bool:
+        return self._transport is not None and not self._transport.is_closing() and not self._eof
+
+    def data_received(self, data: bytes) -> None:
+        _buffer = self._buffer
+        _buffer += data
+        _pending = bool(self._frames)
+        _start = 0
+        while True:
+            _end = _buffer.find(OWNSession.SEPARATOR, _start)
+            if _end < 0:
+                break
+            _end += 2
+            _frame = bytes(_buffer[_start:_end])
+            self._frames.append(_frame)
+            if self._capture is not None:
+                self._capture(RX, redact_negotiation(_frame) if self.negotiating else _frame)
+            _start = _end
+        if _start:
+            del _buffer[:_start]
+            if not _pending:
+                self.received_at = time.perf_counter()
+            self._wakeup()
+
+    def eof_received(self) -> bool:
+        self._eof = True
+        self._wakeup()
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._eof = True
+        self._exception = exc
+        self._wakeup()
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+
+    def _wakeup(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def _wait_for_frames(self) -> None:
+        while not self._frames:
+            if self._exception is not None:
+                raise self._exception
+            if self._eof:
+                raise asyncio.IncompleteReadError(bytes(self._buffer), None)
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    async def read_frame(self) -> bytes:
+        """Return the next complete frame, waiting for it if needed."""
+        await self._wait_for_frames()
+        return self._frames.popleft()
+
+    async def read_frames(self) -> List[bytes]:
+        """Return all the complete frames received so far, waiting for at least one."""
+        await self._wait_for_frames()
+        _frames = list(self._frames)
+        self._frames.clear()
+        return _frames
+
+    def write(self, data: bytes) -> None:
+        if self._capture is not None:
+            self._capture(TX, redact_negotiation(data) if self.negotiating else data)
+        self._transport.write(data)
+
+    async def drain(self) -> None:
+        if self._transport is None or self._transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+        if self._paused:
+            self._drain_waiter = self._loop.create_future()
+            try:
+                await self._drain_waiter
+            finally:
+                self._drain_waiter = None
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    def abort(self) -> None:
+        if self._transport is not None:
+            self._transport.abort()
+
+    async def wait_closed(self) -> None:
+        await self._closed
+
+
 class OWNSession:
     """Connection to OpenWebNet gateway"""
 
@@ -179,9 +416,23 @@ class OWNSession:
         # Usa il logger dell'integrazione se non passato
         self._logger = logger or LOGGER
 
-        # annotations for stream reader/writer:
-        self._stream_reader: asyncio.StreamReader | None = None
-        self._stream_writer: asyncio.StreamWriter | None = None
+        self._protocol: OWNProtocol | None = None
+        # Optional async context manager factory, called with the session,
+        # wrapping every TCP connection attempt (e.g. to stagger reconnects).
+        self.connection_gate = None
+        # Pluggable retry policy, and optional cap on connection attempts.
+        self.backoff = OWNBackoff()
+        self.max_connect_attempts = None
+        self.timeouts = OWNTimeouts()
+        # Result of the negotiation of the current connection, None until it
+        # completed.
+        self.negotiation_result: dict | None = None
+        self.timeout_counts = {_phase: 0 for _phase in OWNTimeouts.PHASES}
+        self.counters = {_counter: 0 for _counter in SESSION_COUNTERS}
+        # Optional recorder (file capture, ring...) of every frame received
+        # and sent.
+        self.id = next(_SESSION_IDS)
+        self.capture: OWNFrameCapture | OWNFrameRing | OWNCaptureTee | None = None
 
         gw_addr = self._gateway.address if self._gateway else None
         self._logger.debug(
@@ -208,18 +459,72 @@ class OWNSession:
     def connection_type(self) -> str:
         return self._type
 
+    @property
+    def is_connected(self) -> bool:
+        return self._protocol is not None and self._protocol.is_connected
+
     @connection_type.setter
     def connection_type(self, connection_type: str) -> None:
         self._type = connection_type.lower()
 
+    @property
+    def auth_failed(self) -> bool:
+        """Whether the gateway refused the password on the last negotiation."""
+        return self.negotiation_result is not None and self.negotiation_result["Message"] in AUTH_FAILURES
+
+    def _connection_attempt(self):
+        """Context manager wrapping a connection attempt in the connection gate, if any."""
+        if self.connection_gate is None:
+            return contextlib.nullcontext()
+        return self.connection_gate(self)
+
+    async def _with_timeout(self, phase: str, awaitable):
+        """Await `awaitable` within the timeout configured for `phase`,
+        counting the timeouts in the session metrics."""
+        try:
+            return await asyncio.wait_for(awaitable, getattr(self.timeouts, phase))
+        except asyncio.TimeoutError:
+            self.timeout_counts[phase] += 1
+            self._logger.warning(
+                "%s %s session timed out during %s phase.",
+                self._gateway.log_id,
+                self._type.capitalize(),
+                phase,
+            )
+            raise
+
+    async def _open_connection(self) -> None:
+        """Open the TCP connection to the gateway on top of the framing layer.
+
+        A connection left over by a previous attempt is dropped first, so that
+        a session never holds more than one connection to the gateway."""
+        if self._protocol is not None:
+            self._protocol.close()
+            self._protocol = None
+        self.negotiation_result = None
+
+        _capture = (
+            functools.partial(self.capture.record, self._type, self.id)
+            if self.capture is not None
+            else None
+        )
+        _, self._protocol = await self._with_timeout(
+            "connect",
+            asyncio.get_running_loop().create_connection(
+                lambda: OWNProtocol(_capture), self._gateway.address, self._gateway.port
+            ),
+        )
+
     @classmethod
     async def test_gateway(cls, gateway: OWNGateway) -> dict:
         connection = cls(gateway)
         return await connection.test_connection()
 
-    async def test_connection(self) -> dict:
+    async def test_connection(self, keep_open: bool = False) -> dict:
+        """Open the connection, run the negotiation and report its result.
+        With `keep_open`, a successfully negotiated connection is left open so
+        that the session can be used right away."""
         retry_count = 0
-        retry_timer = 1
 
         while True:
             try:
@@ -230,28 +535,31 @@ class OWNSession:
                     )
                     return {"Success": False, "Message": "connection_refused"}
 
-                (
-                    self._stream_reader,
-                    self._stream_writer,
-                ) = await asyncio.open_connection(
-                    self._gateway.address, self._gateway.port
-                )
+                async with self._connection_attempt():
+                    await self._open_connection()
+                    result = await self._test_negotiation()
                 break
-            except ConnectionRefusedError as exc:
+            except (ConnectionRefusedError, asyncio.TimeoutError) as exc:
+                retry_timer = self.backoff.delay(retry_count)
                 self._logger.warning(
-                    "%s Test session connection refused (%r), retrying in %ss.",
+                    "%s Test session connection refused (%r), retrying in %.1fs.",
                     self._gateway.log_id,
                     exc,
                     retry_timer,
                 )
                 await asyncio.sleep(retry_timer)
                 retry_count += 1
-                retry_timer *= 2
 
-        try:
-            result = await self._negotiate()
+        if not (keep_open and result["Success"]):
             await self.close()
-            return result
+        return result
+
+    async def _test_negotiation(self) -> dict:
+        """Run the negotiation of a test, reporting its errors as a result."""
+        try:
+            self.negotiation_result = await self._with_timeout("handshake", self._negotiate())
+        except asyncio.TimeoutError:
+            self.negotiation_result = {"Success": False, "Message": "negotiation_failed"}
         except ConnectionResetError as exc:
             self._logger.error(
                 "%s NEGOTIATE: ConnectionResetError in %s session during test: %r",
@@ -260,11 +568,15 @@ class OWNSession:
                 exc,
             )
             # restituiamo un dict, NON rilanciamo l’eccezione
-            return {"Success": False, "Message": "password_retry"}
+            self.negotiation_result = {"Success": False, "Message": "password_retry"}
+        return self.negotiation_result
 
     async def connect(self):
         """Open a session and run negotiation.
 
+        Failed connections and negotiations are attempted again after the
+        backoff delay, except when the gateway refused the password.
+
         Returns:
             dict: {"Success": bool, "Message": str}
         """
@@ -273,52 +585,75 @@ class OWNSession:
         )
 
         retry_count = 0
-        retry_timer = 1
 
         while True:
             try:
-                if retry_count > 4:
+                if (
+                    self.max_connect_attempts is not None
+                    and retry_count >= self.max_connect_attempts
+                ):
                     self._logger.error(
-                        "%s %s session connection still refused after 5 attempts.",
+                        "%s %s session connection still refused after %d attempts.",
                         self._gateway.log_id,
                         self._type.capitalize(),
+                        retry_count,
                     )
                     return {"Success": False, "Message": "connection_refused"}
 
-                (
-                    self._stream_reader,
-                    self._stream_writer,
-                ) = await asyncio.open_connection(
-                    self._gateway.address, self._gateway.port
-                )
+                async with self._connection_attempt():
+                    await self._open_connection()
 
-                # Se la connect TCP è ok, facciamo la negoziazione
-                result = await self._negotiate()
-                return result
+                    # Se la connect TCP è ok, facciamo la negoziazione
+                    try:
+                        result = await self._with_timeout("handshake", self._negotiate())
+                    except asyncio.TimeoutError:
+                        # Non lasciamo una sessione negoziata a metà
+                        await self.close()
+                        raise
+                    self.negotiation_result = result
+                if result["Success"]:
+                    return result
+                await self.close()
+                if result["Message"] in AUTH_FAILURES:
+                    # The password will not be accepted on the next attempt either.
+                    return result
+
+                retry_timer = self.backoff.delay(retry_count)
+                self._logger.warning(
+                    "%s %s session negotiation failed (%s), retrying in %.1fs.",
+                    self._gateway.log_id,
+                    self._type.capitalize(),
+                    result["Message"],
+                    retry_timer,
+                )
+                await asyncio.sleep(retry_timer)
+                retry_count += 1
 
-            except (ConnectionRefusedError, asyncio.IncompleteReadError) as exc:
-                # IncompleteReadError può avere dentro i byte parziali ricevuti
-                partial = getattr(exc, "partial", b"")
+            except ConnectionResetError as exc:
+                retry_timer = self.backoff.delay(retry_count)
                 self._logger.warning(
-                    "%s %s session connection refused (%r, partial=%r), retrying in %ss.",
+                    "%s %s session connection reset by peer (%r), retrying in %.1fs.",
                     self._gateway.log_id,
                     self._type.capitalize(),
                     exc,
-                    partial,
                     retry_timer,
                 )
                 await asyncio.sleep(retry_timer)
                 retry_count += 1
-                retry_timer = retry_count * 2
 
-            except ConnectionResetError as exc:
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+                # IncompleteReadError può avere dentro i byte parziali ricevuti
+                partial = getattr(exc, "partial", b"")
+                retry_timer = self.backoff.delay(retry_count)
                 self._logger.warning(
-                    "%s %s session connection reset by peer (%r), retrying in 60s.",
+                    "%s %s session connection refused (%r, partial=%r), retrying in %.1fs.",
                     self._gateway.log_id,
                     self._type.capitalize(),
                     exc,
+                    partial,
+                    retry_timer,
                 )
-                await asyncio.sleep(60)
+                await asyncio.sleep(retry_timer)
                 retry_count += 1
 
             except Exception as exc:  # ultra-sicurezza
@@ -330,36 +665,42 @@ class OWNSession:
                 )
                 return {"Success": False, "Message": "cannot_connect"}
 
+    def abort(self) -> None:
+        """Drop the connection at once, without waiting for pending data to
+        be sent. A reader waiting on the session gets interrupted and
+        reconnects it."""
+        if self._protocol is not None:
+            self._protocol.abort()
+
     async def close(self) -> None:
         """Closes the connection to the OpenWebNet gateway."""
 
         # Può essere chiamata anche dopo tentativi falliti di connect(),
-        # quindi writer/reader potrebbero essere in stato "sporco" o già chiusi.
-        if self._stream_writer is not None:
+        # quindi il protocollo potrebbe essere in stato "sporco" o già chiuso.
+        if self._protocol is not None:
             try:
-                # Proviamo comunque a chiudere il writer
-                self._stream_writer.close()
+                # Proviamo comunque a chiudere il trasporto
+                self._protocol.close()
             except Exception as exc:
                 # Non deve mai far esplodere la chiusura
                 self._logger.debug(
-                    "%s Error calling close() on stream_writer: %r",
+                    "%s Error calling close() on protocol: %r",
                     self._gateway.log_id if self._gateway else "OWN",
                     exc,
                 )
 
             try:
                 # Alcuni reset arrivano qui: li ignoriamo
-                await self._stream_writer.wait_closed()
+                await self._protocol.wait_closed()
             except (ConnectionResetError, ConnectionError, OSError) as exc:
                 self._logger.debug(
-                    "%s Error while waiting for writer to close: %r",
+                    "%s Error while waiting for connection to close: %r",
                     self._gateway.log_id if self._gateway else "OWN",
                     exc,
                 )
 
             # Pulizia riferimenti
-            self._stream_writer = None
-            self._stream_reader = None
+            self._protocol = None
 
         if self._gateway is not None:
             self._logger.debug(
@@ -384,11 +725,11 @@ class OWNSession:
         # Start handshake
         frame = f"*99*{type_id}##"
         self._logger.debug("%s TX: %s", self._gateway.log_id, frame)
-        self._stream_writer.write(frame.encode())
-        await self._stream_writer.drain()
+        self._protocol.write(frame.encode())
+        await self._protocol.drain()
 
         # First response
-        raw_response = await self._stream_reader.readuntil(OWNSession.SEPARATOR)
+        raw_response = await self._protocol.read_frame()
         self._logger.debug("%s RX: %r", self._gateway.log_id, raw_response)
         resulting_message = OWNSignaling(raw_response.decode())
 
@@ -400,7 +741,7 @@ class OWNSession:
             error_message = "connection_refused"
 
         # Second response (or challenge)
-        raw_response = await self._stream_reader.readuntil(OWNSession.SEPARATOR)
+        raw_response = await self._protocol.read_frame()
         self._logger.debug("%s RX: %r", self._gateway.log_id, raw_response)
         resulting_message = OWNSignaling(raw_response.decode())
 
@@ -427,8 +768,8 @@ class OWNSession:
                     "%s Connection requires a password but none was provided.",
                     self._gateway.log_id,
                 )
-                self._stream_writer.write("*#*0##".encode())
-                await self._stream_writer.drain()
+                self._protocol.write("*#*0##".encode())
+                await self._protocol.drain()
             else:
                 method = "sha"
                 if resulting_message.is_sha_1():
@@ -441,20 +782,17 @@ class OWNSession:
                     self._gateway.log_id,
                     method,
                 )
-                self._stream_writer.write("*#*1##".encode())
-                await self._stream_writer.drain()
+                self._protocol.write("*#*1##".encode())
+                await self._protocol.drain()
 
-                raw_response = await self._stream_reader.readuntil(
-                    OWNSession.SEPARATOR
-                )
+                raw_response = await self._protocol.read_frame()
                 self._logger.debug("%s RX: %r", self._gateway.log_id, raw_response)
                 resulting_message = OWNSignaling(raw_response.decode())
 
                 if resulting_message.is_nonce():
                     server_random_string_ra = resulting_message.nonce
-                    key = "".join(random.choices(string.digits, k=56))
                     client_random_string_rb = self._hex_string_to_int_string(
-                        hmac.new(key=key.encode(), digestmod=method).hexdigest()
+                        secrets.token_hex(_HMAC_HASHES[method]().digest_size)
                     )
                     hashed_password = "*#{}*{}##".format(
                         client_random_string_rb,
@@ -473,11 +811,11 @@ class OWNSession:
                     self._logger.debug(
                         "%s TX: %s", self._gateway.log_id, hashed_password
                     )
-                    self._stream_writer.write(hashed_password.encode())
-                    await self._stream_writer.drain()
+                    self._protocol.write(hashed_password.encode())
+                    await self._protocol.drain()
                     try:
                         raw_response = await asyncio.wait_for(
-                            self._stream_reader.readuntil(OWNSession.SEPARATOR),
+                            self._protocol.read_frame(),
                             timeout=5,
                         )
                         self._logger.debug(
@@ -500,8 +838,8 @@ class OWNSession:
                                 nonce_a=server_random_string_ra,
                                 nonce_b=client_random_string_rb,
                             ):
-                                self._stream_writer.write("*#*1##".encode())
-                                await self._stream_writer.drain()
+                                self._protocol.write("*#*1##".encode())
+                                await self._protocol.drain()
                                 self._logger.debug(
                                     "%s Session established successfully.",
                                     self._gateway.log_id,
@@ -511,8 +849,8 @@ class OWNSession:
                                     "%s Server identity could not be confirmed.",
                                     self._gateway.log_id,
                                 )
-                                self._stream_writer.write("*#*0##".encode())
-                                await self._stream_writer.drain()
+                                self._protocol.write("*#*0##".encode())
+                                await self._protocol.drain()
                                 error = True
                                 error_message = "negociation_error"
                                 self._logger.error(
@@ -521,19 +859,21 @@ class OWNSession:
                                     self._gateway.log_id,
                                     self._type,
                                 )
+                    # Only an explicit NACK tells that the password was
+                    # refused, a stalled or dropped connection is retried.
                     except asyncio.IncompleteReadError:
                         error = True
-                        error_message = "password_error"
+                        error_message = "negotiation_failed"
                         self._logger.error(
-                            "%s Password error while opening %s session.",
+                            "%s Connection closed while waiting for the password reply of %s session.",
                             self._gateway.log_id,
                             self._type,
                         )
                     except asyncio.TimeoutError:
                         error = True
-                        error_message = "password_error"
+                        error_message = "negotiation_failed"
                         self._logger.error(
-                            "%s Password timeout error while opening %s session.",
+                            "%s Timeout while waiting for the password reply of %s session.",
                             self._gateway.log_id,
                             self._type,
                         )
@@ -552,11 +892,9 @@ class OWNSession:
                 self._logger.debug(
                     "%s TX: %s", self._gateway.log_id, hashed_password
                 )
-                self._stream_writer.write(hashed_password.encode())
-                await self._stream_writer.drain()
-                raw_response = await self._stream_reader.readuntil(
-                    OWNSession.SEPARATOR
-                )
+                self._protocol.write(hashed_password.encode())
+                await self._protocol.drain()
+                raw_response = await self._protocol.read_frame()
                 self._logger.debug("%s RX: %r", self._gateway.log_id, raw_response)
                 resulting_message = OWNSignaling(raw_response.decode())
                 if resulting_message.is_nack():
@@ -598,6 +936,7 @@ class OWNSession:
                 resulting_message,
             )
 
+        self._protocol.negotiating = False
         return {"Success": not error, "Message": error_message}
 
     def _get_own_password(self, password, nonce, test=False):
@@ -656,87 +995,79 @@ class OWNSession:
             num2 = num1
         return num1
 
+    def _password_digest(self, method: str, password: str) -> str:
+        if self._gateway is not None and password == self._gateway.password:
+            return self._gateway.password_digest(method)
+        return _HMAC_HASHES[method](password.encode()).hexdigest()
+
     def _encode_hmac_password(
         self, method: str, password: str, nonce_a: str, nonce_b: str
     ):
-        if method == "sha1":
-            message = (
-                self._int_string_to_hex_string(nonce_a)
-                + self._int_string_to_hex_string(nonce_b)
-                + "736F70653E"
-                + "636F70653E"
-                + hashlib.sha1(password.encode()).hexdigest()
-            )
-            return self._hex_string_to_int_string(
-                hashlib.sha1(message.encode()).hexdigest()
-            )
-        elif method == "sha256":
-            message = (
-                self._int_string_to_hex_string(nonce_a)
-                + self._int_string_to_hex_string(nonce_b)
-                + "736F70653E"
-                + "636F70653E"
-                + hashlib.sha256(password.encode()).hexdigest()
-            )
-            return self._hex_string_to_int_string(
-                hashlib.sha256(message.encode()).hexdigest()
-            )
-        else:
+        if method not in _HMAC_HASHES:
             return None
+        message = (
+            self._int_string_to_hex_string(nonce_a)
+            + self._int_string_to_hex_string(nonce_b)
+            + "736F70653E"
+            + "636F70653E"
+            + self._password_digest(method, password)
+        )
+        return self._hex_string_to_int_string(
+            _HMAC_HASHES[method](message.encode()).hexdigest()
+        )
 
     def _decode_hmac_response(
         self, method: str, password: str, nonce_a: str, nonce_b: str
     ):
-        if method == "sha1":
-            message = (
-                self._int_string_to_hex_string(nonce_a)
-                + self._int_string_to_hex_string(nonce_b)
-                + hashlib.sha1(password.encode()).hexdigest()
-            )
-            return self._hex_string_to_int_string(
-                hashlib.sha1(message.encode()).hexdigest()
-            )
-        elif method == "sha256":
-            message = (
-                self._int_string_to_hex_string(nonce_a)
-                + self._int_string_to_hex_string(nonce_b)
-                + hashlib.sha256(password.encode()).hexdigest()
-            )
-            return self._hex_string_to_int_string(
-                hashlib.sha256(message.encode()).hexdigest()
-            )
-        else:
+        if method not in _HMAC_HASHES:
             return None
+        message = (
+            self._int_string_to_hex_string(nonce_a)
+            + self._int_string_to_hex_string(nonce_b)
+            + self._password_digest(method, password)
+        )
+        return self._hex_string_to_int_string(
+            _HMAC_HASHES[method](message.encode()).hexdigest()
+        )
 
     def _int_string_to_hex_string(self, int_string: str) -> str:
-        hex_string = ""
-        for i in range(0, len(int_string), 2):
-            hex_string += f"{int(int_string[i:i+2]):x}"
-        return hex_string
+        return "".join(
+            [
+                _DIGIT_PAIR_TO_HEX[int_string[i : i + 2]]
+                for i in range(0, len(int_string), 2)
+            ]
+        )
 
     def _hex_string_to_int_string(self, hex_string: str) -> str:
-        int_string = ""
-        for i in range(0, len(hex_string), 1):
-            int_string += f"{int(hex_string[i:i+1], 16):0>2d}"
-        return int_string
+        return hex_string.translate(_HEX_TO_DIGIT_PAIR)
 
 
 class OWNEventSession(OWNSession):
     def __init__(self, gateway: OWNGateway = None, logger: logging.Logger = None):
         super().__init__(gateway=gateway, connection_type="event", logger=logger)
+        # Optional callback, called with the stage, the message class and the
+        # duration of the reading, decoding and parsing of the frames.
+        self.stage_timer = None
 
     @classmethod
     async def connect_to_gateway(cls, gateway: OWNGateway):
         connection = cls(gateway)
         await connection.connect()
 
-    async def get_next(self) -> Union[OWNMessage, str, None]:
+    async def get_next(self) -> Union[OWNMessage, OWNTranslation, str, None]:
         """Acts as an entry point to read messages on the event bus.
         It will read one frame and return it as an OWNMessage object"""
         try:
-            data = await self._stream_reader.readuntil(OWNSession.SEPARATOR)
+            data = await self._protocol.read_frame()
+            self.counters["frames_received"] += 1
+            if _IS_TRANSLATION(data):
+                self.counters["translations_skipped"] += 1
+                self.counters["translation_bytes"] += len(data)
+                return OWNTranslation(data)
             _decoded_data = data.decode()
             _message = OWNMessage.parse(_decoded_data)
+            if not _message:
+                self.counters["parse_failures"] += 1
             return _message if _message else _decoded_data
         except asyncio.IncompleteReadError:
             self._logger.warning(
@@ -745,6 +1076,7 @@ class OWNEventSession(OWNSession):
             await self.connect()
             return None
         except AttributeError:
+            self.counters["parse_failures"] += 1
             self._logger.exception(
                 "%s Received data could not be parsed into a message:",
                 self._gateway.log_id,
@@ -757,10 +1089,70 @@ class OWNEventSession(OWNSession):
             self._logger.exception("%s Event session crashed.", self._gateway.log_id)
             return None
 
+    async def get_next_batch(self) -> List[Union[OWNMessage, OWNTranslation, str]]:
+        """Read all the frames already received on the event bus at once
+        (waiting for at least one) and return them as OWNMessage objects,
+        as OWNTranslation markers for the command translations, or as raw
+        strings when they could not be parsed."""
+        try:
+            _frames = await self._protocol.read_frames()
+        except asyncio.IncompleteReadError:
+            self._logger.warning(
+                "%s Connection interrupted, reconnecting...", self._gateway.log_id
+            )
+            await self.connect()
+            return []
+        except ConnectionError:
+            self._logger.exception("%s Connection error:", self._gateway.log_id)
+            await self.connect()
+            return []
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("%s Event session crashed.", self._gateway.log_id)
+            return []
+
+        self.counters["frames_received"] += len(_frames)
+        _timer = self.stage_timer
+        if _timer is not None:
+            _timer("read", "*", time.perf_counter() - self._protocol.received_at)
+
+        _messages = []
+        for _frame in _frames:
+            if _IS_TRANSLATION(_frame):
+                self.counters["translations_skipped"] += 1
+                self.counters["translation_bytes"] += len(_frame)
+                _messages.append(OWNTranslation(_frame))
+                continue
+            if _timer is not None:
+                _start = time.perf_counter()
+            _decoded_data = _frame.decode()
+            if _timer is not None:
+                _decoded = time.perf_counter()
+            try:
+                _message = OWNMessage.parse(_decoded_data)
+            except AttributeError:
+                self.counters["parse_failures"] += 1
+                self._logger.exception(
+                    "%s Received data could not be parsed into a message:",
+                    self._gateway.log_id,
+                )
+                continue
+            if not _message:
+                self.counters["parse_failures"] += 1
+            if _timer is not None:
+                _class = type(_message).__name__ if _message else "str"
+                _timer("decode", _class, _decoded - _start)
+                _timer("parse", _class, time.perf_counter() - _decoded)
+            _messages.append(_message if _message else _decoded_data)
+        return _messages
+
 
 class OWNCommandSession(OWNSession):
     def __init__(self, gateway: OWNGateway = None, logger: logging.Logger = None):
         super().__init__(gateway=gateway, connection_type="command", logger=logger)
+        # Time at which the last message was written to the gateway.
+        self.last_written_at: float | None = None
+        # Seconds between writing the last commands and their ACK.
+        self.ack_round_trips = deque(maxlen=ACK_HISTORY)
 
     @classmethod
     async def send_to_gateway(cls, message: str, gateway: OWNGateway):
@@ -773,55 +1165,100 @@ class OWNCommandSession(OWNSession):
         connection = cls(gateway)
         await connection.connect()
 
-    async def send(self, message, is_status_request: bool = False, attempt: int = 1):
-        """Send the attached message on an existing 'command' connection,
-        actively reconnecting it if it had been reset."""
+    async def _read_reply(self, message) -> OWNSignaling:
+        """Read frames until the gateway's ACK or NACK for `message`."""
+        raw_response = await self._protocol.read_frame()
+        resulting_message = OWNMessage.parse(raw_response.decode())
 
-        try:
-            self._stream_writer.write(str(message).encode())
-            await self._stream_writer.drain()
-            raw_response = await self._stream_reader.readuntil(OWNSession.SEPARATOR)
+        while not isinstance(resulting_message, OWNSignaling):
+            self._logger.debug(
+                "%s Message `%s` received response `%s`.",
+                self._gateway.log_id,
+                message,
+                resulting_message,
+            )
+            raw_response = await self._protocol.read_frame()
             resulting_message = OWNMessage.parse(raw_response.decode())
 
-            while not isinstance(resulting_message, OWNSignaling):
-                self._logger.debug(
-                    "%s Message `%s` received response `%s`.",
+        return resulting_message
+
+    async def send_once(self, message, is_status_request: bool = False) -> str:
+        """Send the attached message once on an existing 'command' connection.
+        The connection is re-established after a reset or a timeout, but the
+        message is not sent again.
+        Returns one of the SEND_* outcomes."""
+
+        try:
+            self._protocol.write(str(message).encode())
+            await self._protocol.drain()
+            self.last_written_at = time.perf_counter()
+            self.counters["messages_sent"] += 1
+            resulting_message = await self._with_timeout(
+                "status" if is_status_request else "ack", self._read_reply(message)
+            )
+
+            if resulting_message.is_nack():
+                self.counters["nacks"] += 1
+                self._logger.error(
+                    "%s Could not send message `%s`.",
                     self._gateway.log_id,
                     message,
-                    resulting_message,
                 )
-                raw_response = await self._stream_reader.readuntil(OWNSession.SEPARATOR)
-                resulting_message = OWNMessage.parse(raw_response.decode())
-
-            if resulting_message.is_nack():
-                if attempt <= 2:
-                    self._logger.error(
-                        "%s Could not send message `%s`. Retrying (%d)...",
-                        self._gateway.log_id,
-                        message,
-                        attempt,
-                    )
-                    return await self.send(message, is_status_request, attempt + 1)
-                else:
-                    self._logger.error(
-                        "%s Could not send message `%s`. No more retries.",
-                        self._gateway.log_id,
-                        message,
-                    )
+                return SEND_NACK
             elif resulting_message.is_ack():
                 log_message = "%s Message `%s` was successfully sent."
                 if not is_status_request:
+                    self.ack_round_trips.append(time.perf_counter() - self.last_written_at)
                     self._logger.info(log_message, self._gateway.log_id, message)
                 else:
                     self._logger.debug(log_message, self._gateway.log_id, message)
+                return SEND_ACK
+            return SEND_ERROR
 
+        except asyncio.TimeoutError:
+            # A late reply would be taken for the next message's one: the
+            # connection is dropped and negotiated again.
+            await self.close()
+            await self.connect()
+            return SEND_TIMEOUT
+        except asyncio.CancelledError:
+            self.abort()
+            raise
         except (ConnectionResetError, asyncio.IncompleteReadError):
             self._logger.debug(
-                "%s Command session connection reset, retrying...",
+                "%s Command session connection reset while sending `%s`, reconnecting...",
                 self._gateway.log_id,
+                message,
             )
             await self.connect()
-            await self.send(message=message, is_status_request=is_status_request)
+            return SEND_RESET
         except Exception:  # pylint: disable=broad-except
             self._logger.exception("%s Command session crashed.", self._gateway.log_id)
-            return None
+            return SEND_ERROR
+
+    async def send(self, message, is_status_request: bool = False, max_attempts: int = 3):
+        """Send the attached message on an existing 'command' connection,
+        sending it again (up to `max_attempts` times in total) if it was
+        NACKed or if the connection had been reset.
+        Returns True if the gateway ACKed the message, False otherwise."""
+
+        for attempt in range(1, max_attempts + 1):
+            outcome = await self.send_once(message, is_status_request)
+            if outcome == SEND_ACK:
+                return True
+            if outcome not in RETRYABLE_OUTCOMES:
+                return False
+            if attempt < max_attempts:
+                self._logger.error(
+                    "%s Could not send message `%s`. Retrying (%d)...",
+                    self._gateway.log_id,
+                    message,
+                    attempt,
+                )
+
+        self._logger.error(
+            "%s Could not send message `%s`. No more retries.",
+            self._gateway.log_id,
+            message,
+        )
+        return False
@@ -38,6 +38,11 @@ CLIMATE_MODE_AUTO = "auto"
 PIR_SENSITIVITY_MAPPING = ["low", "medium", "high", "very high"]
 
 
+def _formatted(log) -> str:
+    """Return a human readable log, formatting it if it was left as a callable."""
+    return log() if callable(log) else log
+
+
 class OWNMessage:
     _ACK = re.compile(r"^\*#\*1##$")  #  *#*1##
     _NACK = re.compile(r"^\*#\*0##$")  #  *#*0##
@@ -196,6 +201,11 @@ class OWNMessage:
     def is_valid(self) -> bool:
         return self._is_valid_message
 
+    @property
+    def family(self) -> str:
+        """The family of this message: EVENT, COMMAND, REQUEST or COMMAND_TRANSLATION"""
+        return self._family
+
     @property
     def who(self) -> int:
         """The 'who' ID of the subject of this message"""
@@ -217,6 +227,11 @@ class OWNMessage:
             else None
         )
 
+    @property
+    def what(self) -> int:
+        """The 'what' ID of this message, None for the dimension messages"""
+        return self._what
+
     @property
     def dimension(self) -> str:
         """The 'where' ID of the subject of this message"""
@@ -267,7 +282,8 @@ class OWNMessage:
 
     @property
     def human_readable_log(self) -> str:
-        """A human readable log of the event"""
+        """A human readable log of the event, formatted on first access"""
+        self._human_readable_log = _formatted(self._human_readable_log)
         return self._human_readable_log
 
     @property
@@ -386,7 +402,7 @@ class OWNScenarioEvent(OWNEvent):
 
         self._scenario = self._what
         self._control_panel = self._where
-        self._human_readable_log = f"Scenario {self._scenario} from control panel {self._control_panel} has been launched."  # pylint: disable=line-too-long
+        self._human_readable_log = lambda: f"Scenario {self._scenario} from control panel {self._control_panel} has been launched."  # pylint: disable=line-too-long
 
     @property
     def scenario(self):
@@ -417,48 +433,48 @@ class OWNLightingEvent(OWNEvent):
             self._state = self._what
 
             if self._state == 0:  # Light off
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Light {self._where}{self._interface_log_text} is switched off."
                 )
             elif self._state == 1:  # Light on
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Light {self._where}{self._interface_log_text} is switched on."
                 )
             elif self._state > 1 and self._state < 11:  # Light dimmed to preset value
                 self._brightness_preset = self._state
                 # self._brightness = self._state * 10
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on at brightness level {self._state}."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on at brightness level {self._state}."  # pylint: disable=line-too-long
             elif self._state == 11:  # Timer at 1m
                 self._timer = 60
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._state == 12:  # Timer at 2m
                 self._timer = 120
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._state == 13:  # Timer at 3m
                 self._timer = 180
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._state == 14:  # Timer at 4m
                 self._timer = 240
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._state == 15:  # Timer at 5m
                 self._timer = 300
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._state == 16:  # Timer at 15m
                 self._timer = 900
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._state == 17:  # Timer at 30s
                 self._timer = 30
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._state == 18:  # Timer at 0.5s
                 self._timer = 0.5
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._state >= 20 and self._state <= 29:  # Light blinking
                 self._blinker = 0.5 * (self._state - 19)
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is blinking every {self._blinker}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is blinking every {self._blinker}s."
             elif self._state == 34:  # Motion detected
                 self._type = MESSAGE_TYPE_MOTION
                 self._motion = True
-                self._human_readable_log = f"Light/motion sensor {self._where}{self._interface_log_text} detected motion"
+                self._human_readable_log = lambda: f"Light/motion sensor {self._where}{self._interface_log_text} detected motion"
 
         if self._dimension is not None:
             if self._dimension == 1 or self._dimension == 4:  # Brightness value
@@ -466,25 +482,25 @@ class OWNLightingEvent(OWNEvent):
                 self._transition = int(self._dimension_value[1])
                 if self._brightness == 0:
                     self._state = 0
-                    self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched off."
+                    self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched off."
                 else:
                     self._state = 1
-                    self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on at {self._brightness}%."
+                    self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on at {self._brightness}%."
             elif self._dimension == 2:  # Time value
                 self._timer = (
                     int(self._dimension_value[0]) * 3600
                     + int(self._dimension_value[1]) * 60
                     + int(self._dimension_value[2])
                 )
-                self._human_readable_log = f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
+                self._human_readable_log = lambda: f"Light {self._where}{self._interface_log_text} is switched on for {self._timer}s."
             elif self._dimension == 5:  # PIR sensitivity
                 self._type = MESSAGE_TYPE_PIR_SENSITIVITY
                 self._pir_sensitivity = int(self._dimension_value[0])
-                self._human_readable_log = f"Light/motion sensor {self._where}{self._interface_log_text} PIR sesitivity is {PIR_SENSITIVITY_MAPPING[self._pir_sensitivity]}."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Light/motion sensor {self._where}{self._interface_log_text} PIR sesitivity is {PIR_SENSITIVITY_MAPPING[self._pir_sensitivity]}."  # pylint: disable=line-too-long
             elif self._dimension == 6:  # Illuminance value
                 self._type = MESSAGE_TYPE_ILLUMINANCE
                 self._illuminance = int(self._dimension_value[0])
-                self._human_readable_log = f"Light/motion sensor {self._where}{self._interface_log_text} detected an illuminance value of {self._illuminance} lx."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Light/motion sensor {self._where}{self._interface_log_text} detected an illuminance value of {self._illuminance} lx."  # pylint: disable=line-too-long
             elif self._dimension == 7:  # Motion timeout value
                 self._type = MESSAGE_TYPE_MOTION_TIMEOUT
                 self._motion_timeout = datetime.timedelta(
@@ -492,9 +508,9 @@ class OWNLightingEvent(OWNEvent):
                     minutes=int(self._dimension_value[1]),
                     seconds=int(self._dimension_value[2]),
                 )
-                self._human_readable_log = f"Light/motion sensor {self._where}{self._interface_log_text} has timeout set to {self._motion_timeout}."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Light/motion sensor {self._where}{self._interface_log_text} has timeout set to {self._motion_timeout}."  # pylint: disable=line-too-long
             elif self._dimension_value is not None:
-                self._human_readable_log = f"Light/motion sensor {self._where}{self._interface_log_text} has sent an unknown dimension {self._dimension}."
+                self._human_readable_log = lambda: f"Light/motion sensor {self._where}{self._interface_log_text} has sent an unknown dimension {self._dimension}."
             else:
                 pass
 
@@ -566,7 +582,7 @@ class OWNAutomationEvent(OWNEvent):
                 self._info = int(self._dimension_value[3])
 
         if self._state == 0:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Cover {self._where}{self._interface_log_text} stopped."
             )
             self._is_opening = False
@@ -575,33 +591,33 @@ class OWNAutomationEvent(OWNEvent):
             self._is_opening = False
             self._is_closing = False
             if self._position == 0:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Cover {self._where}{self._interface_log_text} is closed."
                 )
                 self._is_closed = True
             else:
-                self._human_readable_log = f"Cover {self._where}{self._interface_log_text} is opened at {self._position}%."
+                self._human_readable_log = lambda: f"Cover {self._where}{self._interface_log_text} is opened at {self._position}%."
                 self._is_closed = False
         else:
             if self._state == 1:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Cover {self._where}{self._interface_log_text} is opening."
                 )
                 self._is_opening = True
                 self._is_closing = False
             elif self._state == 11 or self._state == 13:
-                self._human_readable_log = f"Cover {self._where}{self._interface_log_text} is opening from initial position {self._position}."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Cover {self._where}{self._interface_log_text} is opening from initial position {self._position}."  # pylint: disable=line-too-long
                 self._is_opening = True
                 self._is_closing = False
                 self._is_closed = False
             elif self._state == 2:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Cover {self._where}{self._interface_log_text} is closing."
                 )
                 self._is_closing = True
                 self._is_opening = False
             elif self._state == 12 or self._state == 14:
-                self._human_readable_log = f"Cover {self._where}{self._interface_log_text} is closing from initial position {self._position}."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Cover {self._where}{self._interface_log_text} is closing from initial position {self._position}."  # pylint: disable=line-too-long
                 self._is_closing = True
                 self._is_opening = False
                 self._is_closed = False
@@ -670,7 +686,7 @@ class OWNHeatingEvent(OWNEvent):
             if self._mode in [103, 203, 303, 102, 202, 302]:
                 self._type = MESSAGE_TYPE_MODE
                 self._mode_name = CLIMATE_MODE_OFF
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s mode is set to '{self._mode_name}'"
                 )
             elif (
@@ -680,7 +696,7 @@ class OWNHeatingEvent(OWNEvent):
             ):
                 self._type = MESSAGE_TYPE_MODE
                 self._mode_name = CLIMATE_MODE_COOL
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s mode is set to '{self._mode_name}'"
                 )
             elif (
@@ -690,7 +706,7 @@ class OWNHeatingEvent(OWNEvent):
             ):
                 self._type = MESSAGE_TYPE_MODE
                 self._mode_name = CLIMATE_MODE_HEAT
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s mode is set to '{self._mode_name}'"
                 )
             elif (
@@ -700,22 +716,22 @@ class OWNHeatingEvent(OWNEvent):
             ):
                 self._type = MESSAGE_TYPE_MODE
                 self._mode_name = CLIMATE_MODE_AUTO
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s mode is set to '{self._mode_name}'"
                 )
             elif self._mode == 20:
                 self._mode_name = None
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s remote control is disabled"
                 )
             elif self._mode == 21:
                 self._mode_name = None
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s remote control is enabled"
                 )
             else:
                 self._mode_name = None
-                self._human_readable_log = f"Zone {self._zone}'s mode is unknown"
+                self._human_readable_log = lambda: f"Zone {self._zone}'s mode is unknown"
 
             if (
                 self._type == MESSAGE_TYPE_MODE
@@ -726,9 +742,9 @@ class OWNHeatingEvent(OWNEvent):
                 self._set_temperature = float(
                     f"{self._what_param[0][1:3]}.{self._what_param[0][-1]}"
                 )
-                self._human_readable_log += f" at {self._set_temperature}°C."
+                self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + f" at {self._set_temperature}°C."
             else:
-                self._human_readable_log += "."
+                self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + "."
 
         if self._dimension == 0:  # Temperature
             if self._sensor is None:
@@ -736,13 +752,13 @@ class OWNHeatingEvent(OWNEvent):
                 self._measured_temperature = float(
                     f"{self._dimension_value[0][1:3]}.{self._dimension_value[0][-1]}"
                 )
-                self._human_readable_log = f"Zone {self._zone}'s main sensor is reporting a temperature of {self._measured_temperature}°C."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Zone {self._zone}'s main sensor is reporting a temperature of {self._measured_temperature}°C."  # pylint: disable=line-too-long
             else:
                 self._type = MESSAGE_TYPE_SECONDARY_TEMPERATURE
                 self._secondary_temperature = float(
                     f"{self._dimension_value[0][1:3]}.{self._dimension_value[0][-1]}"
                 )
-                self._human_readable_log = f"Zone {self._zone}'s secondary sensor {self._sensor} is reporting a temperature of {self._secondary_temperature}°C."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Zone {self._zone}'s secondary sensor {self._sensor} is reporting a temperature of {self._secondary_temperature}°C."  # pylint: disable=line-too-long
 
         elif self._dimension == 11:  # Fan speed
             _fan_mode = int(self._dimension_value[0])
@@ -751,24 +767,24 @@ class OWNHeatingEvent(OWNEvent):
                 self._is_active = True
                 if _fan_mode > 0:
                     self._fan_speed = _fan_mode
-                    self._human_readable_log = (
+                    self._human_readable_log = lambda: (
                         f"Zone {self._zone}'s fan is on at speed {self._fan_speed}."
                     )
                 else:
-                    self._human_readable_log = (
+                    self._human_readable_log = lambda: (
                         f"Zone {self._zone}'s fan is on at 'Auto' speed."
                     )
             else:
                 self._fan_on = False
                 self._is_active = False
-                self._human_readable_log = f"Zone {self._zone}'s fan is off."
+                self._human_readable_log = lambda: f"Zone {self._zone}'s fan is off."
 
         elif self._dimension == 12:  # Local set temperature (set+offset)
             self._type = MESSAGE_TYPE_LOCAL_TARGET_TEMPERATURE
             self._local_set_temperature = float(
                 f"{self._dimension_value[0][1:3]}.{self._dimension_value[0][-1]}"
             )
-            self._human_readable_log = f"Zone {self._zone}'s local target temperature is set to {self._local_set_temperature}°C."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Zone {self._zone}'s local target temperature is set to {self._local_set_temperature}°C."  # pylint: disable=line-too-long
 
         elif self._dimension == 13:  # Local offset
             self._type = MESSAGE_TYPE_LOCAL_OFFSET
@@ -786,7 +802,7 @@ class OWNHeatingEvent(OWNEvent):
                 self._local_offset = int(f"{self._dimension_value[0][1:]}")
             else:
                 self._local_offset = -int(f"{self._dimension_value[0][1:]}")
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Zone {self._zone}'s local offset is set to {self._local_offset}°C."
             )
 
@@ -795,7 +811,7 @@ class OWNHeatingEvent(OWNEvent):
             self._set_temperature = float(
                 f"{self._dimension_value[0][1:3]}.{self._dimension_value[0][-1]}"
             )
-            self._human_readable_log = f"Zone {self._zone}'s target temperature is set to {self._set_temperature}°C."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Zone {self._zone}'s target temperature is set to {self._set_temperature}°C."  # pylint: disable=line-too-long
 
         elif self._dimension == 19:  # Valves status
             self._type = MESSAGE_TYPE_ACTION
@@ -805,19 +821,19 @@ class OWNHeatingEvent(OWNEvent):
             # Handle cooling valve status relative to fan speed/status
             _cooling_value = int(self._dimension_value[0])
             if _cooling_value == 0:
-                self._human_readable_log = f"Zone {self._zone}'s cooling valve is off"
+                self._human_readable_log = lambda: f"Zone {self._zone}'s cooling valve is off"
             elif _cooling_value == 1:
-                self._human_readable_log = f"Zone {self._zone}'s cooling valve is on"
+                self._human_readable_log = lambda: f"Zone {self._zone}'s cooling valve is on"
             elif _cooling_value == 2:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s cooling valve is opened"
                 )
             elif _cooling_value == 3:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s cooling valve is closed"
                 )
             elif _cooling_value == 4:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s cooling valve is stopped"
                 )
             elif _cooling_value > 4:
@@ -826,36 +842,36 @@ class OWNHeatingEvent(OWNEvent):
                     self._cooling_fan_on = True
                     self._is_active = True
                     self._cooling_fan_speed = _fan_mode
-                    self._human_readable_log = f"Zone {self._zone}'s cooling fan is on at speed {self._fan_speed}"  # pylint: disable=line-too-long
+                    self._human_readable_log = lambda: f"Zone {self._zone}'s cooling fan is on at speed {self._fan_speed}"  # pylint: disable=line-too-long
                 else:
                     self._cooling_fan_on = False
                     self._is_active = False
-                    self._human_readable_log = f"Zone {self._zone}'s cooling fan is off"
+                    self._human_readable_log = lambda: f"Zone {self._zone}'s cooling fan is off"
             # Handle heating valve status relative to fan speed/status
             _heating_value = int(self._dimension_value[1])
             if _heating_value == 0:
-                self._human_readable_log += "; heating valve is off."
+                self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + "; heating valve is off."
             elif _heating_value == 1:
-                self._human_readable_log += "; heating valve is on."
+                self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + "; heating valve is on."
             elif _heating_value == 2:
-                self._human_readable_log += "; heating valve is opened."
+                self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + "; heating valve is opened."
             elif _heating_value == 3:
-                self._human_readable_log += "; heating valve is closed."
+                self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + "; heating valve is closed."
             elif _heating_value == 4:
-                self._human_readable_log += "; heating valve is stopped."
+                self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + "; heating valve is stopped."
             elif _heating_value > 4:
                 _fan_mode = _heating_value - 5
                 if _fan_mode > 0:
                     self._fan_on = True
                     self._is_active = True
                     self._fan_speed = _fan_mode
-                    self._human_readable_log += (
+                    self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + (
                         f"; heating fan is on at speed {self._fan_speed}."
                     )
                 else:
                     self._fan_on = False
                     self._is_active = False
-                    self._human_readable_log += "; heating fan is off."
+                    self._human_readable_log = lambda _log=self._human_readable_log: _formatted(_log) + "; heating fan is off."
 
         elif self._dimension == 20:  # Actuator status
             self._type = MESSAGE_TYPE_ACTION
@@ -865,23 +881,23 @@ class OWNHeatingEvent(OWNEvent):
             )
             _value = int(self._dimension_value[0])
             if _value == 0:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s actuator {self._actuator} is off."
                 )
             elif _value == 1:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s actuator {self._actuator} is on."
                 )
             elif _value == 2:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s actuator {self._actuator} is opened."
                 )
             elif _value == 3:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s actuator {self._actuator} is closed."
                 )
             elif _value == 4:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Zone {self._zone}'s actuator {self._actuator} is stopped."
                 )
             elif _value > 4:
@@ -891,22 +907,22 @@ class OWNHeatingEvent(OWNEvent):
                     self._is_active = True
                     if _fan_mode < 4:
                         self._fan_speed = _fan_mode
-                        self._human_readable_log = (
+                        self._human_readable_log = lambda: (
                             f"Zone {self._zone}'s fan is on at speed {self._fan_speed}."
                         )
                     else:
-                        self._human_readable_log = (
+                        self._human_readable_log = lambda: (
                             f"Zone {self._zone}'s fan is on at 'Auto' speed."
                         )
                 else:
                     self._fan_on = False
                     self._is_active = False
-                    self._human_readable_log = f"Zone {self._zone}'s fan is off."
+                    self._human_readable_log = lambda: f"Zone {self._zone}'s fan is off."
 
         elif self._dimension == 60:  # Humidity
             self._type = MESSAGE_TYPE_MAIN_HUMIDITY
             self._measured_humidity = float(self._dimension_value[0])
-            self._human_readable_log = f"Zone {self._zone}'s main sensor is reporting a humidity of {self._measured_humidity}%."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Zone {self._zone}'s main sensor is reporting a humidity of {self._measured_humidity}%."  # pylint: disable=line-too-long
 
     @property
     def unique_id(self) -> str:
@@ -983,16 +999,16 @@ class OWNAlarmEvent(OWNEvent):
                 self._zone = "c"
             elif self._zone == "15":
                 self._zone = "f"
-            self._human_readable_log = f"Zone {self._zone} is reporting: "
+            self._human_readable_log = lambda: f"Zone {self._zone} is reporting: "
         elif len(self._where) > 1:
             self._zone = int(self._where[0])
             self._sensor = int(self._where[1:])
             if self._zone == 0:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Device {self._sensor} in input zone is reporting: "
                 )
             else:
-                self._human_readable_log = (
+                self._human_readable_log = lambda: (
                     f"Sensor {self._sensor} in zone {self._zone} is reporting: "
                 )
         else:
@@ -1044,7 +1060,7 @@ class OWNAlarmEvent(OWNEvent):
         elif self._state_code == 31:
             self._state = "silent alarm"
 
-        self._human_readable_log = f"{self._human_readable_log}'{self._state}'."
+        self._human_readable_log = lambda _log=self._human_readable_log: f"{_formatted(_log)}'{self._state}'."
 
     @property
     def general(self):
@@ -1085,47 +1101,47 @@ class OWNAuxEvent(OWNEvent):
 
         self._state = self._what
         if self._state == 0:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'OFF'."
             )
         elif self._state == 1:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'ON'."
             )
         elif self._state == 2:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'TOGGLE'."
             )
         elif self._state == 3:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'STOP'."
             )
         elif self._state == 4:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'UP'."
             )
         elif self._state == 5:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'DOWN'."
             )
         elif self._state == 6:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'ENABLED'."
             )
         elif self._state == 7:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'DISABLED'."
             )
         elif self._state == 8:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'RESET_GEN'."
             )
         elif self._state == 9:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'RESET_BI'."
             )
         elif self._state == 10:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Auxilliary channel {self._channel} is set to 'RESET_TRI'."
             )
 
@@ -1183,7 +1199,7 @@ class OWNGatewayEvent(OWNEvent):
                 )
             else:
                 self._timezone = ""
-            self._human_readable_log = f"Gateway's internal time is: {self._hour}:{self._minute}:{self._second} UTC {self._timezone}."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Gateway's internal time is: {self._hour}:{self._minute}:{self._second} UTC {self._timezone}."  # pylint: disable=line-too-long
 
         elif self._dimension == 1:
             self._year = self._dimension_value[3]
@@ -1192,21 +1208,21 @@ class OWNGatewayEvent(OWNEvent):
             self._date = datetime.date(
                 year=int(self._year), month=int(self._month), day=int(self._day)
             )
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Gateway's internal date is: {self._year}-{self._month}-{self._day}."
             )
 
         elif self._dimension == 10:
             self._ip_address = f"{self._dimension_value[0]}.{self._dimension_value[1]}.{self._dimension_value[2]}.{self._dimension_value[3]}"  # pylint: disable=line-too-long
-            self._human_readable_log = f"Gateway's IP address is: {self._ip_address}."
+            self._human_readable_log = lambda: f"Gateway's IP address is: {self._ip_address}."
 
         elif self._dimension == 11:
             self._netmask = f"{self._dimension_value[0]}.{self._dimension_value[1]}.{self._dimension_value[2]}.{self._dimension_value[3]}"  # pylint: disable=line-too-long
-            self._human_readable_log = f"Gateway's netmask is: {self._netmask}."
+            self._human_readable_log = lambda: f"Gateway's netmask is: {self._netmask}."
 
         elif self._dimension == 12:
             self._mac_address = f"{int(self._dimension_value[0]):02x}:{int(self._dimension_value[1]):02x}:{int(self._dimension_value[2]):02x}:{int(self._dimension_value[3]):02x}:{int(self._dimension_value[4]):02x}:{int(self._dimension_value[5]):02x}"  # pylint: disable=line-too-long
-            self._human_readable_log = f"Gateway's MAC address is: {self._mac_address}."
+            self._human_readable_log = lambda: f"Gateway's MAC address is: {self._mac_address}."
 
         elif self._dimension == 15:
             if self._dimension_value[0] == "2":
@@ -1225,11 +1241,11 @@ class OWNGatewayEvent(OWNEvent):
                 self._device_type = "F454"
             else:
                 self._device_type = f"Unknown ({self._dimension_value[0]})"
-            self._human_readable_log = f"Gateway device type is: {self._device_type}."
+            self._human_readable_log = lambda: f"Gateway device type is: {self._device_type}."
 
         elif self._dimension == 16:
             self._firmware_version = f"{self._dimension_value[0]}.{self._dimension_value[1]}.{self._dimension_value[2]}"  # pylint: disable=line-too-long
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Gateway's firmware version is: {self._firmware_version}."
             )
 
@@ -1240,7 +1256,7 @@ class OWNGatewayEvent(OWNEvent):
                 minutes=int(self._dimension_value[2]),
                 seconds=int(self._dimension_value[3]),
             )
-            self._human_readable_log = f"Gateway's uptime is: {self._uptime}."
+            self._human_readable_log = lambda: f"Gateway's uptime is: {self._uptime}."
 
         elif self._dimension == 22:
             self._hour = self._dimension_value[0]
@@ -1261,19 +1277,19 @@ class OWNGatewayEvent(OWNEvent):
             self._datetime = datetime.datetime.fromisoformat(
                 f"{self._year}-{self._month}-{self._day}*{self._hour}:{self._minute}:{self._second}{self._timezone}"  # pylint: disable=line-too-long
             )
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Gateway's internal datetime is: {self._datetime}."
             )
 
         elif self._dimension == 23:
             self._kernel_version = f"{self._dimension_value[0]}.{self._dimension_value[1]}.{self._dimension_value[2]}"  # pylint: disable=line-too-long
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Gateway's kernel version is: {self._kernel_version}."
             )
 
         elif self._dimension == 24:
             self._distribution_version = f"{self._dimension_value[0]}.{self._dimension_value[1]}.{self._dimension_value[2]}"  # pylint: disable=line-too-long
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Gateway's distribution version is: {self._distribution_version}."
             )
 
@@ -1290,13 +1306,13 @@ class OWNCENEvent(OWNEvent):
         self.object = self._where
 
         if self._state is None:
-            self._human_readable_log = f"Button {self.push_button} of CEN object {self.object}{self._interface_log_text} has been pressed."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN object {self.object}{self._interface_log_text} has been pressed."  # pylint: disable=line-too-long
         elif int(self._state) == 3:
-            self._human_readable_log = f"Button {self.push_button} of CEN object {self.object}{self._interface_log_text} is being held pressed."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN object {self.object}{self._interface_log_text} is being held pressed."  # pylint: disable=line-too-long
         elif int(self._state) == 1:
-            self._human_readable_log = f"Button {self.push_button} of CEN object {self.object}{self._interface_log_text} has been released after a short press."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN object {self.object}{self._interface_log_text} has been released after a short press."  # pylint: disable=line-too-long
         elif int(self._state) == 2:
-            self._human_readable_log = f"Button {self.push_button} of CEN object {self.object}{self._interface_log_text} has been released after a long press."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN object {self.object}{self._interface_log_text} has been released after a long press."  # pylint: disable=line-too-long
 
     @property
     def is_pressed(self):
@@ -1333,7 +1349,7 @@ class OWNSceneEvent(OWNEvent):
         else:
             _status = f"unknonwn ({self._state})"
 
-        self._human_readable_log = f"Scene {self._scene} is {_status}."
+        self._human_readable_log = lambda: f"Scene {self._scene} is {_status}."
 
     @property
     def scenario(self):
@@ -1383,7 +1399,7 @@ class OWNEnergyEvent(OWNEvent):
             if self._dimension == 113:
                 self._type = MESSAGE_TYPE_ACTIVE_POWER
                 self._active_power = int(self._dimension_value[0])
-                self._human_readable_log = f"Sensor {self._sensor} is reporting an active power draw of {self._active_power} W."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Sensor {self._sensor} is reporting an active power draw of {self._active_power} W."  # pylint: disable=line-too-long
             elif self._dimension == 511:
                 _now = datetime.date.today()
                 _raw_message_date = datetime.date(
@@ -1412,12 +1428,12 @@ class OWNEnergyEvent(OWNEvent):
                     self._hourly_consumption["date"] = _message_date
                     self._hourly_consumption["hour"] = int(self._dimension_value[0]) - 1
                     self._hourly_consumption["value"] = int(self._dimension_value[1])
-                    self._human_readable_log = f"Sensor {self._sensor} is reporting a power consumption of {self._hourly_consumption['value']} Wh for {self._hourly_consumption['date']} at {self._hourly_consumption['hour']}."  # pylint: disable=line-too-long
+                    self._human_readable_log = lambda: f"Sensor {self._sensor} is reporting a power consumption of {self._hourly_consumption['value']} Wh for {self._hourly_consumption['date']} at {self._hourly_consumption['hour']}."  # pylint: disable=line-too-long
                 else:
                     self._type = MESSAGE_TYPE_DAILY_CONSUMPTION
                     self._daily_consumption["date"] = _message_date
                     self._daily_consumption["value"] = int(self._dimension_value[1])
-                    self._human_readable_log = f"Sensor {self._sensor} is reporting a power consumption of {self._daily_consumption['value']} Wh for {self._daily_consumption['date']}."  # pylint: disable=line-too-long
+                    self._human_readable_log = lambda: f"Sensor {self._sensor} is reporting a power consumption of {self._daily_consumption['value']} Wh for {self._daily_consumption['date']}."  # pylint: disable=line-too-long
             elif self._dimension == 513 or self._dimension == 514:
                 _now = datetime.date.today()
                 _raw_message_date = datetime.date(
@@ -1454,15 +1470,15 @@ class OWNEnergyEvent(OWNEvent):
                 self._type = MESSAGE_TYPE_DAILY_CONSUMPTION
                 self._daily_consumption["date"] = _message_date
                 self._daily_consumption["value"] = int(self._dimension_value[1])
-                self._human_readable_log = f"Sensor {self._sensor} is reporting a power consumption of {self._daily_consumption['value']} Wh for {self._daily_consumption['date']}."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Sensor {self._sensor} is reporting a power consumption of {self._daily_consumption['value']} Wh for {self._daily_consumption['date']}."  # pylint: disable=line-too-long
             elif self._dimension == 51:
                 self._type = MESSAGE_TYPE_ENERGY_TOTALIZER
                 self._total_consumption = int(self._dimension_value[0])
-                self._human_readable_log = f"Sensor {self._sensor} is reporting a total power consumption of {self._total_consumption} Wh."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Sensor {self._sensor} is reporting a total power consumption of {self._total_consumption} Wh."  # pylint: disable=line-too-long
             elif self._dimension == 54:
                 self._type = MESSAGE_TYPE_CURRENT_DAY_CONSUMPTION
                 self._current_day_partial_consumption = int(self._dimension_value[0])
-                self._human_readable_log = f"Sensor {self._sensor} is reporting a power consumption of {self._current_day_partial_consumption} Wh up to now today."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Sensor {self._sensor} is reporting a power consumption of {self._current_day_partial_consumption} Wh up to now today."  # pylint: disable=line-too-long
             elif self._dimension == 52:
                 self._type = MESSAGE_TYPE_MONTHLY_CONSUMPTION
                 _message_date = datetime.date(
@@ -1470,11 +1486,11 @@ class OWNEnergyEvent(OWNEvent):
                 )
                 self._monthly_consumption["date"] = _message_date
                 self._monthly_consumption["value"] = int(self._dimension_value[0])
-                self._human_readable_log = f"Sensor {self._sensor} is reporting a power consumption of {self._monthly_consumption['value']} Wh for {self._monthly_consumption['date'].strftime('%B %Y')}."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Sensor {self._sensor} is reporting a power consumption of {self._monthly_consumption['value']} Wh for {self._monthly_consumption['date'].strftime('%B %Y')}."  # pylint: disable=line-too-long
             elif self._dimension == 53:
                 self._type = MESSAGE_TYPE_CURRENT_MONTH_CONSUMPTION
                 self._current_month_partial_consumption = int(self._dimension_value[0])
-                self._human_readable_log = f"Sensor {self._sensor} is reporting a power consumption of {self._current_month_partial_consumption} Wh up to now this month."  # pylint: disable=line-too-long
+                self._human_readable_log = lambda: f"Sensor {self._sensor} is reporting a power consumption of {self._current_month_partial_consumption} Wh up to now this month."  # pylint: disable=line-too-long
 
     @property
     def message_type(self):
@@ -1510,6 +1526,7 @@ class OWNEnergyEvent(OWNEvent):
 
     @property
     def human_readable_log(self):
+        self._human_readable_log = _formatted(self._human_readable_log)
         return self._human_readable_log
 
 
@@ -1522,11 +1539,11 @@ class OWNDryContactEvent(OWNEvent):
         self._sensor = self._where[1:]
 
         if self._detection == 1:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Sensor {self._sensor} detected {'ON' if self._state == 1 else 'OFF'}."
             )
         else:
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Sensor {self._sensor} reported {'ON' if self._state == 1 else 'OFF'}."
             )
 
@@ -1540,6 +1557,7 @@ class OWNDryContactEvent(OWNEvent):
 
     @property
     def human_readable_log(self):
+        self._human_readable_log = _formatted(self._human_readable_log)
         return self._human_readable_log
 
 
@@ -1552,21 +1570,21 @@ class OWNCENPlusEvent(OWNEvent):
         self.object = self._where[1:]
 
         if self._state == 21:
-            self._human_readable_log = f"Button {self.push_button} of CEN+ object {self.object} has been pressed"  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN+ object {self.object} has been pressed"  # pylint: disable=line-too-long
         elif self._state == 22:
-            self._human_readable_log = f"Button {self.push_button} of CEN+ object {self.object} is being held pressed"  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN+ object {self.object} is being held pressed"  # pylint: disable=line-too-long
         elif self._state == 23:
-            self._human_readable_log = f"Button {self.push_button} of CEN+ object {self.object} is still being held pressed"  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN+ object {self.object} is still being held pressed"  # pylint: disable=line-too-long
         elif self._state == 24:
-            self._human_readable_log = f"Button {self.push_button} of CEN+ object {self.object} has been released"  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN+ object {self.object} has been released"  # pylint: disable=line-too-long
         elif self._state == 25:
-            self._human_readable_log = f"Button {self.push_button} of CEN+ object {self.object} has been slowly rotated clockwise"  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN+ object {self.object} has been slowly rotated clockwise"  # pylint: disable=line-too-long
         elif self._state == 26:
-            self._human_readable_log = f"Button {self.push_button} of CEN+ object {self.object} has been quickly rotated clockwise"  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN+ object {self.object} has been quickly rotated clockwise"  # pylint: disable=line-too-long
         elif self._state == 27:
-            self._human_readable_log = f"Button {self.push_button} of CEN+ object {self.object} has been slowly rotated counter-clockwise"  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN+ object {self.object} has been slowly rotated counter-clockwise"  # pylint: disable=line-too-long
         elif self._state == 28:
-            self._human_readable_log = f"Button {self.push_button} of CEN+ object {self.object} has been quickly rotated counter-clockwise"  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"Button {self.push_button} of CEN+ object {self.object} has been quickly rotated counter-clockwise"  # pylint: disable=line-too-long
 
     @property
     def is_short_pressed(self):
@@ -1602,6 +1620,7 @@ class OWNCENPlusEvent(OWNEvent):
 
     @property
     def human_readable_log(self):
+        self._human_readable_log = _formatted(self._human_readable_log)
         return self._human_readable_log
 
 
@@ -1669,31 +1688,31 @@ class OWNLightingCommand(OWNCommand):
     @classmethod
     def status(cls, where):
         message = cls(f"*#1*{where}##")
-        message._human_readable_log = f"Requesting light or switch {message._where}{message._interface_log_text} status."
+        message._human_readable_log = lambda: f"Requesting light or switch {message._where}{message._interface_log_text} status."
         return message
 
     @classmethod
     def get_brightness(cls, where):
         message = cls(f"*#1*{where}*1##")
-        message._human_readable_log = f"Requesting light {message._where}{message._interface_log_text} brightness."
+        message._human_readable_log = lambda: f"Requesting light {message._where}{message._interface_log_text} brightness."
         return message
 
     @classmethod
     def get_pir_sensitivity(cls, where):
         message = cls(f"*#1*{where}*5##")
-        message._human_readable_log = f"Requesting light/motion sensor {message._where}{message._interface_log_text} PIR sensitivity."
+        message._human_readable_log = lambda: f"Requesting light/motion sensor {message._where}{message._interface_log_text} PIR sensitivity."
         return message
 
     @classmethod
     def get_illuminance(cls, where):
         message = cls(f"*#1*{where}*6##")
-        message._human_readable_log = f"Requesting light/motion sensor {message._where}{message._interface_log_text} illuminance."
+        message._human_readable_log = lambda: f"Requesting light/motion sensor {message._where}{message._interface_log_text} illuminance."
         return message
 
     @classmethod
     def get_motion_timeout(cls, where):
         message = cls(f"*#1*{where}*7##")
-        message._human_readable_log = f"Requesting light/motion sensor {message._where}{message._interface_log_text} motion timeout."
+        message._human_readable_log = lambda: f"Requesting light/motion sensor {message._where}{message._interface_log_text} motion timeout."
         return message
 
     @classmethod
@@ -1704,27 +1723,27 @@ class OWNLightingCommand(OWNCommand):
             _freqency = 0.5
         _what = int((_freqency / 0.5) + 19)
         message = cls(f"*1*{_what}*{where}##")
-        message._human_readable_log = f"Flashing light {message._where}{message._interface_log_text} every {_freqency}s."
+        message._human_readable_log = lambda: f"Flashing light {message._where}{message._interface_log_text} every {_freqency}s."
         return message
 
     @classmethod
     def switch_on(cls, where, _transition=None):
         if _transition is not None and _transition >= 0 and _transition <= 255:
             message = cls(f"*1*1#{_transition}*{where}##")
-            message._human_readable_log = f"Switching ON light {message._where}{message._interface_log_text} with transition speed {_transition}."
+            message._human_readable_log = lambda: f"Switching ON light {message._where}{message._interface_log_text} with transition speed {_transition}."
         else:
             message = cls(f"*1*1*{where}##")
-            message._human_readable_log = f"Switching ON light or switch {message._where}{message._interface_log_text}."
+            message._human_readable_log = lambda: f"Switching ON light or switch {message._where}{message._interface_log_text}."
         return message
 
     @classmethod
     def switch_off(cls, where, _transition=None):
         if _transition is not None and _transition >= 0 and _transition <= 255:
             message = cls(f"*1*0#{_transition}*{where}##")
-            message._human_readable_log = f"Switching OFF light {message._where}{message._interface_log_text} with transition speed {_transition}."
+            message._human_readable_log = lambda: f"Switching OFF light {message._where}{message._interface_log_text} with transition speed {_transition}."
         else:
             message = cls(f"*1*0*{where}##")
-            message._human_readable_log = f"Switching OFF light or switch {message._where}{message._interface_log_text}."
+            message._human_readable_log = lambda: f"Switching OFF light or switch {message._where}{message._interface_log_text}."
         return message
 
     @classmethod
@@ -1732,7 +1751,7 @@ class OWNLightingCommand(OWNCommand):
         command_level = int(_level) + 100
         transition_speed = _transition if _transition >= 0 and _transition <= 255 else 0
         message = cls(f"*#1*{where}*#1*{command_level}*{transition_speed}##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Setting light {message._where}{message._interface_log_text} brightness to {_level}% with transition speed {transition_speed}."  # pylint: disable=line-too-long
             if transition_speed > 0
             else f"Setting light {message._where}{message._interface_log_text} brightness to {_level}%."
@@ -1744,7 +1763,7 @@ class OWNAutomationCommand(OWNCommand):
     @classmethod
     def status(cls, where):
         message = cls(f"*#2*{where}##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Requesting shutter {message._where}{message._interface_log_text} status."
         )
         return message
@@ -1752,7 +1771,7 @@ class OWNAutomationCommand(OWNCommand):
     @classmethod
     def raise_shutter(cls, where):
         message = cls(f"*2*1*{where}##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Raising shutter {message._where}{message._interface_log_text}."
         )
         return message
@@ -1760,7 +1779,7 @@ class OWNAutomationCommand(OWNCommand):
     @classmethod
     def lower_shutter(cls, where):
         message = cls(f"*2*2*{where}##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Lowering shutter {message._where}{message._interface_log_text}."
         )
         return message
@@ -1768,7 +1787,7 @@ class OWNAutomationCommand(OWNCommand):
     @classmethod
     def stop_shutter(cls, where):
         message = cls(f"*2*0*{where}##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Stoping shutter {message._where}{message._interface_log_text}."
         )
         return message
@@ -1776,7 +1795,7 @@ class OWNAutomationCommand(OWNCommand):
     @classmethod
     def set_shutter_level(cls, where, level=30):
         message = cls(f"*#2*{where}*#11#001*{level}##")
-        message._human_readable_log = f"Setting shutter {message._where}{message._interface_log_text} position to {level}%."
+        message._human_readable_log = lambda: f"Setting shutter {message._where}{message._interface_log_text} position to {level}%."
         return message
 
 
@@ -1784,13 +1803,13 @@ class OWNHeatingCommand(OWNCommand):
     @classmethod
     def status(cls, where):
         message = cls(f"*#4*{where}##")
-        message._human_readable_log = f"Requesting climate status update for {message._where}{message._interface_log_text}."
+        message._human_readable_log = lambda: f"Requesting climate status update for {message._where}{message._interface_log_text}."
         return message
 
     @classmethod
     def get_temperature(cls, where):
         message = cls(f"*#4*{where}*0##")
-        message._human_readable_log = f"Requesting climate status update for {message._where}{message._interface_log_text}."
+        message._human_readable_log = lambda: f"Requesting climate status update for {message._where}{message._interface_log_text}."
         return message
 
     @classmethod
@@ -1817,7 +1836,7 @@ class OWNHeatingCommand(OWNCommand):
             return None
 
         message = cls(f"*4*{mode}*{zone}##")
-        message._human_readable_log = f"Setting {zone_name} mode to '{mode_name}'."
+        message._human_readable_log = lambda: f"Setting {zone_name} mode to '{mode_name}'."
         return message
 
     @classmethod
@@ -1856,7 +1875,7 @@ class OWNHeatingCommand(OWNCommand):
             mode = 3
 
         message = cls(f"*#4*{zone}*#14*{temperature:04d}*{mode}##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Setting {zone_name} to {temperature_print}°C in mode '{mode_name}'."
         )
         return message
@@ -1874,7 +1893,7 @@ class OWNAVCommand(OWNCommand):
             return None
 
         message = cls(f"*7*0*{where}##")
-        message._human_readable_log = f"Opening video stream for camera {camera_id}."
+        message._human_readable_log = lambda: f"Opening video stream for camera {camera_id}."
         return message
 
     @classmethod
@@ -1916,7 +1935,7 @@ class OWNGatewayCommand(OWNCommand):
             self._time = datetime.time.fromisoformat(
                 f"{self._hour}:{self._minute}:{self._second}{self._timezone}"
             )
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Gateway broadcasting internal time: {self._time}."
             )
 
@@ -1927,7 +1946,7 @@ class OWNGatewayCommand(OWNCommand):
             self._date = datetime.date(
                 year=int(self._year), month=int(self._month), day=int(self._day)
             )
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Gateway broadcasting internal date: {self._date}."
             )
 
@@ -1950,7 +1969,7 @@ class OWNGatewayCommand(OWNCommand):
             self._datetime = datetime.datetime.fromisoformat(
                 f"{self._year}-{self._month}-{self._day}*{self._hour}:{self._minute}:{self._second}{self._timezone}"  # pylint: disable=line-too-long
             )
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Gateway broadcasting internal datetime: {self._datetime}."
             )
 
@@ -1966,7 +1985,7 @@ class OWNGatewayCommand(OWNCommand):
         message = cls(
             f"*#13**#22*{now.strftime('%H*%M*%S')}*{timezone_offset}*0{now.strftime('%w*%d*%m*%Y##')}"  # pylint: disable=line-too-long
         )
-        message._human_readable_log = f"Setting gateway time to: {message._datetime}."
+        message._human_readable_log = lambda: f"Setting gateway time to: {message._datetime}."
         return message
 
     @classmethod
@@ -1974,7 +1993,7 @@ class OWNGatewayCommand(OWNCommand):
         timezone = pytz.timezone(time_zone)
         now = timezone.localize(datetime.datetime.now())
         message = cls(f"*#13**#1*0{now.strftime('%w*%d*%m*%Y##')}")
-        message._human_readable_log = f"Setting gateway date to: {message._date}."
+        message._human_readable_log = lambda: f"Setting gateway date to: {message._date}."
         return message
 
     @classmethod
@@ -1987,7 +2006,7 @@ class OWNGatewayCommand(OWNCommand):
             else f"1{now.strftime('%z')[1:3]}"
         )
         message = cls(f"*#13**#0*{now.strftime('%H*%M*%S')}*{timezone_offset}*##")
-        message._human_readable_log = f"Setting gateway time to: {message._time}."
+        message._human_readable_log = lambda: f"Setting gateway time to: {message._time}."
         return message
 
 
@@ -1997,7 +2016,7 @@ class OWNEnergyCommand(OWNCommand):
         where = f"{where}#0" if str(where).startswith("7") else str(where)
         duration = 255 if duration > 255 else duration
         message = cls(f"*#18*{where}*#1200#1*{duration}##")
-        message._human_readable_log = f"Requesting instant power draw update from sensor {where} for {duration} minutes."  # pylint: disable=line-too-long
+        message._human_readable_log = lambda: f"Requesting instant power draw update from sensor {where} for {duration} minutes."  # pylint: disable=line-too-long
         return message
 
     @classmethod
@@ -2010,7 +2029,7 @@ class OWNEnergyCommand(OWNCommand):
         if date < one_year_ago:
             return None
         message = cls(f"*#18*{where}*511#{date.month}#{date.day}##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Requesting hourly power consumption from sensor {where} for {date}."
         )
         return message
@@ -2019,7 +2038,7 @@ class OWNEnergyCommand(OWNCommand):
     def get_partial_daily_consumption(cls, where):
         where = f"{where}#0" if str(where).startswith("7") else str(where)
         message = cls(f"*#18*{where}*54##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Requesting today's partial power consumption from sensor {where}."
         )
         return message
@@ -2039,14 +2058,14 @@ class OWNEnergyCommand(OWNCommand):
             message = cls(f"*18*510#{month}*{where}##")
         else:
             return None
-        message._human_readable_log = f"Requesting daily power consumption for {year}-{month} from sensor {where}."  # pylint: disable=line-too-long
+        message._human_readable_log = lambda: f"Requesting daily power consumption for {year}-{month} from sensor {where}."  # pylint: disable=line-too-long
         return message
 
     @classmethod
     def get_partial_monthly_consumption(cls, where):
         where = f"{where}#0" if str(where).startswith("7") else str(where)
         message = cls(f"*#18*{where}*53##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Requesting this month's partial power consumption from sensor {where}."
         )
         return message
@@ -2055,14 +2074,14 @@ class OWNEnergyCommand(OWNCommand):
     def get_monthly_consumption(cls, where, year, month):
         where = f"{where}#0" if str(where).startswith("7") else str(where)
         message = cls(f"*#18*{where}*52#{str(year)[2:]}#{month}##")
-        message._human_readable_log = f"Requesting monthly power consumption for {year}-{month} from sensor {where}."  # pylint: disable=line-too-long
+        message._human_readable_log = lambda: f"Requesting monthly power consumption for {year}-{month} from sensor {where}."  # pylint: disable=line-too-long
         return message
 
     @classmethod
     def get_total_consumption(cls, where):
         where = f"{where}#0" if str(where).startswith("7") else str(where)
         message = cls(f"*#18*{where}*51##")
-        message._human_readable_log = (
+        message._human_readable_log = lambda: (
             f"Requesting total power consumption from sensor {where}."
         )
         return message
@@ -2072,7 +2091,7 @@ class OWNDryContactCommand(OWNCommand):
     @classmethod
     def status(cls, where):
         message = cls(f"*#25*{where}##")
-        message._human_readable_log = f"Requesting dry contact {where} status."
+        message._human_readable_log = lambda: f"Requesting dry contact {where} status."
         return message
 
 
@@ -2102,14 +2121,14 @@ class OWNSignaling(OWNMessage):
             self._match = self._NONCE.match(self._raw)
             self._family = "SIGNALING"
             self._type = "NONCE"
-            self._human_readable_log = (
+            self._human_readable_log = lambda: (
                 f"Nonce challenge received: {self._match.group(1)}."
             )
         elif self._SHA.match(self._raw):
             self._match = self._SHA.match(self._raw)
             self._family = "SIGNALING"
             self._type = f"SHA{'-1' if self._match.group(1) == '1' else '-256'}"
-            self._human_readable_log = f"SHA{'-1' if self._match.group(1) == '1' else '-256'} challenge received."  # pylint: disable=line-too-long
+            self._human_readable_log = lambda: f"SHA{'-1' if self._match.group(1) == '1' else '-256'} challenge received."  # pylint: disable=line-too-long
         elif self._COMMAND_SESSION.match(self._raw):
             self._match = self._COMMAND_SESSION.match(self._raw)
             self._family = "SIGNALING"
@@ -2154,3 +2173,43 @@ class OWNSignaling(OWNMessage):
 
     def is_sha_256(self) -> bool:
         return self._type == "SHA-256"
+
+
+class OWNTranslation:
+    """
+    Lightweight marker of a command translation frame (WHAT 1000).
+    The event session returns it in place of the full event, so that these
+    frames are skipped without being decoded nor parsed. Its WHO and WHERE
+    are only parsed when asked for, e.g. by the event filters.
+    """
+
+    FRAME = re.compile(rb"^\*\d+\*1000[#*]")
+    _PARTS = re.compile(rb"^\*(?P<who>\d+)\*1000(?:#\d+)*\*(?P<where>\*|#?\d+)")
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, data: bytes):
+        self._raw = data
+
+    def __str__(self) -> str:
+        return self._raw.decode()
+
+    @property
+    def is_translation(self) -> bool:
+        return True
+
+    @property
+    def family(self) -> str:
+        return "COMMAND_TRANSLATION"
+
+    @property
+    def who(self) -> Optional[int]:
+        """The 'who' ID of the subject of this message, parsed on access"""
+        _match = self._PARTS.match(self._raw)
+        return int(_match.group("who")) if _match else None
+
+    @property
+    def where(self) -> Optional[str]:
+        """The 'where' ID of the subject of this message, parsed on access"""
+        _match = self._PARTS.match(self._raw)
+        return _match.group("where").decode() if _match else None
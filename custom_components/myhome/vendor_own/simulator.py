@@ -0,0 +1,365 @@
+""" Local OpenWebNet gateway simulator, to run sessions and benchmarks
+without BTicino hardware.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import re
+import secrets
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from .connection import OWNGateway, OWNSession
+
+LOGGER = logging.getLogger(__name__)
+
+ACK = "*#*1##"
+NACK = "*#*0##"
+
+AUTH_NONE = "none"
+AUTH_OPEN = "open"
+AUTH_SHA1 = "sha1"
+AUTH_SHA256 = "sha256"
+AUTH_METHODS = (AUTH_NONE, AUTH_OPEN, AUTH_SHA1, AUTH_SHA256)
+
+_COMMAND = re.compile(r"^\*(?P<who>\d+)\*(?P<what>\d+)(?:#\d+)*\*(?P<where>#?\d+)(?:#\d+)*##$")
+_STATUS_REQUEST = re.compile(r"^\*#(?P<who>\d+)\*(?P<where>#?\d+)(?:#\d+)*##$")
+_DIMENSION_REQUEST = re.compile(r"^\*#(?P<who>\d+)\*(?P<where>#?\d*)(?:#\d+)*\*(?P<dimension>\d+)##$")
+_BRIGHTNESS_WRITING = re.compile(r"^\*#1\*(?P<where>#?\d+)(?:#\d+)*\*#1\*(?P<level>\d+)\*(?P<speed>\d+)##$")
+_CLIENT_NONCE = re.compile(r"^\*#(?P<nonce>\d+)\*(?P<hash>\d+)##$")
+_PASSWORD = re.compile(r"^\*#(?P<password>\d+)##$")
+
+
+class OWNSimulatorFaults:
+    """Faults injected by the simulator on the frames of command sessions."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        drop_rate: float = 0.0,
+        reset_rate: float = 0.0,
+        nack_rate: float = 0.0,
+        max_sessions: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.reset_rate = reset_rate
+        self.nack_rate = nack_rate
+        self.max_sessions = max_sessions
+        self.random = random.Random(seed)
+
+
+class OWNSimulatedDevice:
+    def __init__(self, who: int, where: str):
+        self.who = who
+        self.where = where
+        self.what = "0"
+        self.level = None
+
+    @property
+    def area(self) -> Optional[int]:
+        if not self.where.isdigit() or len(self.where) not in (2, 4):
+            return None
+        return int(self.where[: len(self.where) // 2])
+
+
+class OWNSimulator:
+    """asyncio server behaving like an OpenWebNet gateway.
+
+    It implements the command (`*99*0##`) and event (`*99*1##`) session
+    handshakes with no authentication, OPEN password or SHA-1/SHA-256 HMAC
+    authentication, ACKs or NACKs commands, answers status requests from a
+    table of simulated devices and broadcasts the resulting state changes
+    to all the event sessions.
+    """
+
+    def __init__(
+        self,
+        password: Optional[str] = None,
+        auth: str = AUTH_SHA256,
+        devices: Iterable[str] = (),
+        groups: Optional[Dict[str, Iterable[str]]] = None,
+        faults: Optional[OWNSimulatorFaults] = None,
+        logger: logging.Logger = None,
+    ):
+        """Arguments:
+        password: gateway password, numeric for OPEN authentication
+        auth: one of AUTH_METHODS, ignored when there is no password
+        devices: addresses of the simulated devices, e.g. `1-12` or `2-41`
+        groups: members (e.g. `1-12`) of each group (e.g. `1-#3`)
+        faults: faults to inject
+        """
+        self.password = password
+        self.auth = auth if password is not None else AUTH_NONE
+        self.faults = faults or OWNSimulatorFaults()
+        self._logger = logger or LOGGER
+        self._helper = OWNSession(gateway=OWNGateway({"password": password}), logger=self._logger)
+
+        self.devices: Dict[str, OWNSimulatedDevice] = {}
+        for _device in devices:
+            _who, _, _where = _device.partition("-")
+            self.devices[_device] = OWNSimulatedDevice(int(_who), _where)
+        self.groups: Dict[str, Set[str]] = {_group: set(_members) for _group, _members in (groups or {}).items()}
+
+        self._server: asyncio.AbstractServer | None = None
+        self._sessions = 0
+        self._event_writers: Set[asyncio.StreamWriter] = set()
+
+        self.stats = {
+            "sessions": 0,
+            "refused_sessions": 0,
+            "frames_received": 0,
+            "frames_sent": 0,
+            "acks": 0,
+            "nacks": 0,
+            "drops": 0,
+            "resets": 0,
+        }
+
+    @property
+    def port(self) -> Optional[int]:
+        return self._server.sockets[0].getsockname()[1] if self._server else None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening, return the port (a free one if `port` is 0)."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._logger.info("Gateway simulator listening on %s:%s", host, self.port)
+        return self.port
+
+    async def stop(self) -> None:
+        for _writer in list(self._event_writers):
+            _writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def broadcast(self, frame: str) -> None:
+        """Send a frame to all the event sessions."""
+        for _writer in list(self._event_writers):
+            self._write(_writer, frame)
+
+    def _write(self, writer: asyncio.StreamWriter, frame: str) -> None:
+        if writer.is_closing():
+            return
+        writer.write(frame.encode())
+        self.stats["frames_sent"] += 1
+        self._logger.debug("TX: %s", frame)
+
+    async def _read(self, reader: asyncio.StreamReader) -> str:
+        _frame = (await reader.readuntil(OWNSession.SEPARATOR)).decode()
+        self.stats["frames_received"] += 1
+        self._logger.debug("RX: %s", _frame)
+        return _frame
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.faults.max_sessions is not None and self._sessions >= self.faults.max_sessions:
+            self.stats["refused_sessions"] += 1
+            self._write(writer, NACK)
+            writer.close()
+            return
+
+        self._sessions += 1
+        self.stats["sessions"] += 1
+        try:
+            self._write(writer, ACK)
+            _type = await self._read(reader)
+            if _type not in ("*99*0##", "*99*1##") or not await self._authenticate(reader, writer):
+                self._write(writer, NACK)
+                return
+            if _type == "*99*1##":
+                await self._serve_events(reader, writer)
+            else:
+                await self._serve_commands(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._sessions -= 1
+            self._event_writers.discard(writer)
+            writer.close()
+
+    async def _authenticate(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        if self.auth == AUTH_NONE:
+            self._write(writer, ACK)
+            return True
+
+        if self.auth == AUTH_OPEN:
+            _nonce = "".join(random.choices("0123456789", k=8))
+            self._write(writer, f"*#{_nonce}##")
+            _match = _PASSWORD.match(await self._read(reader))
+            if _match is None or int(_match.group("password")) != self._helper._get_own_password(self.password, _nonce):
+                return False
+            self._write(writer, ACK)
+            return True
+
+        self._write(writer, f"*98*{'1' if self.auth == AUTH_SHA1 else '2'}##")
+        if await self._read(reader) != ACK:
+            return False
+        _nonce_a = self._helper._hex_string_to_int_string(secrets.token_hex(20 if self.auth == AUTH_SHA1 else 32))
+        self._write(writer, f"*#{_nonce_a}##")
+        _match = _CLIENT_NONCE.match(await self._read(reader))
+        if _match is None:
+            return False
+        _nonce_b = _match.group("nonce")
+        if _match.group("hash") != self._helper._encode_hmac_password(self.auth, self.password, _nonce_a, _nonce_b):
+            return False
+        self._write(writer, f"*#{self._helper._decode_hmac_response(self.auth, self.password, _nonce_a, _nonce_b)}##")
+        return await self._read(reader) == ACK
+
+    async def _serve_events(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._event_writers.add(writer)
+        while True:
+            await self._read(reader)
+
+    async def _serve_commands(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            _frame = await self._read(reader)
+            _random = self.faults.random
+            if _random.random() < self.faults.reset_rate:
+                self.stats["resets"] += 1
+                writer.transport.abort()
+                return
+            if _random.random() < self.faults.drop_rate:
+                self.stats["drops"] += 1
+                continue
+            if self.faults.latency:
+                await asyncio.sleep(self.faults.latency)
+            if _random.random() < self.faults.nack_rate:
+                self._reply(writer, [], False)
+                continue
+            _replies = self._process(_frame)
+            self._reply(writer, _replies or [], _replies is not None)
+
+    def _reply(self, writer: asyncio.StreamWriter, frames: List[str], acked: bool) -> None:
+        for _frame in frames:
+            self._write(writer, _frame)
+        self._write(writer, ACK if acked else NACK)
+        self.stats["acks" if acked else "nacks"] += 1
+
+    def _targets(self, who: int, where: str) -> List[OWNSimulatedDevice]:
+        """Return the simulated devices addressed by a WHERE."""
+        if where == "0":
+            return [_device for _device in self.devices.values() if _device.who == who]
+        if where.startswith("#"):
+            return [self.devices[_member] for _member in self.groups.get(f"{who}-{where}", ()) if _member in self.devices]
+        if where in ("00", "10", "100") or len(where) == 1:
+            _area = 10 if where in ("10", "100") else int(where)
+            return [_device for _device in self.devices.values() if _device.who == who and _device.area == _area]
+        _device = self.devices.get(f"{who}-{where}")
+        return [_device] if _device is not None else []
+
+    def _process(self, frame: str) -> Optional[List[str]]:
+        """Apply a frame received on a command session, return the frames to
+        reply before the ACK, or None to NACK it."""
+        _match = _COMMAND.match(frame)
+        if _match is not None:
+            _who, _what, _where = int(_match.group("who")), _match.group("what"), _match.group("where")
+            _targets = self._targets(_who, _where)
+            if len(_targets) != 1 or _targets[0].where != _where:
+                self.broadcast(frame)
+            for _device in _targets:
+                _device.what = _what
+                self.broadcast(f"*{_who}*{_what}*{_device.where}##")
+            return []
+
+        _match = _BRIGHTNESS_WRITING.match(frame)
+        if _match is not None:
+            _level, _speed = int(_match.group("level")), _match.group("speed")
+            for _device in self._targets(1, _match.group("where")):
+                _device.level = _level - 100
+                _device.what = "1" if _device.level > 0 else "0"
+                self.broadcast(f"*#1*{_device.where}*1*{_level}*{_speed}##")
+            return []
+
+        _match = _STATUS_REQUEST.match(frame)
+        if _match is not None:
+            _who = int(_match.group("who"))
+            _replies = [f"*{_who}*{_device.what}*{_device.where}##" for _device in self._targets(_who, _match.group("where"))]
+            # Status replies are reported on the event sessions as well.
+            for _reply in _replies:
+                self.broadcast(_reply)
+            return _replies
+
+        _match = _DIMENSION_REQUEST.match(frame)
+        if _match is not None:
+            _who, _dimension = int(_match.group("who")), int(_match.group("dimension"))
+            if _who == 13 and _dimension == 0:
+                return [time.strftime("*#13**0*%H*%M*%S*001##")]
+            if _who == 1 and _dimension == 1:
+                return [
+                    f"*#1*{_device.where}*1*{_device.level + 100}*0##"
+                    for _device in self._targets(1, _match.group("where"))
+                    if _device.level is not None
+                ]
+            return []
+
+        return None
+
+
+async def main(arguments: argparse.Namespace) -> None:
+    """Run a simulator until interrupted."""
+    simulator = OWNSimulator(
+        password=arguments.password,
+        auth=arguments.auth,
+        devices=[_device for _device in arguments.devices.split(",") if _device],
+        groups={
+            _group.partition("=")[0]: [_member for _member in _group.partition("=")[2].split(",") if _member]
+            for _group in arguments.groups or []
+        },
+        faults=OWNSimulatorFaults(
+            latency=arguments.latency,
+            drop_rate=arguments.drop_rate,
+            reset_rate=arguments.reset_rate,
+            nack_rate=arguments.nack_rate,
+            max_sessions=arguments.max_sessions,
+            seed=arguments.seed,
+        ),
+    )
+    await simulator.start(arguments.host, arguments.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=20000, help="TCP port to listen on, default is 20000")
+    parser.add_argument("-P", "--password", type=str, help="Gateway password, none by default")
+    parser.add_argument("-a", "--auth", choices=AUTH_METHODS, default=AUTH_SHA256, help="Authentication method, default is sha256")
+    parser.add_argument(
+        "-d",
+        "--devices",
+        type=str,
+        default="1-11,1-12,1-21,2-41",
+        help="Comma separated simulated devices (WHO-WHERE)",
+    )
+    parser.add_argument(
+        "-g",
+        "--group",
+        dest="groups",
+        action="append",
+        help="Group and its members (WHO-#GROUP=WHO-WHERE,WHO-WHERE...), may be repeated",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each reply")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Share of commands left unanswered")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="Share of commands answered by a connection reset")
+    parser.add_argument("--nack-rate", type=float, default=0.0, help="Share of commands NACKed")
+    parser.add_argument("--max-sessions", type=int, help="Maximum number of concurrent sessions")
+    parser.add_argument("--seed", type=int, help="Seed of the fault injection")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every frame")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,113 @@
+"""Watchdog detecting an event session that silently stopped receiving."""
+import asyncio
+from collections import deque
+
+from .own_wrapper import OWNCommand
+from .const import LOGGER
+
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_PROBE_GRACE = 15
+DETECTION_HISTORY = 20
+
+# WHOs whose status replies the gateway also reports on the event session.
+PROBED_WHOS = ("1", "2")
+# Gateway time request, only sent when no lighting or automation point is
+# configured: its reply only reaches the command session.
+PROBE = "*#13**0##"
+
+
+class MyHOMEEventWatchdog:
+    """Probes the gateway when the event session has been silent for too long.
+
+    A connection that half-died (no FIN, no RST) leaves the event session
+    waiting forever. After `idle_timeout` seconds without any frame, the
+    status of a configured point is requested over the command path: the
+    gateway reports it on the event session too. If nothing is received on
+    the event session within `probe_grace` seconds, it is dropped so that it
+    reconnects. The ACK of the probe only proves that the command session is
+    alive, so it is not taken into account.
+
+    A longer `idle_timeout` means a slower detection, a shorter `probe_grace`
+    means more needless reconnections on a slow gateway. Both are reported:
+    `detection_latencies` holds how long the event session had been silent
+    when it was dropped, and `false_alarm_rate` the share of probes that
+    turned out to be unnecessary.
+    """
+
+    def __init__(self, hass, handler, idle_timeout: int = DEFAULT_IDLE_TIMEOUT, probe_grace: int = DEFAULT_PROBE_GRACE):
+        self._hass = hass
+        self._handler = handler
+        self.idle_timeout = idle_timeout
+        self.probe_grace = probe_grace
+        self._last_traffic = hass.loop.time()
+        self._task: asyncio.Task | None = None
+
+        self.probes_sent = 0
+        self.probes_answered = 0
+        self.reconnects = 0
+        self.detection_latencies = deque(maxlen=DETECTION_HISTORY)
+
+    @property
+    def enabled(self) -> bool:
+        return self.idle_timeout > 0
+
+    @property
+    def false_alarm_rate(self) -> float | None:
+        return self.probes_answered / self.probes_sent if self.probes_sent else None
+
+    def feed(self) -> None:
+        """Record that traffic was received on the event session."""
+        self._last_traffic = self._hass.loop.time()
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self.feed()
+        self._task = self._hass.loop.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _probe(self) -> OWNCommand:
+        """Status request of the first configured lighting or automation point."""
+        for _who in PROBED_WHOS:
+            _points = sorted(self._handler.group_index.members(f"{_who}-0"))
+            if _points:
+                return OWNCommand(f"*#{_who}*{_points[0].partition('-')[2]}##")
+        return OWNCommand(PROBE)
+
+    async def _run(self) -> None:
+        while True:
+            _idle = self._hass.loop.time() - self._last_traffic
+            if _idle < self.idle_timeout:
+                await asyncio.sleep(self.idle_timeout - _idle)
+                continue
+
+            _probe_time = self._hass.loop.time()
+            self.probes_sent += 1
+            LOGGER.debug(
+                "%s No traffic on the event session for %.0fs, probing the gateway.",
+                self._handler.log_id,
+                _idle,
+            )
+            await self._handler.send_status_request(self._probe())
+            await asyncio.sleep(max(0, _probe_time + self.probe_grace - self._hass.loop.time()))
+
+            if self._last_traffic >= _probe_time:
+                self.probes_answered += 1
+                # The gateway is alive, the bus is only quiet.
+                self.feed()
+                continue
+
+            _latency = self._hass.loop.time() - self._last_traffic
+            self.detection_latencies.append(_latency)
+            self.reconnects += 1
+            LOGGER.warning(
+                "%s Event session silent for %.0fs and probe unanswered on it, reconnecting it.",
+                self._handler.log_id,
+                _latency,
+            )
+            self._handler.drop_event_session()
+            self.feed()
@@ -0,0 +1 @@
+"""Tests for the MyHOME integration."""
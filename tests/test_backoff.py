@@ -0,0 +1,24 @@
+"""Tests of the reconnection backoff."""
+from custom_components.myhome.own_wrapper import OWNBackoff
+
+
+def test_delay_grows_up_to_the_ceiling():
+    _backoff = OWNBackoff(base=0.5, factor=2.0, ceiling=4.0, jitter=0)
+
+    assert [_backoff.delay(_attempt) for _attempt in range(6)] == [0.5, 1.0, 2.0, 4.0, 4.0, 4.0]
+
+
+def test_jitter_only_shortens_the_delay():
+    _backoff = OWNBackoff(base=1.0, factor=2.0, ceiling=30.0, jitter=0.5)
+
+    for _attempt in range(10):
+        _full_delay = min(30.0, 2.0**_attempt)
+        for _ in range(20):
+            assert _full_delay * 0.5 <= _backoff.delay(_attempt) <= _full_delay
+
+
+def test_long_outage_does_not_overflow():
+    _backoff = OWNBackoff(ceiling=30.0, jitter=0)
+
+    assert _backoff.delay(5000) == 30.0
+    assert _backoff.delay(10**9) == 30.0
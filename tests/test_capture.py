@@ -0,0 +1,179 @@
+"""Tests of the raw frame captures."""
+import pytest
+
+from custom_components.myhome.own_wrapper import OWNCommandSession, OWNGateway, SEND_ACK
+from custom_components.myhome.vendor_own.capture import (
+    MAGIC,
+    MAX_RING_FRAME_LENGTH,
+    REDACTED_FRAME,
+    RX,
+    TX,
+    OWNCaptureTee,
+    OWNFrameCapture,
+    OWNFrameRing,
+    capture_files,
+    read_capture,
+    redact_negotiation,
+)
+from custom_components.myhome.vendor_own.simulator import AUTH_SHA256, OWNSimulator
+
+
+def _write_capture(path: str, *records, **kwargs) -> OWNFrameCapture:
+    _capture = OWNFrameCapture(path, flush_interval=0, **kwargs)
+    _capture.start()
+    try:
+        for _record in records:
+            _capture.record(*_record)
+    finally:
+        _capture.close()
+    return _capture
+
+
+def test_write_and_read(tmp_path):
+    _path = str(tmp_path / "gateway.owncap")
+    _capture = _write_capture(
+        _path,
+        ("command", 1, TX, b"*1*1*11##"),
+        ("command", 1, RX, b"*#*1##"),
+        ("event", 2, RX, b"*1*1*11##"),
+    )
+
+    _frames = list(read_capture(_path))
+
+    assert [(_captured.session_type, _captured.session_id, _captured.direction, _captured.frame) for _captured in _frames] == [
+        ("command", 1, TX, b"*1*1*11##"),
+        ("command", 1, RX, b"*#*1##"),
+        ("event", 2, RX, b"*1*1*11##"),
+    ]
+    assert _frames[0].timestamp <= _frames[1].timestamp <= _frames[2].timestamp
+    assert _capture.frames == 3
+    assert not _capture.is_running
+
+
+def test_frames_not_recorded_once_closed(tmp_path):
+    _path = str(tmp_path / "gateway.owncap")
+    _capture = _write_capture(_path, ("event", 1, RX, b"*1*1*11##"))
+    _capture.record("event", 1, RX, b"*1*0*11##")
+
+    assert len(list(read_capture(_path))) == 1
+
+
+def test_frames_dropped_when_the_queue_is_full(tmp_path):
+    _path = str(tmp_path / "gateway.owncap")
+    _capture = OWNFrameCapture(_path, flush_interval=0, max_queued=2)
+    # Without the writer thread, nothing takes the frames off the queue.
+    _capture._thread = object()
+    for _where in range(11, 15):
+        _capture.record("event", 1, RX, f"*1*1*{_where}##".encode())
+
+    assert _capture.frames == 2
+    assert _capture.dropped == 2
+
+    _capture._thread = None
+    _capture.start()
+    _capture.close()
+
+    assert [_captured.frame for _captured in read_capture(_path)] == [b"*1*1*11##", b"*1*1*12##"]
+
+
+def test_rotation(tmp_path):
+    _path = str(tmp_path / "gateway.owncap")
+    _records = [("event", 1, RX, f"*1*1*{_where}##".encode()) for _where in range(10, 40)]
+    _capture = _write_capture(_path, *_records, max_bytes=64, backup_count=2)
+
+    _files = capture_files(_path)
+    _frames = [_captured.frame for _file in _files for _captured in read_capture(_file)]
+
+    assert _capture.rotations > 0
+    assert _files[-2:] == [f"{_path}.1", _path]
+    assert len(_files) <= 3
+    # Only the frames of the files kept are left, in order.
+    assert _frames == [_record[3] for _record in _records][-len(_frames) :]
+
+
+def test_not_a_capture(tmp_path):
+    _path = tmp_path / "gateway.owncap"
+    _path.write_bytes(b"*1*1*11##")
+
+    with pytest.raises(ValueError):
+        list(read_capture(str(_path)))
+
+
+def test_truncated_capture(tmp_path):
+    _path = str(tmp_path / "gateway.owncap")
+    _write_capture(_path, ("event", 1, RX, b"*1*1*11##"), ("event", 1, RX, b"*1*0*11##"))
+    with open(_path, "rb+") as _file:
+        _file.truncate(_file.seek(0, 2) - 3)
+
+    assert [_captured.frame for _captured in read_capture(_path)] == [b"*1*1*11##"]
+    assert open(_path, "rb").read(len(MAGIC)) == MAGIC
+
+
+def test_ring_keeps_the_last_frames():
+    _ring = OWNFrameRing(size=3)
+    for _where in range(11, 16):
+        _ring.record("event", 1, RX, f"*1*1*{_where}##".encode())
+
+    assert [_captured.frame for _captured in _ring.snapshot()] == [b"*1*1*13##", b"*1*1*14##", b"*1*1*15##"]
+    assert _ring.frames == 5
+
+
+def test_ring_as_dicts():
+    _ring = OWNFrameRing(size=3)
+    _ring.record("command", 7, TX, b"*1*1*11##")
+    _ring.record("command", 7, RX, b"*" * (MAX_RING_FRAME_LENGTH + 10))
+
+    _first, _second = _ring.as_dicts()
+
+    assert _first["direction"] == "TX"
+    assert _first["session"] == "command#7"
+    assert _first["frame"] == "*1*1*11##"
+    assert _second["direction"] == "RX"
+    assert len(_second["frame"]) == MAX_RING_FRAME_LENGTH
+
+
+def test_tee(tmp_path):
+    _path = str(tmp_path / "gateway.owncap")
+    _ring = OWNFrameRing(size=3)
+    _capture = OWNFrameCapture(_path, flush_interval=0)
+    _capture.start()
+    try:
+        OWNCaptureTee(_ring, _capture).record("event", 1, RX, b"*1*1*11##")
+    finally:
+        _capture.close()
+
+    assert [_captured.frame for _captured in _ring.snapshot()] == [b"*1*1*11##"]
+    assert [_captured.frame for _captured in read_capture(_path)] == [b"*1*1*11##"]
+
+
+def test_negotiation_secrets_redacted():
+    # Nonce, OPEN password and HMAC frames.
+    assert redact_negotiation(b"*#603356072##") == REDACTED_FRAME
+    assert redact_negotiation(b"*#25280520##") == REDACTED_FRAME
+    assert redact_negotiation(b"*#4871*99402##") == REDACTED_FRAME
+    # Handshake, ACK and status frames.
+    assert redact_negotiation(b"*99*0##") == b"*99*0##"
+    assert redact_negotiation(b"*98*2##") == b"*98*2##"
+    assert redact_negotiation(b"*#*1##") == b"*#*1##"
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_ring_of_a_negotiated_session():
+    _simulator = OWNSimulator(password="secret", auth=AUTH_SHA256, devices=("1-11",))
+    _port = await _simulator.start()
+    _session = OWNCommandSession(gateway=OWNGateway({"address": "127.0.0.1", "port": _port, "password": "secret"}))
+    _session.capture = OWNFrameRing()
+    try:
+        assert (await _session.connect())["Success"]
+        assert await _session.send_once("*#1*11##", is_status_request=True) == SEND_ACK
+    finally:
+        await _session.close()
+        await _simulator.stop()
+
+    _frames = [_captured.frame for _captured in _session.capture.snapshot()]
+
+    # The server nonce, the client nonce and HMAC, and the server HMAC.
+    assert _frames.count(REDACTED_FRAME) == 3
+    assert b"secret" not in b"".join(_frames)
+    # Status requests sent once negotiated are kept.
+    assert _frames[-3:] == [b"*#1*11##", b"*1*0*11##", b"*#*1##"]
@@ -0,0 +1,108 @@
+"""Tests of the coalescing of simultaneous point-to-point commands."""
+import asyncio
+
+from custom_components.myhome.coalescer import COALESCE_WINDOW, MyHOMECommandCoalescer
+from custom_components.myhome.groups import MyHOMEGroupIndex
+from custom_components.myhome.own_wrapper import OWNCommand
+
+
+def _new_coalescer(hass, queued: list) -> MyHOMECommandCoalescer:
+    _group_index = MyHOMEGroupIndex(hass, "entry", "[test]")
+    for _member in ("1-11", "1-12", "1-21", "1-22"):
+        _group_index.register_point(_member, "1", _member.partition("-")[2])
+    _group_index.declare("1-#3", "1-12")
+    _group_index.declare("1-#3", "1-22")
+    return MyHOMECommandCoalescer(hass, _group_index, queued.append, "[test]")
+
+
+def _task(hass, frame: str) -> dict:
+    return {"message": OWNCommand.parse(frame), "is_status_request": False, "future": hass.loop.create_future()}
+
+
+async def _offer(coalescer: MyHOMECommandCoalescer, *tasks: dict) -> None:
+    for _task in tasks:
+        assert coalescer.offer(_task)
+    await asyncio.sleep(COALESCE_WINDOW * 2)
+
+
+async def test_general_and_area_commands_not_coalesced(hass):
+    """Other actuators of the system or area may be missing from the configuration."""
+    _queued = []
+    _coalescer = _new_coalescer(hass, _queued)
+
+    await _offer(_coalescer, *[_task(hass, f"*1*1*{_where}##") for _where in ("11", "21")])
+
+    assert sorted(str(_task["message"]) for _task in _queued) == ["*1*1*11##", "*1*1*21##"]
+    assert _coalescer.commands_coalesced == 0
+
+
+async def test_learned_members_not_coalesced(hass):
+    _queued = []
+    _coalescer = _new_coalescer(hass, _queued)
+    _coalescer._group_index._learned["1-#4"] = {"1-11": 5, "1-21": 5}
+
+    await _offer(_coalescer, _task(hass, "*1*1*11##"), _task(hass, "*1*1*21##"))
+
+    assert sorted(str(_task["message"]) for _task in _queued) == ["*1*1*11##", "*1*1*21##"]
+
+
+async def test_group_command_and_leftovers(hass):
+    _queued = []
+    _coalescer = _new_coalescer(hass, _queued)
+
+    await _offer(_coalescer, *[_task(hass, f"*1*0*{_where}##") for _where in ("11", "12", "22")])
+
+    assert sorted(str(_task["message"]) for _task in _queued) == ["*1*0*#3##", "*1*0*11##"]
+    assert _coalescer.commands_coalesced == 2
+    assert _coalescer.frames_saved == 1
+
+
+async def test_group_command(hass):
+    _queued = []
+    _coalescer = _new_coalescer(hass, _queued)
+
+    await _offer(_coalescer, _task(hass, "*1*1*12##"), _task(hass, "*1*1*22##"))
+
+    assert [str(_task["message"]) for _task in _queued] == ["*1*1*#3##"]
+
+
+async def test_different_commands_not_coalesced(hass):
+    _queued = []
+    _coalescer = _new_coalescer(hass, _queued)
+
+    await _offer(_coalescer, _task(hass, "*1*1*11##"), _task(hass, "*1*0*12##"))
+
+    assert sorted(str(_task["message"]) for _task in _queued) == ["*1*0*12##", "*1*1*11##"]
+    assert _coalescer.commands_coalesced == 0
+
+
+async def test_repeated_command_queues_the_previous_one(hass):
+    _queued = []
+    _coalescer = _new_coalescer(hass, _queued)
+    _first = _task(hass, "*1*1*11##")
+
+    assert _coalescer.offer(_first)
+    assert _coalescer.offer(_task(hass, "*1*1*11##"))
+    assert _queued == [_first]
+    await asyncio.sleep(COALESCE_WINDOW * 2)
+    assert len(_queued) == 2
+
+
+async def test_other_commands_not_taken(hass):
+    _coalescer = _new_coalescer(hass, [])
+
+    assert not _coalescer.offer(_task(hass, "*1*1*0##"))
+    assert not _coalescer.offer(_task(hass, "*1*1*11#4#01##"))
+    assert not _coalescer.offer(_task(hass, "*#1*11##"))
+    assert not _coalescer.offer(_task(hass, "*2*1*#3##"))
+
+
+async def test_group_frame_lists_the_coalesced_tasks(hass):
+    _queued = []
+    _coalescer = _new_coalescer(hass, _queued)
+    _tasks = [_task(hass, "*1*1*12##"), _task(hass, "*1*1*22##")]
+
+    await _offer(_coalescer, *_tasks)
+
+    assert _queued[0]["coalesced"] == _tasks
+    assert _queued[0]["future"] is None
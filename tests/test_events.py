@@ -0,0 +1,153 @@
+"""Tests of the filtering, rate limiting and batching of the message events."""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events, async_fire_time_changed
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.myhome.events import (
+    BATCH_EVENT,
+    MESSAGE_EVENT,
+    MyHOMEEventFilter,
+    MyHOMEEventRule,
+    parse_event_filters,
+)
+from custom_components.myhome.own_wrapper import OWNMessage, OWNTranslation
+
+
+def _handle(event_filter: MyHOMEEventFilter, *frames: str) -> None:
+    for _frame in frames:
+        event_filter.handle(OWNMessage.parse(_frame) or _frame)
+
+
+def test_parse_event_filters():
+    assert parse_event_filters("") == []
+    assert parse_event_filters("who=1 where=2 family=event rate=5; who=4\nfamily=command") == [
+        MyHOMEEventRule(1, "2", "event", 5),
+        MyHOMEEventRule(4, None, None, None),
+        MyHOMEEventRule(None, None, "command", None),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["who", "who=", "who=1 who=2", "what=1", "family=status", "who=light", "rate=fast"],
+)
+def test_invalid_event_filters(text):
+    with pytest.raises(ValueError):
+        parse_event_filters(text)
+
+
+async def test_every_message_fired_without_rules(hass):
+    _events = async_capture_events(hass, MESSAGE_EVENT)
+    _event_filter = MyHOMEEventFilter(hass, "192.168.1.35")
+
+    _handle(_event_filter, "*1*1*11##", "*#13**0*10*25*31*001##", "not a frame")
+    await hass.async_block_till_done()
+
+    assert len(_events) == 3
+    assert _events[0].data["gateway"] == "192.168.1.35"
+    assert _events[2].data == {"gateway": "192.168.1.35", "message": "not a frame"}
+    assert _event_filter.fired == 3
+
+
+async def test_rules(hass):
+    _events = async_capture_events(hass, MESSAGE_EVENT)
+    _event_filter = MyHOMEEventFilter(hass, "192.168.1.35", parse_event_filters("who=1 where=1 family=event; who=4"))
+
+    _handle(
+        _event_filter,
+        "*1*1*11##",
+        "*1*1*21##",
+        "*1*1*1##",
+        "*#4*1*0*0215##",
+        "*2*0*11##",
+        # A message without WHERE does not match a WHERE prefix.
+        "*#13**0*10*25*31*001##",
+        "not a frame",
+    )
+    await hass.async_block_till_done()
+
+    assert _event_filter.fired == 3
+    assert _event_filter.filtered == 4
+    assert len(_events) == 3
+
+
+async def test_command_translations(hass):
+    _events = async_capture_events(hass, MESSAGE_EVENT)
+    _event_filter = MyHOMEEventFilter(hass, "192.168.1.35", parse_event_filters("who=1 where=11 family=command_translation"))
+
+    _event_filter.handle(OWNTranslation(b"*1*1000#1*11##"))
+    _event_filter.handle(OWNTranslation(b"*1*1000#1*12##"))
+    _handle(_event_filter, "*1*1*11##")
+    await hass.async_block_till_done()
+
+    assert [_event.data for _event in _events] == [
+        {
+            "gateway": "192.168.1.35",
+            "message": "*1*1000#1*11##",
+            "family": "Command translation",
+            "type": "Status",
+            "who": 1,
+            "where": "11",
+            "what": 1000,
+            "what parameters": ["1"],
+        }
+    ]
+    assert _event_filter.filtered == 2
+
+
+def test_translation_parts():
+    _translation = OWNTranslation(b"*2*1000#1*#3##")
+
+    assert _translation.family == "COMMAND_TRANSLATION"
+    assert _translation.who == 2
+    assert _translation.where == "#3"
+    assert OWNTranslation(b"*1*1000*11##").where == "11"
+
+
+async def test_rate_limit(hass):
+    _events = async_capture_events(hass, MESSAGE_EVENT)
+    _event_filter = MyHOMEEventFilter(hass, "192.168.1.35", parse_event_filters("who=1 rate=2"))
+
+    with patch("custom_components.myhome.events.time.monotonic") as _monotonic:
+        _monotonic.return_value = 1000.0
+        _handle(_event_filter, "*1*1*11##", "*1*1*12##", "*1*1*13##")
+        _monotonic.return_value = 1001.0
+        _handle(_event_filter, "*1*1*14##")
+    await hass.async_block_till_done()
+
+    assert len(_events) == 3
+    assert _event_filter.rate_limited == 1
+
+
+async def test_batches(hass):
+    _events = async_capture_events(hass, MESSAGE_EVENT)
+    _batches = async_capture_events(hass, BATCH_EVENT)
+    _event_filter = MyHOMEEventFilter(hass, "192.168.1.35", batch_interval=1)
+
+    _handle(_event_filter, "*1*1*11##", "*1*0*12##")
+    await hass.async_block_till_done()
+    assert _batches == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    assert _events == []
+    assert len(_batches) == 1
+    assert _batches[0].data["gateway"] == "192.168.1.35"
+    assert [_message["message"] for _message in _batches[0].data["messages"]] == ["*1*1*11##", "*1*0*12##"]
+
+
+async def test_flush(hass):
+    _batches = async_capture_events(hass, BATCH_EVENT)
+    _event_filter = MyHOMEEventFilter(hass, "192.168.1.35", batch_interval=60)
+
+    _handle(_event_filter, "*1*1*11##")
+    _event_filter.flush()
+    _event_filter.flush()
+    await hass.async_block_till_done()
+
+    assert len(_batches) == 1
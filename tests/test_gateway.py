@@ -0,0 +1,137 @@
+"""Tests of the gateway handler."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.const import (
+    CONF_FRIENDLY_NAME,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_PORT,
+)
+
+from custom_components.myhome.coalescer import COALESCE_WINDOW
+from custom_components.myhome.connection_manager import DEFAULT_SESSION_BUDGET
+from custom_components.myhome.const import (
+    CONF_DEVICE_TYPE,
+    CONF_FIRMWARE,
+    CONF_MANUFACTURER,
+    CONF_MANUFACTURER_URL,
+    CONF_PLATFORMS,
+    CONF_SSDP_LOCATION,
+    CONF_SSDP_ST,
+    CONF_UDN,
+    DOMAIN,
+)
+from custom_components.myhome.gateway import MyHOMEGatewayHandler
+from custom_components.myhome.own_wrapper import OWNCommand
+
+MAC = "00:03:50:00:12:34"
+
+
+def _new_handler(hass, **kwargs) -> MyHOMEGatewayHandler:
+    hass.data.setdefault(DOMAIN, {})[MAC] = {CONF_PLATFORMS: {}}
+    _entry = SimpleNamespace(
+        entry_id="entry",
+        data={
+            CONF_HOST: "127.0.0.1",
+            CONF_PORT: 20000,
+            CONF_PASSWORD: "12345",
+            CONF_SSDP_LOCATION: None,
+            CONF_SSDP_ST: None,
+            CONF_DEVICE_TYPE: None,
+            CONF_FRIENDLY_NAME: "Gateway",
+            CONF_MANUFACTURER: "BTicino S.p.A.",
+            CONF_MANUFACTURER_URL: None,
+            CONF_NAME: "F454",
+            CONF_FIRMWARE: None,
+            CONF_MAC: MAC,
+            CONF_UDN: None,
+        },
+        options={},
+    )
+    return MyHOMEGatewayHandler(hass=hass, config_entry=_entry, watchdog_idle_timeout=0, **kwargs)
+
+
+async def test_session_budget_fits_the_workers(hass):
+    assert _new_handler(hass).connection_manager.session_budget == DEFAULT_SESSION_BUDGET
+    # The event session and one session per command worker.
+    assert _new_handler(hass, command_worker_count=10).connection_manager.session_budget == 11
+
+
+async def _coalesced(hass, handler: MyHOMEGatewayHandler, *wheres: str):
+    """Send the same command to points of group `#3`, return the calls and the group task."""
+    for _where in wheres:
+        handler.group_index.declare("1-#3", f"1-{_where}")
+    _sends = [
+        hass.async_create_task(handler.send(OWNCommand.parse(f"*1*1*{_where}##"), wait_for_ack=True))
+        for _where in wheres
+    ]
+    await asyncio.sleep(COALESCE_WINDOW * 2)
+    return _sends, handler.send_buffer.get_nowait()
+
+
+async def test_coalesced_commands_resolved(hass):
+    _handler = _new_handler(hass, coalesce_commands=True)
+    _sends, _task = await _coalesced(hass, _handler, "12", "22")
+
+    assert str(_task["message"]) == "*1*1*#3##"
+    _handler._enqueue(_task)
+    assert all(_trace.queued is not None for _trace in _handler._traces(_task))
+    assert len(_handler._traces(_task)) == 2
+
+    _handler._resolve_task(_task, True)
+    assert await asyncio.gather(*_sends) == [True, True]
+    assert _handler._latest_tasks == {}
+
+
+async def test_coalesced_commands_retried_point_to_point(hass):
+    _handler = _new_handler(hass, coalesce_commands=True)
+    _sends, _task = await _coalesced(hass, _handler, "12", "22")
+    _task["attempt"] = 2
+    # A newer command to one of the points supersedes its part of the group frame.
+    await _handler.send(OWNCommand.parse("*1*0*12##"))
+    await asyncio.sleep(COALESCE_WINDOW * 2)
+    assert str(_handler.send_buffer.get_nowait()["message"]) == "*1*0*12##"
+
+    _handler._requeue(_task)
+
+    assert await _sends[0] is False
+    _retried = _handler.send_buffer.get_nowait()
+    assert str(_retried["message"]) == "*1*1*22##"
+    assert _retried["attempt"] == 2
+    _handler._resolve_task(_retried, True)
+    assert await _sends[1] is True
+
+
+async def test_queued_commands_failed_when_the_workers_stop(hass):
+    _handler = _new_handler(hass)
+    _handler.connection_manager.acquire = AsyncMock(return_value=MagicMock(auth_failed=True))
+    _handler.connection_manager.release = AsyncMock()
+    _send = hass.async_create_task(_handler.send(OWNCommand.parse("*1*1*11##"), wait_for_ack=True))
+    await asyncio.sleep(0)
+
+    _handler.sending_workers.append(hass.loop.create_task(_handler.sending_loop(0)))
+    await asyncio.wait(_handler.sending_workers)
+
+    assert await _send is False
+    assert await _handler.send(OWNCommand.parse("*1*1*11##"), wait_for_ack=True) is False
+    assert await _handler.send_status_request(OWNCommand.parse("*#1*11##"), wait_for_ack=True) is False
+
+
+async def test_pending_status_request_awaited(hass):
+    _handler = _new_handler(hass)
+    _requests = [
+        hass.async_create_task(_handler.send_status_request(OWNCommand.parse("*#1*11##"), wait_for_ack=_wait))
+        for _wait in (False, True, True)
+    ]
+    await asyncio.sleep(0)
+
+    _task = _handler.send_buffer.get_nowait()
+    assert _handler.send_buffer.empty()
+    _handler._resolve_task(_task, True)
+
+    assert await asyncio.gather(*_requests) == [None, True, True]
+    assert _handler._pending_status_requests == {}
@@ -0,0 +1,99 @@
+"""Tests of the group and area membership index."""
+from unittest.mock import patch
+
+from custom_components.myhome.groups import (
+    LEARNING_THRESHOLD,
+    LEARNING_WINDOW,
+    MyHOMEGroupIndex,
+    is_multipoint_address,
+)
+from custom_components.myhome.own_wrapper import OWNMessage
+
+
+def _index(hass) -> MyHOMEGroupIndex:
+    _group_index = MyHOMEGroupIndex(hass, "entry", "[test]")
+    for _member in ("1-11", "1-12", "1-21", "1-22"):
+        _group_index.register_point(_member, "1", _member.partition("-")[2])
+    return _group_index
+
+
+def _observe(group_index: MyHOMEGroupIndex, *frames: str) -> None:
+    for _frame in frames:
+        group_index.observe(OWNMessage.parse(_frame))
+
+
+def test_multipoint_addresses():
+    assert is_multipoint_address("#3")
+    assert is_multipoint_address("0")
+    assert is_multipoint_address("5")
+    assert is_multipoint_address("100")
+    assert not is_multipoint_address("12")
+    # Area 10 is `100`, `10` is the point 0 of area 1.
+    assert not is_multipoint_address("10")
+    assert not is_multipoint_address("0512")
+
+
+async def test_area_and_general_members(hass):
+    _group_index = _index(hass)
+
+    assert _group_index.area_of("1-21") == 2
+    assert _group_index.members("1-1") == {"1-11", "1-12"}
+    assert _group_index.members("1-2") == {"1-21", "1-22"}
+    assert _group_index.members("1-0") == {"1-11", "1-12", "1-21", "1-22"}
+    assert _group_index.members("2-0") == set()
+
+    _group_index.register_point("1-1001", "1", "1001")
+    _group_index.register_point("1-10", "1", "10")
+    assert _group_index.members("1-100") == {"1-1001"}
+    assert _group_index.members("1-10") == set()
+    assert "1-10" in _group_index.members("1-1")
+
+
+async def test_declared_members(hass):
+    _group_index = _index(hass)
+    _group_index.declare("1-#3", "1-11")
+    _group_index.declare("1-#3", "1-21")
+
+    assert _group_index.groups("1") == {"1-#3"}
+    assert _group_index.groups("2") == set()
+    assert _group_index.members("1-#3") == {"1-11", "1-21"}
+
+
+async def test_members_learned_after_threshold(hass):
+    _group_index = _index(hass)
+
+    with patch.object(_group_index._store, "async_delay_save") as _save:
+        for _ in range(LEARNING_THRESHOLD):
+            assert _group_index.members("1-#3") == set()
+            # 1-12 reports another state, it did not follow the group command.
+            _observe(_group_index, "*1*1*#3##", "*1*1*11##", "*1*1*22##", "*1*0*12##")
+        # The window of the last group command is closed by the next one.
+        _observe(_group_index, "*1*0*#4##")
+
+    assert _group_index.members("1-#3") == {"1-11", "1-22"}
+    assert _save.called
+
+
+async def test_updates_outside_the_window_are_not_learned(hass):
+    _group_index = _index(hass)
+
+    with patch("custom_components.myhome.groups.time.monotonic") as _monotonic:
+        for _ in range(LEARNING_THRESHOLD):
+            _monotonic.return_value = 1000.0
+            _observe(_group_index, "*1*1*#3##")
+            _monotonic.return_value = 1000.0 + LEARNING_WINDOW + 1
+            _observe(_group_index, "*1*1*11##")
+
+    assert _group_index.members("1-#3") == set()
+
+
+async def test_learned_members_restored(hass, hass_storage):
+    hass_storage["myhome.entry.groups"] = {
+        "version": 1,
+        "key": "myhome.entry.groups",
+        "data": {"learned": {"1-#3": {"1-11": LEARNING_THRESHOLD, "1-12": 1}}},
+    }
+    _group_index = _index(hass)
+    await _group_index.async_load()
+
+    assert _group_index.members("1-#3") == {"1-11"}
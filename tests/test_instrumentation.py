@@ -0,0 +1,120 @@
+"""Tests of the command latency tracer."""
+import time
+from unittest.mock import patch
+
+from custom_components.myhome.instrumentation import (
+    MAX_PENDING_TRACES,
+    TRACE_TIMEOUT,
+    MyHOMECommandTracer,
+    MyHOMEHistogram,
+)
+from custom_components.myhome.own_wrapper import OWNCommand, OWNMessage
+
+
+def _sent(tracer: MyHOMECommandTracer, frame: str):
+    _trace = tracer.start(OWNCommand.parse(frame))
+    _trace.queued = _trace.dequeued = _trace.written = time.perf_counter()
+    tracer.ack(_trace)
+    return _trace
+
+
+def test_command_types():
+    _tracer = MyHOMECommandTracer()
+
+    assert _tracer.start(OWNCommand.parse("*1*1*11##")).command_type == "1*1"
+    assert _tracer.start(OWNCommand.parse("*1*1*11##")).key == (1, "11")
+    assert _tracer.start(OWNCommand.parse("*2*0*#3##")).key == (2, "#3")
+    assert _tracer.start(OWNCommand.parse("*#1*11*#1*150*0##")).command_type == "1*#1"
+    assert _tracer.start(OWNCommand.parse("*#1*11##")) is None
+
+    _tracer.enabled = False
+    assert _tracer.start(OWNCommand.parse("*1*1*11##")) is None
+
+
+def test_confirmed_by_the_bus_event():
+    _tracer = MyHOMECommandTracer()
+    _sent(_tracer, "*1*1*11##")
+
+    # An event for another light does not confirm the command.
+    _tracer.confirm(OWNMessage.parse("*1*1*12##"))
+    assert _tracer.pending
+    _tracer.confirm(OWNMessage.parse("*1*1*11##"))
+
+    assert not _tracer.pending
+    assert _tracer.confirmed == 1
+    assert list(_tracer.as_dict()["commands"]["1*1"]) == ["queue", "write", "ack", "confirm", "total"]
+
+
+def test_confirmed_by_the_requested_state():
+    _tracer = MyHOMECommandTracer()
+    _on = _sent(_tracer, "*1*1*11##")
+    _off = _sent(_tracer, "*1*0*11##")
+    _brightness = _sent(_tracer, "*#1*12*#1*150*0##")
+    _down = _sent(_tracer, "*2*2*21##")
+
+    _tracer.confirm(OWNMessage.parse("*1*0*11##"))
+    assert _off.done and not _on.done
+    _tracer.confirm(OWNMessage.parse("*1*0*12##"))
+    assert not _brightness.done
+    _tracer.confirm(OWNMessage.parse("*#1*12*1*150*0##"))
+    assert _brightness.done
+    _tracer.confirm(OWNMessage.parse("*2*0*21##"))
+    assert not _down.done
+    _tracer.confirm(OWNMessage.parse("*2*2*21##"))
+    assert _down.done
+
+    assert _tracer.confirmed == 3
+    assert _tracer.pending
+
+
+def test_segments_of_unstamped_traces_skipped():
+    """A command requeued for a retry is traced from its last attempt only."""
+    _tracer = MyHOMECommandTracer()
+    _trace = _tracer.start(OWNCommand.parse("*1*1*11##"))
+    _trace.written = time.perf_counter()
+    _tracer.ack(_trace)
+
+    _tracer.confirm(OWNMessage.parse("*1*1*11##"))
+
+    assert list(_tracer.as_dict()["commands"]["1*1"]) == ["ack", "confirm", "total"]
+
+
+def test_failed_commands():
+    _tracer = MyHOMECommandTracer()
+    _tracer.fail(_tracer.start(OWNCommand.parse("*1*1*11##")))
+
+    assert _tracer.failed == 1
+    assert not _tracer.pending
+
+
+def test_unconfirmed_commands_expire():
+    _tracer = MyHOMECommandTracer()
+    _sent(_tracer, "*1*1*11##")
+
+    with patch("custom_components.myhome.instrumentation.time.perf_counter", return_value=time.perf_counter() + TRACE_TIMEOUT + 1):
+        _sent(_tracer, "*1*1*12##")
+
+    assert _tracer.unconfirmed == 1
+    _tracer.confirm(OWNMessage.parse("*1*1*11##"))
+    assert _tracer.confirmed == 0
+
+
+def test_pending_traces_bounded():
+    _tracer = MyHOMECommandTracer()
+    for _ in range(MAX_PENDING_TRACES + 10):
+        _sent(_tracer, "*1*1*11##")
+
+    assert _tracer.unconfirmed == 10
+    assert len(_tracer._awaiting[(1, "11")]) == MAX_PENDING_TRACES
+
+
+def test_histogram_percentiles():
+    _histogram = MyHOMEHistogram()
+    assert _histogram.percentile(0.5) is None
+
+    for _duration in (0.001, 0.002, 0.003, 0.004, 0.2):
+        _histogram.add(_duration)
+
+    assert _histogram.percentile(0.5) == 0.005
+    assert _histogram.percentile(0.99) == 0.2
+    assert _histogram.as_dict()["count"] == 5
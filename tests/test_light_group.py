@@ -0,0 +1,47 @@
+"""Tests of the local update of the members of light groups."""
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.myhome.light import MyHOMELightGroup
+
+
+def _new_group(hass, acked: bool) -> MyHOMELightGroup:
+    _gateway = MagicMock(mac="00:03:50:00:12:34", unique_id="00:03:50:00:12:34")
+    _gateway.send = AsyncMock(return_value=acked)
+    _group = MyHOMELightGroup(
+        hass=hass,
+        name="Ground floor",
+        entity_name=None,
+        icon=None,
+        icon_on=None,
+        device_id="1-1",
+        who="1",
+        where="1",
+        interface=None,
+        dimmable=False,
+        manufacturer=None,
+        model=None,
+        gateway=_gateway,
+    )
+    _group.handle_event = MagicMock()
+    return _group
+
+
+async def test_members_updated_once_acked(hass):
+    _group = _new_group(hass, acked=True)
+
+    await _group.async_turn_on()
+    await _group.async_turn_off()
+
+    assert _group._gateway_handler.send.call_args.kwargs == {"wait_for_ack": True}
+    assert [str(_call.args[1]) for _call in _group._gateway_handler.update_members.call_args_list] == ["*1*1*1##", "*1*0*1##"]
+
+
+async def test_members_not_updated_when_not_acked(hass):
+    _group = _new_group(hass, acked=False)
+
+    await _group.async_turn_on()
+    await _group.async_turn_off()
+
+    assert _group._gateway_handler.send.await_count == 2
+    _group._gateway_handler.update_members.assert_not_called()
+    _group.handle_event.assert_not_called()
@@ -0,0 +1,26 @@
+"""Tests of the rate limited logging of the messages."""
+import logging
+
+from custom_components.myhome.log_sampling import MyHOMEEventLogger
+from custom_components.myhome.own_wrapper import OWNMessage
+
+
+def _log(event_log: MyHOMEEventLogger, count: int) -> None:
+    for _where in range(11, 11 + count):
+        event_log.log(OWNMessage.parse(f"*1*1*{_where}##"))
+
+
+def test_every_message_logged_by_default(caplog):
+    caplog.set_level(logging.INFO, logger="custom_components.myhome")
+
+    _log(MyHOMEEventLogger("[test]"), 20)
+
+    assert len(caplog.records) == 20
+
+
+def test_rate_limit(caplog):
+    caplog.set_level(logging.INFO, logger="custom_components.myhome")
+
+    _log(MyHOMEEventLogger("[test]", rate_limit=5), 20)
+
+    assert len(caplog.records) == 5
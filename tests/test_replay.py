@@ -0,0 +1,71 @@
+"""Tests of the replay of captured gateway traffic."""
+from custom_components.myhome.replay import MyHOMEReplay, diff_states
+from custom_components.myhome.vendor_own.capture import RX, TX, OWNFrameCapture, read_capture
+
+CONFIG = """
+gateway:
+  mac: 00:03:50:00:12:34
+  light:
+    kitchen:
+      where: 11
+      name: Kitchen
+    living:
+      where: 12
+      name: Living room
+      dimmable: true
+"""
+
+
+def _write_capture(path: str, *records) -> None:
+    _capture = OWNFrameCapture(path, flush_interval=0)
+    _capture.start()
+    try:
+        for _record in records:
+            _capture.record(*_record)
+    finally:
+        _capture.close()
+
+
+async def _replay(tmp_path, *records) -> dict:
+    _config = tmp_path / "myhome.yaml"
+    _config.write_text(CONFIG)
+    _path = str(tmp_path / "gateway.owncap")
+    _write_capture(_path, *records)
+
+    _replay = MyHOMEReplay(str(_config))
+    await _replay.async_setup()
+    try:
+        return await _replay.async_run(read_capture(_path))
+    finally:
+        await _replay.handler.close_capture()
+
+
+async def test_replay(tmp_path):
+    _report = await _replay(
+        tmp_path,
+        # Negotiation of the event session.
+        ("event", 1, RX, b"*#*1##"),
+        ("event", 1, TX, b"*99*1##"),
+        ("event", 1, RX, b"*#*1##"),
+        ("event", 1, RX, b"*1*1*11##"),
+        ("event", 1, RX, b"*1*0*12##"),
+        ("event", 1, RX, b"*1*1*12##"),
+        # Frames of other sessions are not replayed.
+        ("command", 2, RX, b"*1*0*11##"),
+    )
+
+    assert _report["frames"] == 3
+    assert _report["parse_failures"] == 0
+    assert {_entity: _state["state"] for _entity, _state in _report["final_states"].items()} == {
+        "00:03:50:00:12:34-1-11": "on",
+        "00:03:50:00:12:34-1-12": "on",
+    }
+    assert len(_report["transitions"]) == 3
+
+
+async def test_diff_states(tmp_path):
+    _before = await _replay(tmp_path, ("event", 1, RX, b"*1*1*11##"))
+    _after = await _replay(tmp_path, ("event", 1, RX, b"*1*1*11##"), ("event", 1, RX, b"*1*0*11##"))
+
+    assert diff_states(_before, _before) == {}
+    assert list(diff_states(_before, _after)) == ["00:03:50:00:12:34-1-11"]
@@ -0,0 +1,54 @@
+"""Tests of the retry policy of the queued commands."""
+from custom_components.myhome.own_wrapper import (
+    OWNBackoff,
+    OWNCommand,
+    SEND_ACK,
+    SEND_ERROR,
+    SEND_NACK,
+    SEND_RESET,
+    SEND_TIMEOUT,
+)
+from custom_components.myhome.retry import MyHOMERetryPolicy
+
+
+def _task(frame: str, is_status_request: bool = False, attempt: int = 1) -> dict:
+    return {"message": OWNCommand.parse(frame), "is_status_request": is_status_request, "attempt": attempt}
+
+
+def test_retryable_outcomes():
+    _policy = MyHOMERetryPolicy()
+
+    for _outcome in (SEND_NACK, SEND_RESET, SEND_TIMEOUT):
+        assert _policy.should_retry(_task("*1*1*11##"), _outcome)
+    for _outcome in (SEND_ACK, SEND_ERROR):
+        assert not _policy.should_retry(_task("*1*1*11##"), _outcome)
+
+
+def test_nacked_status_request_not_retried():
+    _policy = MyHOMERetryPolicy()
+
+    assert not _policy.should_retry(_task("*#1*11##", is_status_request=True), SEND_NACK)
+    assert _policy.should_retry(_task("*#1*11##", is_status_request=True), SEND_TIMEOUT)
+
+
+def test_attempts_exhausted():
+    _policy = MyHOMERetryPolicy(max_attempts=3)
+
+    assert _policy.should_retry(_task("*1*1*11##", attempt=2), SEND_NACK)
+    assert not _policy.should_retry(_task("*1*1*11##", attempt=3), SEND_NACK)
+
+
+def test_delay_grows_with_the_attempts():
+    _policy = MyHOMERetryPolicy(backoff=OWNBackoff(base=0.2, ceiling=1.0, jitter=0))
+
+    assert _policy.delay(_task("*1*1*11##", attempt=1)) == 0.2
+    assert _policy.delay(_task("*1*1*11##", attempt=2)) == 0.4
+    assert _policy.delay(_task("*1*1*11##", attempt=5)) == 1.0
+
+
+def test_supersede_key():
+    assert MyHOMERetryPolicy.supersede_key(_task("*#1*11##", is_status_request=True)) == ("status", "*#1*11##")
+    assert MyHOMERetryPolicy.supersede_key(_task("*1*1*11##")) == ("light", "11")
+    assert MyHOMERetryPolicy.supersede_key(_task("*1*0*11#4#01##")) == ("light", "11#4#01")
+    assert MyHOMERetryPolicy.supersede_key(_task("*#1*11*#1*150*0##")) == ("light", "11")
+    assert MyHOMERetryPolicy.supersede_key(_task("*2*1*21##")) is None
@@ -0,0 +1,290 @@
+"""Tests of the OpenWebNet sessions against the gateway simulator."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.myhome.connection_manager import MyHOMEConnectionManager
+from custom_components.myhome.own_wrapper import (
+    OWNBackoff,
+    OWNCommandSession,
+    OWNEventSession,
+    OWNGateway,
+    OWNLightingEvent,
+    OWNTranslation,
+    SEND_ACK,
+    SEND_NACK,
+    SEND_RESET,
+)
+from custom_components.myhome.vendor_own.simulator import (
+    AUTH_OPEN,
+    AUTH_SHA1,
+    AUTH_SHA256,
+    OWNSimulator,
+)
+
+# The simulator listens on the loopback interface.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+DEVICES = ("1-11", "1-12")
+# Short enough for the tests not to wait on the retries.
+FAST_BACKOFF = OWNBackoff(base=0.01, ceiling=0.05)
+
+
+@pytest.fixture
+async def simulator():
+    _simulator = OWNSimulator(password="12345", auth=AUTH_SHA256, devices=DEVICES)
+    await _simulator.start()
+    yield _simulator
+    await _simulator.stop()
+
+
+def _gateway(port: int, password: str | None = "12345") -> OWNGateway:
+    return OWNGateway({"address": "127.0.0.1", "port": port, "password": password})
+
+
+def _new_session(session_class, port: int, password: str | None = "12345"):
+    _session = session_class(gateway=_gateway(port, password))
+    _session.backoff = FAST_BACKOFF
+    _session.max_connect_attempts = 3
+    return _session
+
+
+async def _event_session_served(simulator: OWNSimulator) -> None:
+    """Wait for the simulator to be done negotiating the event session."""
+    while not simulator._event_writers:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize(
+    ("auth", "password"),
+    [(None, None), (AUTH_OPEN, "12345"), (AUTH_SHA1, "secret"), (AUTH_SHA256, "secret")],
+)
+async def test_negotiation(auth, password):
+    _simulator = OWNSimulator(password=password, auth=auth, devices=DEVICES)
+    _port = await _simulator.start()
+    _session = _new_session(OWNCommandSession, _port, password)
+    try:
+        assert await _session.connect() == {"Success": True, "Message": None}
+        assert _session.is_connected
+        assert await _session.send_once("*1*1*11##") == SEND_ACK
+    finally:
+        await _session.close()
+        await _simulator.stop()
+
+
+async def test_wrong_password_not_retried(simulator):
+    _session = _new_session(OWNCommandSession, simulator.port, "54321")
+    try:
+        _result = await _session.connect()
+    finally:
+        await _session.close()
+
+    assert _result == {"Success": False, "Message": "password_error"}
+    assert _session.auth_failed
+    assert simulator.stats["sessions"] == 1
+
+
+async def test_missing_password_not_retried(simulator):
+    _session = _new_session(OWNCommandSession, simulator.port, None)
+    try:
+        _result = await _session.connect()
+    finally:
+        await _session.close()
+
+    assert _result == {"Success": False, "Message": "password_required"}
+    assert simulator.stats["sessions"] == 1
+
+
+async def test_refused_negotiation_backs_off():
+    """A gateway refusing the session type is asked again after the backoff."""
+    _attempts = 0
+
+    async def _refuse(reader, writer):
+        nonlocal _attempts
+        _attempts += 1
+        writer.write(b"*#*1##")
+        await reader.readuntil(b"##")
+        writer.write(b"*#*0##")
+        await reader.read()
+        writer.close()
+
+    _server = await asyncio.start_server(_refuse, "127.0.0.1", 0)
+    _session = _new_session(OWNCommandSession, _server.sockets[0].getsockname()[1])
+    try:
+        with patch.object(FAST_BACKOFF, "delay", wraps=FAST_BACKOFF.delay) as _delay:
+            _result = await _session.connect()
+    finally:
+        await _session.close()
+        _server.close()
+        await _server.wait_closed()
+
+    assert _result == {"Success": False, "Message": "connection_refused"}
+    assert _attempts == 3
+    assert [_call.args[0] for _call in _delay.call_args_list] == [0, 1, 2]
+
+
+async def test_dropped_password_reply_retried():
+    """A connection dropped before the reply to the password is not taken for a refused password."""
+    _attempts = 0
+
+    async def _drop(reader, writer):
+        nonlocal _attempts
+        _attempts += 1
+        writer.write(b"*#*1##")
+        await reader.readuntil(b"##")
+        writer.write(b"*98*2##")
+        await reader.readuntil(b"##")
+        writer.write(b"*#" + b"1" * 128 + b"##")
+        await reader.readuntil(b"##")
+        writer.close()
+
+    _server = await asyncio.start_server(_drop, "127.0.0.1", 0)
+    _session = _new_session(OWNCommandSession, _server.sockets[0].getsockname()[1])
+    try:
+        _result = await _session.connect()
+    finally:
+        await _session.close()
+        _server.close()
+        await _server.wait_closed()
+
+    assert _result == {"Success": False, "Message": "connection_refused"}
+    assert _session.negotiation_result == {"Success": False, "Message": "negotiation_failed"}
+    assert not _session.auth_failed
+    assert _attempts == 3
+
+
+async def test_session_limit_reached(simulator):
+    simulator.faults.max_sessions = 0
+    _session = _new_session(OWNCommandSession, simulator.port)
+    try:
+        _result = await _session.connect()
+    finally:
+        await _session.close()
+
+    assert _result == {"Success": False, "Message": "connection_refused"}
+    assert simulator.stats["refused_sessions"] == 3
+
+
+async def test_command_session_reconnects_after_reset(simulator):
+    _session = _new_session(OWNCommandSession, simulator.port)
+    try:
+        await _session.connect()
+        simulator.faults.reset_rate = 1.0
+        assert await _session.send_once("*1*1*11##") == SEND_RESET
+        simulator.faults.reset_rate = 0.0
+
+        assert _session.is_connected
+        assert await _session.send_once("*1*1*11##") == SEND_ACK
+        simulator.faults.nack_rate = 1.0
+        assert await _session.send_once("*1*1*11##") == SEND_NACK
+    finally:
+        await _session.close()
+
+    assert simulator.stats["sessions"] == 2
+    assert simulator.stats["resets"] == 1
+
+
+async def test_event_session_receives_state_changes(simulator):
+    _events = _new_session(OWNEventSession, simulator.port)
+    _commands = _new_session(OWNCommandSession, simulator.port)
+    try:
+        await _events.connect()
+        await _commands.connect()
+        await _event_session_served(simulator)
+        assert await _commands.send_once("*1*1*12##") == SEND_ACK
+
+        _message = await asyncio.wait_for(_events.get_next(), 1)
+    finally:
+        await _commands.close()
+        await _events.close()
+
+    assert isinstance(_message, OWNLightingEvent)
+    assert _message.where == "12"
+    assert _message.is_on
+
+
+async def test_event_session_reconnects(simulator):
+    _events = _new_session(OWNEventSession, simulator.port)
+    try:
+        await _events.connect()
+        _events.abort()
+        assert await asyncio.wait_for(_events.get_next(), 1) is None
+
+        await _event_session_served(simulator)
+        simulator.broadcast("*1*0*11##")
+        _message = await asyncio.wait_for(_events.get_next(), 1)
+    finally:
+        await _events.close()
+
+    assert isinstance(_message, OWNLightingEvent)
+    assert not _message.is_on
+    assert simulator.stats["sessions"] == 2
+
+
+async def test_event_session_skips_translations(simulator):
+    _events = _new_session(OWNEventSession, simulator.port)
+    try:
+        await _events.connect()
+        await _event_session_served(simulator)
+        simulator.broadcast("*1*1000#1*11##")
+        _message = await asyncio.wait_for(_events.get_next(), 1)
+    finally:
+        await _events.close()
+
+    assert isinstance(_message, OWNTranslation)
+    assert str(_message) == "*1*1000#1*11##"
+    assert _events.counters["translations_skipped"] == 1
+    assert _events.counters["parse_failures"] == 0
+
+
+async def test_manager_reports_refused_passwords(simulator):
+    _manager = MyHOMEConnectionManager(_gateway(simulator.port, "54321"), "[test]", backoff=FAST_BACKOFF)
+    _errors = []
+    _manager.add_auth_failure_listener(_errors.append)
+    try:
+        _session = await _manager.acquire(OWNCommandSession)
+        assert not _session.is_connected
+    finally:
+        await _manager.close()
+
+    assert _errors == ["password_error"]
+    assert _manager.connection_attempts == {"command": 1}
+
+
+async def test_manager_test_session_handed_over(simulator):
+    _manager = MyHOMEConnectionManager(_gateway(simulator.port), "[test]", backoff=FAST_BACKOFF)
+    try:
+        assert (await _manager.test())["Success"]
+        _session = await _manager.acquire(OWNCommandSession)
+        assert _session.is_connected
+        assert await _session.send_once("*1*1*11##") == SEND_ACK
+    finally:
+        await _manager.close()
+
+    assert simulator.stats["sessions"] == 1
+
+
+async def test_manager_circuit_opens_and_recovers():
+    _simulator = OWNSimulator(password="12345", auth=AUTH_SHA256, devices=DEVICES)
+    _port = await _simulator.start()
+    await _simulator.stop()
+
+    _manager = MyHOMEConnectionManager(_gateway(_port), "[test]", backoff=FAST_BACKOFF)
+    _circuit = []
+    _manager.add_circuit_listener(_circuit.append)
+    with patch("custom_components.myhome.connection_manager.RECONNECT_STAGGER", 0.01):
+        _acquire = asyncio.create_task(_manager.acquire(OWNCommandSession))
+        try:
+            while not _manager.circuit_open:
+                await asyncio.sleep(0.01)
+            await _simulator.start(port=_port)
+            _session = await asyncio.wait_for(_acquire, 1)
+            assert _session.is_connected
+        finally:
+            _acquire.cancel()
+            await _manager.close()
+            await _simulator.stop()
+
+    assert _circuit == [True, False]
+    assert _manager.last_recovery_time is not None
@@ -0,0 +1,59 @@
+"""Tests of the event session watchdog."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.myhome.groups import MyHOMEGroupIndex
+from custom_components.myhome.watchdog import PROBE, MyHOMEEventWatchdog
+
+
+def _new_handler(hass, *points: str) -> MagicMock:
+    _handler = MagicMock(log_id="[test]")
+    _handler.group_index = MyHOMEGroupIndex(hass, "entry", "[test]")
+    for _point in points:
+        _handler.group_index.register_point(_point, *_point.split("-"))
+    _handler.send_status_request = AsyncMock(return_value=None)
+    return _handler
+
+
+async def _run_once(watchdog: MyHOMEEventWatchdog) -> None:
+    watchdog.start()
+    try:
+        while not watchdog.probes_sent or (not watchdog.probes_answered and not watchdog.reconnects):
+            await asyncio.sleep(0.01)
+    finally:
+        watchdog.stop()
+
+
+async def test_probe_answered_on_the_event_session(hass):
+    _handler = _new_handler(hass, "2-21", "1-12", "1-11")
+    _watchdog = MyHOMEEventWatchdog(hass, _handler, idle_timeout=0.05, probe_grace=0.05)
+    # The gateway reports the status of the point on the event session.
+    _handler.send_status_request.side_effect = lambda message: _watchdog.feed()
+
+    await _run_once(_watchdog)
+
+    assert str(_handler.send_status_request.call_args.args[0]) == "*#1*11##"
+    assert _watchdog.probes_answered == 1
+    assert _watchdog.false_alarm_rate == 1.0
+    _handler.drop_event_session.assert_not_called()
+
+
+async def test_acked_probe_is_not_proof_of_life(hass):
+    _handler = _new_handler(hass, "1-11")
+    _handler.send_status_request.return_value = True
+    _watchdog = MyHOMEEventWatchdog(hass, _handler, idle_timeout=0.05, probe_grace=0.05)
+
+    await _run_once(_watchdog)
+
+    assert _watchdog.reconnects == 1
+    assert len(_watchdog.detection_latencies) == 1
+    _handler.drop_event_session.assert_called_once()
+
+
+async def test_time_request_without_points(hass):
+    _handler = _new_handler(hass)
+    _watchdog = MyHOMEEventWatchdog(hass, _handler, idle_timeout=0.05, probe_grace=0.05)
+
+    await _run_once(_watchdog)
+
+    assert str(_handler.send_status_request.call_args.args[0]) == PROBE